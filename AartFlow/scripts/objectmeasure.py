@@ -11,23 +11,35 @@
 
 import bpy
 import os
+import time
+import math
+import array
+import csv
+import json
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 import bmesh
 import gpu
 from gpu_extras.batch import batch_for_shader
-from mathutils import Vector
-from bpy.props import StringProperty
-from bpy.types import Operator, Panel
+from mathutils import Vector, Matrix
+from mathutils.geometry import convex_hull_2d
+from mathutils.bvhtree import BVHTree
+from bpy.props import StringProperty, IntProperty, BoolProperty, FloatProperty, EnumProperty
+from bpy.types import Operator, Panel, PropertyGroup
+from bpy.app.handlers import persistent
 import blf
+try:
+    import numpy as np
+except ImportError:  # 精简版 Python 环境可能未附带 numpy，此时退回 bmesh 计算
+    np = None
 # 注：本脚本依赖 Blender 的 Python 环境（bpy/gpu/blf 等模块），在外部linter可能会提示“无法解析导入”。
 
 # 全局变量
-measurement_results = []  # 存储测量结果
 show_3d_annotations = False  # 控制3D标注显示
 measurement_draw_handler = None  # 测量绘制处理器
 bounding_box_draw_handler = None  # 边界框绘制处理器
-object_annotation_states = {}  # 跟踪每个物体的标注显示状态 {object_name: bool}
-object_collapse_states = {}  # 跟踪每个物体的折叠状态 {object_name: bool}
-object_area_states = {}  # 跟踪每个物体的面积状态 {object_name: {'current_area': float, 'recorded_length': float, 'recorded_width': float, 'recorded_height': float, 'is_expired': bool}}
+# 每个已测量对象的测量结果、标注显示状态与面积状态统一保存在 measurement_registry（MeasurementRegistry）中
 
 # 通用常量与绘图工具
 # 12条包围盒边（连接8个顶点）
@@ -83,6 +95,216 @@ def gpu_draw_dashed_line(start, end, color, context, min_segments=5):
             dash_end = end
         gpu_draw_line(dash_start, dash_end, color)
 
+# ==================== 批量线段绘制 ====================
+# 每条线段单独创建批次会产生大量细小绘制调用；以下工具按颜色收集线段，
+# 一帧内每种颜色只提交一个 LINES 批次。
+
+BBOX_EDGE_STARTS = [a for a, _ in EDGES]
+BBOX_EDGE_ENDS = [b for _, b in EDGES]
+
+def gpu_build_lines_batch(coords):
+    """用线段顶点序列（每两个点一条线段）创建 LINES 批次。"""
+    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+    return batch_for_shader(shader, 'LINES', {"pos": coords})
+
+def gpu_draw_batches(batches):
+    """绘制 [(color, batch), ...]，着色器只绑定一次。"""
+    if not batches:
+        return
+    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+    shader.bind()
+    for color, batch in batches:
+        shader.uniform_float("color", color)
+        batch.draw(shader)
+
+class LineBatchCollector:
+    """线段收集器：按颜色累积线段，flush 时每种颜色提交一个 LINES 批次"""
+    
+    def __init__(self):
+        self.segments = {}  # color -> [start, end, start, end, ...]
+    
+    def add_line(self, start, end, color):
+        coords = self.segments.setdefault(tuple(color), [])
+        coords.append(tuple(start))
+        coords.append(tuple(end))
+    
+    def build(self):
+        """生成 [(color, batch), ...] 并清空已收集的线段"""
+        batches = [(color, gpu_build_lines_batch(coords)) for color, coords in self.segments.items() if coords]
+        self.segments = {}
+        return batches
+    
+    def flush(self):
+        gpu_draw_batches(self.build())
+
+def compute_dashed_segments(starts, ends, camera_location=None, view_distance=None, min_segments=5):
+    """
+    向量化生成虚线段顶点，分段规则与 gpu_draw_dashed_line / gpu_calc_adaptive_dash_length 一致
+    
+    Args:
+        starts, ends: (E, 3) 线段起止点
+        camera_location: 视点位置；为 None 时使用固定虚线长度 0.05
+        view_distance: 视图距离
+        
+    Returns:
+        numpy.ndarray: (2M, 3) float32，每两个点为一段虚线
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    vectors = ends - starts
+    lengths = np.linalg.norm(vectors, axis=1)
+    keep = lengths > 0
+    starts, vectors, lengths = starts[keep], vectors[keep], lengths[keep]
+    if not len(lengths):
+        return np.empty((0, 3), dtype=np.float32)
+    
+    if camera_location is None or view_distance is None:
+        dash_len = np.full(len(lengths), 0.05)
+    else:
+        mid_points = starts + vectors * 0.5
+        distance = np.linalg.norm(mid_points - np.asarray(camera_location, dtype=np.float64), axis=1)
+        distance_factor = np.clip(distance / 10.0, 0.1, 2.0)
+        scale_factor = max(0.5, min(2.0, view_distance / 10.0))
+        dash_len = np.clip(0.02 * distance_factor * scale_factor, 0.005, 0.2)
+    
+    dash_count = np.maximum(min_segments, (lengths / (dash_len * 2)).astype(np.int64))
+    actual_dash_len = lengths / (dash_count * 2)
+    directions = vectors / lengths[:, None]
+    
+    # 展开为逐段索引：edge_index 为所属线段，k 为线段内第 k 段
+    edge_index = np.repeat(np.arange(len(lengths)), dash_count)
+    offsets = np.cumsum(dash_count) - dash_count
+    k = np.arange(len(edge_index)) - np.repeat(offsets, dash_count)
+    
+    step = directions[edge_index] * actual_dash_len[edge_index, None]
+    dash_starts = starts[edge_index] + step * (2 * k)[:, None]
+    
+    coords = np.empty((len(edge_index) * 2, 3), dtype=np.float32)
+    coords[0::2] = dash_starts
+    coords[1::2] = dash_starts + step
+    return coords
+
+def get_view_state(context):
+    """获取视点位置与视图距离（用于自适应虚线）；不可用时返回 (None, None)"""
+    try:
+        rv3d = context.region_data if context else None
+        if not rv3d:
+            return None, None
+        return rv3d.view_matrix.inverted().translation, rv3d.view_distance
+    except Exception:
+        return None, None
+
+def use_batched_drawing():
+    """是否使用批量绘制路径（可在面板中关闭以对比旧的逐段绘制）"""
+    if np is None:
+        return False
+    settings = getattr(bpy.context.scene, "object_measure_settings", None)
+    return settings is None or settings.use_batched_drawing
+
+class DrawTimer:
+    """绘制耗时统计（指数滑动平均），用于对比批量与逐段绘制路径"""
+    
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+    
+    def record(self, start_time):
+        self.last_ms = (time.perf_counter() - start_time) * 1000.0
+        if self.avg_ms == 0.0:
+            self.avg_ms = self.last_ms
+        else:
+            self.avg_ms += (self.last_ms - self.avg_ms) * self.smoothing
+
+# 文本标注参数
+LABEL_FONT_SIZE = 16  # 标注字号
+LABEL_PADDING = 8  # 文本周围的内边距
+LABEL_BG_COLOR = (0.1, 0.1, 0.1, 0.8)  # 深灰色半透明背景
+LABEL_SIZE_CACHE_LIMIT = 4096  # 标注尺寸缓存条目上限
+# 标注优先级（数值越大越优先保留，重叠时低优先级标注被挪开或隐藏）
+LABEL_PRIORITY_HIDDEN = 0
+LABEL_PRIORITY_DIMENSION = 1
+LABEL_PRIORITY_AREA = 2
+LABEL_PRIORITY_NAME = 3
+LABEL_DECLUTTER_CELL = 64  # 屏幕空间哈希网格单元大小（像素）
+LABEL_DECLUTTER_GAP = 2  # 挪开标注时与原位置的间隙（像素）
+
+def _label_cells(rect, cell_size):
+    x0, y0, x1, y1 = rect
+    return [(cx, cy)
+            for cx in range(int(x0 // cell_size), int(x1 // cell_size) + 1)
+            for cy in range(int(y0 // cell_size), int(y1 // cell_size) + 1)]
+
+def _label_overlap(grid, rect, cells):
+    """返回与 rect 重叠的已放置矩形，无重叠时返回 None"""
+    x0, y0, x1, y1 = rect
+    for cell in cells:
+        for other in grid.get(cell, ()):
+            ox0, oy0, ox1, oy1 = other
+            if x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1:
+                return other
+    return None
+
+def declutter_labels(layout, cell_size=LABEL_DECLUTTER_CELL):
+    """
+    屏幕空间标注去重叠：按优先级依次把标注矩形放入哈希网格，
+    与已放置矩形重叠时尝试挪到该矩形的上/下/右/左侧（完整让开其宽高再加间隙），
+    挪开后的位置重新做重叠检查，仍重叠则隐藏。
+    优先级只有少数几档，按桶分组代替排序；每个矩形只覆盖常数个网格单元，整体为 O(n)。
+    
+    Args:
+        layout: [(text, color, text_x, text_y, bg_x, bg_y, bg_width, bg_height, priority), ...]
+        
+    Returns:
+        list: 去重叠后的布局（结构相同，被挪开的标注坐标已更新，被隐藏的标注已移除）
+    """
+    buckets = {}
+    for entry in layout:
+        buckets.setdefault(entry[8], []).append(entry)
+    
+    grid = {}  # (cx, cy) -> [(x0, y0, x1, y1), ...]
+    placed = []
+    gap = LABEL_DECLUTTER_GAP
+    for priority in sorted(buckets, reverse=True):
+        for entry in buckets[priority]:
+            text, color, text_x, text_y, bg_x, bg_y, bg_width, bg_height, _ = entry
+            rect = (bg_x, bg_y, bg_x + bg_width, bg_y + bg_height)
+            cells = _label_cells(rect, cell_size)
+            other = _label_overlap(grid, rect, cells)
+            dx = dy = 0.0
+            if other is not None:
+                ox0, oy0, ox1, oy1 = other
+                for dx, dy in ((0.0, oy1 + gap - bg_y), (0.0, oy0 - gap - bg_height - bg_y),
+                               (ox1 + gap - bg_x, 0.0), (ox0 - gap - bg_width - bg_x, 0.0)):
+                    rect = (bg_x + dx, bg_y + dy, bg_x + dx + bg_width, bg_y + dy + bg_height)
+                    cells = _label_cells(rect, cell_size)
+                    if _label_overlap(grid, rect, cells) is None:
+                        break
+                else:
+                    continue
+            for cell in cells:
+                grid.setdefault(cell, []).append(rect)
+            placed.append((text, color, text_x + dx, text_y + dy, rect[0], rect[1], bg_width, bg_height, priority))
+    return placed
+
+def project_points_to_region(region, rv3d, points):
+    """
+    向量化把世界坐标点投影到区域像素坐标（与 view3d_utils.location_3d_to_region_2d 相同的公式）
+    
+    Returns:
+        tuple: (coords (N, 2), in_front (N,) 布尔数组，False 表示点位于视点后方)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    perspective = np.array(rv3d.perspective_matrix, dtype=np.float64)
+    prj = points @ perspective[:3, :3].T + perspective[:3, 3]
+    w = points @ perspective[3, :3] + perspective[3, 3]
+    in_front = w > 0.0
+    safe_w = np.where(in_front, w, 1.0)
+    coords = np.empty((len(points), 2), dtype=np.float64)
+    coords[:, 0] = (region.width / 2.0) * (1.0 + prj[:, 0] / safe_w)
+    coords[:, 1] = (region.height / 2.0) * (1.0 + prj[:, 1] / safe_w)
+    return coords, in_front
+
 def build_all_edges(corners):
     """基于给定顶点构建12条边及其向量: [((i,j), vector), ...]。"""
     return [
@@ -175,46 +397,426 @@ def select_representative_edge(group, target_axis=None):
         
         return best_edge, best_length, 0
 
+# obj.bound_box 的角点顺序固定（x 取 0-3 为最小、4-7 为最大；y 取 0,1,4,5 为最小；z 取 0,3,4,7 为最小），
+# 因此12条边按局部轴天然分为三组平行边，顺序与 group_parallel_edges 的输出一致：局部Z、局部Y、局部X
+BBOX_AXIS_GROUPS = (
+    (2, ((0, 1), (2, 3), (4, 5), (6, 7))),  # 局部Z方向
+    (1, ((1, 2), (3, 0), (5, 6), (7, 4))),  # 局部Y方向
+    (0, ((0, 4), (1, 5), (2, 6), (3, 7))),  # 局部X方向
+)
+
+def _is_parallel_alignment(alignment):
+    """与 group_parallel_edges 相同的平行判定（夹角余弦绝对值接近1）"""
+    return abs(alignment - 1.0) < 0.01
+
+def analyze_bbox_axes(world_corners):
+    """
+    闭式包围盒轴分析：常数时间确定长宽高与对应边索引
+    
+    包围盒三组平行边的方向即 matrix_world 的三列乘以局部包围盒尺寸，分组由角点顺序直接给出，
+    无需逐对比较12条边。组内代表边仍用 select_representative_edge 选取，
+    选择规则与 analyze_bbox_groups_pairwise 相同：与世界Z轴最对齐的组为高度，
+    其余两组中较长者为长度、较短者为宽度（并列时与逐对分组路径的归属一致）。
+    
+    Args:
+        world_corners: 8个世界坐标包围盒顶点
+        
+    Returns:
+        dict: 长宽高、边索引与Z轴对齐度；包围盒退化（某轴长度为0或两轴近似平行）时返回 None，
+              调用方应回退到逐对平行边分析
+    """
+    if not world_corners or len(world_corners) != 8:
+        return None
+    
+    world_z_axis = Vector((0, 0, 1))
+    directions = []
+    representatives = []  # (边索引, 边长, Z轴对齐度)
+    for _, group_edges in BBOX_AXIS_GROUPS:
+        group = [(edge, world_corners[edge[1]] - world_corners[edge[0]]) for edge in group_edges]
+        if group[0][1].length <= 0:
+            return None
+        directions.append(group[0][1].normalized())
+        representatives.append(select_representative_edge(group, world_z_axis))
+    
+    # 任意两轴近似平行时，旧方法会把它们合并为一组，此时无法闭式求解
+    for a in range(3):
+        for b in range(a + 1, 3):
+            if _is_parallel_alignment(abs(directions[a].dot(directions[b]))):
+                return None
+    
+    return _bbox_axes_result(representatives)
+
+def _bbox_axes_result(representatives):
+    """
+    由三组代表边 (边索引, 边长, Z轴对齐度) 确定长宽高
+    
+    与逐对分组路径使用相同的两次稳定排序：先按Z轴对齐度降序取高度，剩余两组保持该顺序再按边长降序，
+    因此长宽相等时长度/宽度边的归属也与逐对分组一致
+    """
+    ordered = sorted(representatives, key=lambda x: x[2], reverse=True)
+    height = ordered[0]
+    remaining = sorted(ordered[1:3], key=lambda x: x[1], reverse=True)
+    
+    return {
+        'length': remaining[0][1],
+        'width': remaining[1][1],
+        'height': height[1],
+        'length_edge_indices': remaining[0][0],
+        'width_edge_indices': remaining[1][0],
+        'height_edge_indices': height[0],
+        'selected_height_edge': height[0],
+        'max_z_alignment': height[2],
+        'best_edge_name': "高度"
+    }
+
+def analyze_bbox_groups_pairwise(world_corners):
+    """
+    逐对比较12条边分组后确定长宽高（闭式分析无法求解的退化包围盒使用，也是闭式分析的对照基准）
+    
+    Returns:
+        dict: 与 analyze_bbox_axes 相同；分不出三组平行边时返回 None
+    """
+    world_z_axis = Vector((0, 0, 1))
+    representatives = []
+    for group in group_parallel_edges(build_all_edges(world_corners)):
+        edge_indices, edge_length, z_alignment = select_representative_edge(group, world_z_axis)
+        if edge_indices:
+            representatives.append((edge_indices, edge_length, z_alignment))
+    if len(representatives) < 3:
+        return None
+    return _bbox_axes_result(representatives)
+
 def check_edges_not_parallel(edge1_indices, edge2_indices, edge3_indices, world_corners):
     """已废弃：未使用。保留占位避免外部误引用。"""
     return False
 
+# ==================== 最小定向包围盒（OBB） ====================
+
+OBB_HULL_POINT_CAP = 256  # 参与凸包与旋转卡壳搜索的最多顶点数（超过时按方向极值点抽取）
+OBB_VOLUME_TOLERANCE = 1e-6  # 与局部包围盒体积相差在该比例内时保留局部坐标轴（避免轴对齐物体的方向抖动）
+
+def fibonacci_directions(count):
+    """球面上近似均匀分布的 count 个单位方向（斐波那契点阵）"""
+    i = np.arange(count, dtype=np.float64) + 0.5
+    z = 1.0 - 2.0 * i / count
+    r = np.sqrt(np.maximum(0.0, 1.0 - z * z))
+    theta = np.pi * (1.0 + 5.0 ** 0.5) * i
+    return np.stack((r * np.cos(theta), r * np.sin(theta), z), axis=1)
+
+def extreme_point_indices(co, cap=OBB_HULL_POINT_CAP, chunk=65536):
+    """
+    沿 cap/2 个方向取正反两个极值点，得到最多 cap 个必在凸包上的顶点
+    分块计算投影（float32，方向×顶点布局便于按行归约），内存占用与顶点数无关
+    """
+    directions = fibonacci_directions(max(cap // 2, 3)).astype(np.float32)
+    rows = np.arange(len(directions))
+    best_max = np.full(len(directions), -np.inf, dtype=np.float32)
+    best_min = np.full(len(directions), np.inf, dtype=np.float32)
+    index_max = np.zeros(len(directions), dtype=np.int64)
+    index_min = np.zeros(len(directions), dtype=np.int64)
+    co = np.ascontiguousarray(co, dtype=np.float32)
+    for start in range(0, len(co), chunk):
+        projection = directions @ co[start:start + chunk].T
+        arg_max = projection.argmax(axis=1)
+        arg_min = projection.argmin(axis=1)
+        values_max = projection[rows, arg_max]
+        values_min = projection[rows, arg_min]
+        update = values_max > best_max
+        best_max[update] = values_max[update]
+        index_max[update] = arg_max[update] + start
+        update = values_min < best_min
+        best_min[update] = values_min[update]
+        index_min[update] = arg_min[update] + start
+    return np.unique(np.concatenate((index_max, index_min)))
+
+def convex_hull_arrays(points):
+    """
+    用 bmesh.ops.convex_hull 计算凸包
+    
+    Returns:
+        (hull_points(H,3), hull_tris(F,3))；点集共面/退化时三角形为空
+    """
+    bm = bmesh.new()
+    try:
+        for co in points:
+            bm.verts.new(co)
+        result = bmesh.ops.convex_hull(bm, input=list(bm.verts), use_existing_faces=False)
+        faces = [ele for ele in result['geom'] if isinstance(ele, bmesh.types.BMFace)]
+        if not faces:
+            return np.asarray(points, dtype=np.float64), np.zeros((0, 3), dtype=np.int64)
+        # 只保留凸包面用到的顶点（内部点被丢弃），并重新编号
+        index = {}
+        tris = []
+        for face in faces:
+            verts = [index.setdefault(vert, len(index)) for vert in face.verts]
+            for k in range(1, len(verts) - 1):
+                tris.append((verts[0], verts[k], verts[k + 1]))
+        hull_points = np.array([vert.co[:] for vert in index], dtype=np.float64)
+        return hull_points, np.array(tris, dtype=np.int64)
+    finally:
+        bm.free()
+
+def min_area_rectangle_axes(points, normal):
+    """
+    在垂直于 normal 的平面上做旋转卡壳：候选方向为二维凸包各边方向，取面积最小的矩形
+    
+    Returns:
+        (3,3) 行向量为 (矩形方向1, 矩形方向2, normal)
+    """
+    helper = np.array((1.0, 0.0, 0.0)) if abs(normal[0]) < 0.9 else np.array((0.0, 1.0, 0.0))
+    u = np.cross(normal, helper)
+    u /= np.linalg.norm(u)
+    w = np.cross(normal, u)
+    planar = points @ np.stack((u, w), axis=1)
+    hull = planar[convex_hull_2d(planar.tolist())]
+    if len(hull) < 3:
+        return np.stack((u, w, normal))
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.linalg.norm(edges, axis=1)
+    edges = edges[lengths > 1e-12] / lengths[lengths > 1e-12, None]
+    if not len(edges):
+        return np.stack((u, w, normal))
+    perpendicular = np.stack((-edges[:, 1], edges[:, 0]), axis=1)
+    along = hull @ edges.T
+    across = hull @ perpendicular.T
+    areas = np.ptp(along, axis=0) * np.ptp(across, axis=0)
+    k = int(areas.argmin())
+    axis1 = edges[k, 0] * u + edges[k, 1] * w
+    axis2 = perpendicular[k, 0] * u + perpendicular[k, 1] * w
+    return np.stack((axis1, axis2, normal))
+
+def fit_oriented_box(hull_points, hull_tris):
+    """
+    求凸包点集的最小体积定向包围盒方向
+    候选：局部坐标轴、PCA 主轴，以及以各凸包面法向与各 PCA 主轴为法向的旋转卡壳结果；
+    所有候选的体积一次向量化求出后取最小
+    
+    Returns:
+        (3,3) 右手正交基（行向量）
+    """
+    centered = hull_points - hull_points.mean(axis=0)
+    _, pca_axes = np.linalg.eigh(centered.T @ centered)
+    pca_axes = pca_axes.T
+    
+    normals = [pca_axes]
+    if len(hull_tris):
+        a, b, c = (hull_points[hull_tris[:, i]] for i in range(3))
+        face_normals = np.cross(b - a, c - a)
+        lengths = np.linalg.norm(face_normals, axis=1)
+        face_normals = face_normals[lengths > 1e-12] / lengths[lengths > 1e-12, None]
+        # n 与 -n 等价：统一符号后去重（共面三角形共享同一法向）
+        sign = np.where(face_normals[np.arange(len(face_normals)), np.abs(face_normals).argmax(axis=1)] < 0, -1.0, 1.0)
+        normals.append(np.unique(np.round(face_normals * sign[:, None], 6), axis=0))
+    normals = np.concatenate(normals)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    
+    candidates = [np.eye(3), pca_axes] + [min_area_rectangle_axes(hull_points, normal) for normal in normals]
+    candidates = np.array(candidates)
+    projected = np.einsum('hj,cij->chi', hull_points, candidates)
+    volumes = np.prod(np.ptp(projected, axis=1), axis=1)
+    best = int(volumes.argmin())
+    if volumes[0] <= volumes[best] * (1.0 + OBB_VOLUME_TOLERANCE):
+        best = 0
+    axes = candidates[best]
+    if np.linalg.det(axes) < 0:
+        axes = axes.copy()
+        axes[2] = -axes[2]
+    return axes
+
+def oriented_box_corners(co, axes):
+    """按 Blender bound_box 的角点顺序返回定向包围盒的 8 个角点（co 全部顶点参与求范围，保证包住网格）"""
+    projected = co @ axes.T
+    low = projected.min(axis=0)
+    high = projected.max(axis=0)
+    # bound_box 顺序：x 取 0-3 最小；y 取 0,1,4,5 最小；z 取 0,3,4,7 最小
+    pick = np.array([
+        (0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0),
+        (1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0),
+    ])
+    local = np.where(pick == 0, low, high)
+    return local @ axes
+
+def oriented_box_hull(co):
+    """定向包围盒拟合用的局部空间凸包（超过 OBB_HULL_POINT_CAP 的网格先抽取方向极值点）；凸包由 bmesh 求出，只在主线程调用"""
+    raw = co.astype(np.float64)
+    if len(raw) > OBB_HULL_POINT_CAP:
+        raw = raw[extreme_point_indices(raw)]
+    return convex_hull_arrays(raw)
+
+def oriented_box_local_corners(co, hull, scale):
+    """
+    在"按对象缩放后的局部空间"中拟合定向包围盒
+    
+    Args:
+        co: (N,3) 局部空间顶点坐标
+        hull: oriented_box_hull 的结果 (hull_points, hull_tris)
+        scale: (3,) 对象各轴缩放
+        
+    Returns:
+        list: 8 个局部角点（与 obj.bound_box 同序）；顶点不足时返回 None
+    """
+    if len(co) < 4:
+        return None
+    axes = fit_oriented_box(hull[0] * scale, hull[1])
+    scaled = co.astype(np.float64) * scale
+    return [tuple(corner) for corner in oriented_box_corners(scaled, axes) / scale]
+
+class OrientedBoxEngine:
+    """最小定向包围盒引擎
+    
+    - 凸包按对象缓存（几何变化时由 AreaDirtyTracker 失效），超过 OBB_HULL_POINT_CAP 的网格先抽取方向极值点
+    - 拟合在"按对象缩放后的局部空间"中进行，使世界空间中的结果为长方体；结果按缩放缓存
+    - 输出 8 个局部空间角点（与 obj.bound_box 同序），下游的长宽高与边索引分析无需改动
+    - 凸包依赖 bmesh、旋转卡壳依赖 mathutils.geometry，拟合只在主线程进行
+    """
+    
+    def __init__(self):
+        self.hulls = {}  # object_key -> (fingerprint, hull_points, hull_tris)
+        self.boxes = {}  # object_key -> (scale_key, [8 个局部角点])
+    
+    def invalidate(self, key=None):
+        if key is None:
+            self.hulls.clear()
+            self.boxes.clear()
+        else:
+            self.hulls.pop(key, None)
+            self.boxes.pop(key, None)
+    
+    @staticmethod
+    def object_scale(obj):
+        """对象各轴缩放 (scale, scale_key)；零缩放轴按 1 处理"""
+        scale = np.array([column.length for column in obj.matrix_world.to_3x3().col], dtype=np.float64)
+        scale[scale < 1e-12] = 1.0
+        return scale, tuple(np.round(scale, 6))
+    
+    def cached_hull(self, key, fingerprint):
+        """与 fingerprint 对应的已缓存凸包 (hull_points, hull_tris)，没有时返回 None"""
+        hull = self.hulls.get(key)
+        if hull is None or hull[0] != fingerprint:
+            return None
+        return hull[1:]
+    
+    def local_box(self, obj):
+        """对象的定向包围盒局部角点（与 obj.bound_box 同序），失败时返回 None"""
+        key = MeasurementRegistry.object_key(obj)
+        scale, scale_key = self.object_scale(obj)
+        cached = self.boxes.get(key)
+        if cached is not None and cached[0] == scale_key:
+            return cached[1]
+        
+        try:
+            corners = self._fit(obj, key, scale)
+        except Exception as e:
+            # 失败结果同样缓存，避免每次重绘重复计算与输出
+            print(f"[objectmeasure] 定向包围盒计算失败，改用局部包围盒: {obj.name} - {e}")
+            corners = None
+        self.boxes[key] = (scale_key, corners)
+        return corners
+    
+    def _fit(self, obj, key, scale):
+        geometry, fingerprint = measured_geometry(obj)
+        if geometry['vertex_count'] < 4:
+            return None
+        
+        # 凸包在未缩放的局部空间计算，仿射变换下凸包拓扑不变，换缩放时直接复用
+        hull = self.cached_hull(key, fingerprint)
+        if hull is None:
+            hull = oriented_box_hull(geometry['co'])
+            self.hulls[key] = (fingerprint,) + hull
+        return oriented_box_local_corners(geometry['co'], hull, scale)
+
+oriented_box_engine = OrientedBoxEngine()
+
+def use_oriented_box():
+    settings = getattr(bpy.context.scene, "object_measure_settings", None)
+    return np is not None and settings is not None and settings.use_oriented_box
+
+def oriented_local_box(obj):
+    """开启 OBB 时对象的最小定向包围盒局部角点（未开启或计算失败时为 None）；需要时会拟合，不在绘制回调中调用"""
+    if use_oriented_box():
+        return oriented_box_engine.local_box(obj)
+    return None
+
+def record_local_box(obj, record):
+    """绘制用的局部空间包围盒角点：只读取记录中预先算好的 OBB，未测量或未开启 OBB 时为 obj.bound_box"""
+    if record is not None and record.local_box is not None:
+        return record.local_box
+    return obj.bound_box
+
 class BoundingBoxDrawHandler:
     """独立的边界框绘制处理器（仅绘制虚线包围盒，不受测量功能影响）"""
     
     def __init__(self):
         self.draw_handler = None
+        self.timer = DrawTimer()
+        # 批量路径缓存：对象与视图均未变化时直接复用上一帧的 GPU 批次
+        self._batch_signature = None
+        self._batches = []
     
     def draw_bounding_box_lines(self, context):
         """绘制所有选中网格对象的边界框 - 独立于测量系统"""
+        start_time = time.perf_counter()
         # 获取所有选中的网格对象
         selected_objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
         
         if not selected_objects:
             return
         
+        # 跳过被隐藏标注的物体
+        visible_objects = [obj for obj in selected_objects if measurement_registry.is_annotation_visible(obj)]
+        
         # 设置绘制参数
         gpu.state.blend_set('ALPHA')
         gpu.state.line_width_set(1.5)  # 增加边界框线宽，让虚线更清晰
         
-        for obj in selected_objects:
-            # 检查该物体的标注是否应该显示
-            global object_annotation_states
-            if obj.name in object_annotation_states and not object_annotation_states[obj.name]:
-                continue  # 跳过被隐藏的物体
-            
-            # 获取对象的边界框顶点
-            bbox_corners = [Vector(corner) for corner in obj.bound_box]
-            if not bbox_corners or len(bbox_corners) != 8:
-                continue
-            
-            # 将边界框顶点转换为世界坐标
-            world_corners = [obj.matrix_world @ corner for corner in bbox_corners]
-            
-            # 绘制边界框的12条边（灰色虚线）
-            self.draw_bounding_box(world_corners, (0.8, 0.8, 0.8, 0.6), context)  # 半透明灰色
+        if use_batched_drawing():
+            self._draw_batched(visible_objects, context)
+        else:
+            for obj in visible_objects:
+                # 获取对象的边界框顶点（已测量对象开启 OBB 时为定向包围盒）
+                bbox_corners = [Vector(corner) for corner in self.local_box(obj)]
+                if not bbox_corners or len(bbox_corners) != 8:
+                    continue
+                
+                # 将边界框顶点转换为世界坐标
+                world_corners = [obj.matrix_world @ corner for corner in bbox_corners]
+                
+                # 绘制边界框的12条边（灰色虚线）
+                self.draw_bounding_box(world_corners, (0.8, 0.8, 0.8, 0.6), context)  # 半透明灰色
         
         gpu.state.blend_set('NONE')
+        self.timer.record(start_time)
+    
+    def _draw_batched(self, objects, context, color=(0.8, 0.8, 0.8, 0.6)):
+        """批量路径：所有对象的虚线包围盒合并为一个 LINES 批次"""
+        camera_location, view_distance = get_view_state(context)
+        view_key = None if camera_location is None else (tuple(round(v, 4) for v in camera_location), round(view_distance, 4))
+        
+        local_boxes = [tuple(tuple(corner) for corner in self.local_box(obj)) for obj in objects]
+        matrices = [matrix_key(obj.matrix_world) for obj in objects]
+        signature = (view_key, tuple(zip(matrices, local_boxes)))
+        
+        if signature != self._batch_signature:
+            self._batches = []
+            if objects:
+                corners = np.array(local_boxes, dtype=np.float64)  # (N, 8, 3)
+                mats = np.array(matrices, dtype=np.float64).reshape(-1, 4, 4)
+                world = np.einsum('nij,nkj->nki', mats[:, :3, :3], corners) + mats[:, None, :3, 3]
+                coords = compute_dashed_segments(
+                    world[:, BBOX_EDGE_STARTS].reshape(-1, 3),
+                    world[:, BBOX_EDGE_ENDS].reshape(-1, 3),
+                    camera_location, view_distance
+                )
+                if len(coords):
+                    self._batches = [(color, gpu_build_lines_batch(coords))]
+            self._batch_signature = signature
+        
+        gpu_draw_batches(self._batches)
+    
+    @staticmethod
+    def local_box(obj):
+        """虚线包围盒的局部角点：已测量对象与测量线一致（可为 OBB），未测量对象使用 obj.bound_box"""
+        return record_local_box(obj, measurement_registry.get(obj))
     
     def draw_bounding_box(self, corners, color, context=None):
         """绘制边界框的12条边（虚线，视口自适应）"""
@@ -265,30 +867,119 @@ class MeasurementDrawHandler:
         self.static_draw_completed = False  # 标记静态绘制是否完成
         self.static_draw_frames = 0  # 静态绘制帧数计数
         self.static_draw_data = []  # 存储静态绘制的数据
+        # 帧内分析缓存：POST_VIEW 与 POST_PIXEL 处理器共享，每次重绘开始时清空
+        self.frame_analysis = {}  # {(object_name, matrix_key): (bbox_corners, current_dimensions)}
+        self.frame_analysis_hits = 0  # 因帧内缓存而避免的重复计算次数
+        self.frame_analysis_misses = 0  # 实际执行的包围盒分析次数
+        self.frame_visible_items = None  # 本帧视锥裁剪后的测量项
+        self.line_timer = DrawTimer()  # 测量线绘制耗时
+        self.text_timer = DrawTimer()  # 文本标注绘制耗时
+        # 文本标注批量绘制：label_queue 不为 None 时 draw_text_3d 只收集标注，最后统一布局与绘制
+        self.label_queue = None  # [(text, location, color, priority), ...]
+        self.label_size_cache = {}  # {(text, 字号, dpi): (width, height)}
+        # 标注布局缓存：视图矩阵、区域尺寸与标注内容均未变化时复用上次的布局（含去重叠结果）
+        self.label_layout_key = None
+        self.label_layout = []
+    
+    def begin_frame(self):
+        """开始新的一次重绘：清空帧内分析缓存"""
+        self.frame_analysis.clear()
+        self.frame_visible_items = None
+    
+    def get_visible_items(self, context):
+        """
+        获取本帧需要绘制的测量项 [(item, obj, is_far), ...]（帧内缓存，线条与文本处理器共享）
+        启用视锥裁剪时通过空间索引只返回与视锥相交的对象；
+        启用距离LOD时，距视点超过阈值的对象标记为 is_far（只显示名称标注）
+        """
+        if self.frame_visible_items is not None:
+            return self.frame_visible_items
+        
+        settings = getattr(bpy.context.scene, "object_measure_settings", None)
+        rv3d = context.region_data if context else None
+        use_culling = np is not None and rv3d is not None and (settings is None or settings.use_frustum_culling)
+        
+        if use_culling:
+            names = measured_object_index.query_frustum(rv3d.perspective_matrix)
+            records = [measured_object_index.items[name] for name in names]
+        else:
+            records = measurement_registry
+        candidates = [(record, measurement_registry.resolve(record)) for record in records]
+        
+        lod_distance = None
+        if use_culling and settings is not None and settings.use_distance_lod and rv3d.is_perspective:
+            lod_distance = settings.lod_distance
+            view_location = np.array(rv3d.view_matrix.inverted().translation)
+        
+        visible_items = []
+        for item, obj in candidates:
+            if not obj or obj.type != 'MESH':
+                continue
+            is_far = False
+            if lod_distance is not None:
+                center = measured_object_index.box_center(obj.name)
+                is_far = center is not None and float(np.linalg.norm(center - view_location)) > lod_distance
+            visible_items.append((item, obj, is_far))
+        
+        self.frame_visible_items = visible_items
+        return visible_items
+    
+    def get_frame_analysis(self, obj, item):
+        """
+        获取对象的帧内包围盒分析结果（世界坐标角点 + calculate_current_dimensions 结果）
+        同一次重绘中，线条与文本处理器对每个对象只分析一次
+        """
+        key = (obj.name, matrix_key(obj.matrix_world))
+        cached = self.frame_analysis.get(key)
+        if cached is not None:
+            self.frame_analysis_hits += 1
+            return cached
+        
+        current_bbox_corners = self.get_current_bbox_corners(obj)
+        if current_bbox_corners and len(current_bbox_corners) == 8:
+            current_dimensions = self.calculate_current_dimensions(current_bbox_corners, item.edges_data)
+        else:
+            current_bbox_corners, current_dimensions = None, {}
+        
+        result = (current_bbox_corners, current_dimensions)
+        self.frame_analysis[key] = result
+        self.frame_analysis_misses += 1
+        return result
     
     def draw_measurement_lines(self, context):
         """绘制测量线和边界框 - 3D空间，所有数据都使用动态方法"""
-        if not measurement_results or not show_3d_annotations:
+        # POST_VIEW 先于 POST_PIXEL 执行，在此开始新的一帧
+        self.begin_frame()
+        
+        if not measurement_registry or not show_3d_annotations:
             return
         
+        start_time = time.perf_counter()
+        
         # 设置绘制参数
         gpu.state.blend_set('ALPHA')
         gpu.state.line_width_set(4.0)  # 加粗测量线
         
-        for item in measurement_results:
-            obj = bpy.data.objects.get(item['name'])
-            if not obj or obj.type != 'MESH':
+        # 批量路径：三种颜色的测量线各合并为一个批次
+        line_batches = LineBatchCollector() if use_batched_drawing() else None
+        
+        for item, obj, is_far in self.get_visible_items(context):
+            # 远处对象（距离LOD）只显示名称标注，不绘制测量线
+            if is_far:
                 continue
             
             # 检查该物体的标注是否应该显示
-            global object_annotation_states
-            if obj.name in object_annotation_states and not object_annotation_states[obj.name]:
+            if not item.annotation_visible:
                 continue  # 跳过被隐藏的物体
             
             # 所有数据都使用动态方法绘制
-            self._draw_dynamic_measurements(obj, item)
+            self._draw_dynamic_measurements(obj, item, line_batches)
+        
+        if line_batches is not None:
+            line_batches.flush()
         
         gpu.state.blend_set('NONE')
+        self.line_timer.record(start_time)
     
     def _draw_static_persistent_data(self, context):
         """绘制静态持久化数据，确保视图刷新时数据不丢失"""
@@ -309,13 +1000,12 @@ class MeasurementDrawHandler:
         gpu.state.blend_set('NONE')
     
 
-    def _draw_dynamic_measurements(self, obj, item):
-        """动态方法：每次都重新计算边界框和测量数据"""
-        # 每次都重新获取当前边界框顶点
-        current_bbox_corners = self.get_current_bbox_corners(obj, item['dimensions'])
+    def _draw_dynamic_measurements(self, obj, item, line_batches=None):
+        """动态方法：每帧重新计算边界框和测量数据（帧内与文本处理器共享结果）"""
+        current_bbox_corners, current_dimensions = self.get_frame_analysis(obj, item)
         if current_bbox_corners and len(current_bbox_corners) == 8:
             # 绘制测量线（实线，更突出）- 使用动态边界框数据
-            self.draw_measurement_dimensions_dynamic(obj, current_bbox_corners, item['dimensions'])
+            self.draw_measurement_dimensions_dynamic(obj, current_bbox_corners, item.edges_data, current_dimensions, line_batches)
         
         # 记录动态状态
         self.dynamic_objects.add(obj.name)
@@ -324,36 +1014,31 @@ class MeasurementDrawHandler:
     
     
     def _is_area_expired(self, obj, item):
-        """更新面积数据状态 - 基于长宽高数据变化检测并更新状态"""
-        global object_area_states
-        
-        # 如果对象没有面积状态记录，说明还没有初始化，返回False（正常状态）
-        if obj.name not in object_area_states:
-            return False
-        
-        # 获取面积状态记录
-        area_state = object_area_states[obj.name]
-        
+        """读取面积过期标记 - 由 AreaDirtyTracker 在几何/变换变化时预先计算，绘制时不再重复分析"""
+        return item.area_state == 'expired'
+    
+    def evaluate_area_state(self, obj, item, check_geometry=True):
+        """更新面积数据状态 - 基于长宽高与网格指纹变化检测并更新状态（仅在对象发生变化后调用）
+        check_geometry=False 时只比较长宽高（仅变换变化时网格指纹不会改变，评估模式下可省去一次 to_mesh）"""
         # 如果面积状态已经是过期状态，直接返回True
-        if area_state.get('state') == 'expired':
+        if item.area_state == 'expired':
             return True
         
         # 获取当前的长宽高数据
-        current_bbox_corners = self.get_current_bbox_corners(obj, item['dimensions'])
+        current_bbox_corners = self.get_current_bbox_corners(obj)
         if not current_bbox_corners or len(current_bbox_corners) != 8:
             return False
         
         # 计算当前的长宽高
-        edges_data = item['dimensions'].get('edges_data', {})
-        current_dimensions = self.calculate_current_dimensions(current_bbox_corners, edges_data)
+        current_dimensions = self.calculate_current_dimensions(current_bbox_corners, item.edges_data)
         current_length = current_dimensions.get('length', 0)
         current_width = current_dimensions.get('width', 0)
         current_height = current_dimensions.get('height', 0)
         
         # 获取记录的长宽高数据
-        recorded_length = area_state.get('recorded_length', 0)
-        recorded_width = area_state.get('recorded_width', 0)
-        recorded_height = area_state.get('recorded_height', 0)
+        recorded_length = item.recorded_length
+        recorded_width = item.recorded_width
+        recorded_height = item.recorded_height
         
         # 检查是否有任何尺寸发生变化（使用容差避免浮点数精度问题）
         tolerance = 0.001  # 1毫米容差
@@ -361,16 +1046,15 @@ class MeasurementDrawHandler:
         width_changed = abs(current_width - recorded_width) > tolerance
         height_changed = abs(current_height - recorded_height) > tolerance
         
-        # 只有当长宽高任意一个发生变化时，面积才过期
-        is_expired = length_changed or width_changed or height_changed
+        # 网格指纹变化说明几何被编辑（即使包围盒未变，面积也可能改变）
+        recorded_fingerprint = item.fingerprint
+        geometry_changed = check_geometry and recorded_fingerprint is not None and recorded_fingerprint != measured_fingerprint(obj)
+        
+        # 只有当长宽高任意一个或网格几何发生变化时，面积才过期
+        is_expired = length_changed or width_changed or height_changed or geometry_changed
         
         # 更新面积状态记录
-        if is_expired:
-            area_state['state'] = 'expired'
-            area_state['is_expired'] = True
-        else:
-            area_state['state'] = 'current'
-            area_state['is_expired'] = False
+        item.area_state = 'expired' if is_expired else 'current'
         
         return is_expired
     
@@ -412,6 +1096,8 @@ class MeasurementDrawHandler:
         self.static_draw_frames = 0
         # 清除静态绘制数据
         self.static_draw_data.clear()
+        # 清除帧内分析缓存
+        self.frame_analysis.clear()
     
     def get_status_info(self):
         """获取当前测量状态信息"""
@@ -419,15 +1105,17 @@ class MeasurementDrawHandler:
             'static_objects': list(self.static_objects),
             'dynamic_objects': list(self.dynamic_objects),
             'cached_objects': list(self.cached_data.keys()),
-            'total_objects': len(self.static_objects) + len(self.dynamic_objects)
+            'total_objects': len(self.static_objects) + len(self.dynamic_objects),
+            'frame_analysis_hits': self.frame_analysis_hits,
+            'frame_analysis_misses': self.frame_analysis_misses
         }
     
-    def get_current_bbox_corners(self, obj, original_dimensions):
+    def get_current_bbox_corners(self, obj, original_dimensions=None):
         """
         动态获取对象的当前边界框顶点数据
-        支持实时更新，参照原生边界框的动态变化
+        支持实时更新，参照原生边界框的动态变化（开启 OBB 时为记录中预先拟合的最小定向包围盒）
         """
-        bbox_corners = [Vector(corner) for corner in obj.bound_box]
+        bbox_corners = [Vector(corner) for corner in record_local_box(obj, measurement_registry.get(obj))]
         if not bbox_corners or len(bbox_corners) != 8:
             return None
         
@@ -435,16 +1123,15 @@ class MeasurementDrawHandler:
         world_corners = [obj.matrix_world @ corner for corner in bbox_corners]
         return world_corners
 
-    def draw_measurement_dimensions_dynamic(self, obj, current_bbox_corners, original_dimensions):
-        """绘制测量尺寸线 - 基于动态12条边计算的长宽高数据"""
+    def draw_measurement_dimensions_dynamic(self, obj, current_bbox_corners, edges_data, current_dimensions=None, line_batches=None):
+        """绘制测量尺寸线 - 基于动态12条边计算的长宽高数据
+        传入 line_batches（LineBatchCollector）时只收集线段，由调用方统一批量绘制"""
         if not current_bbox_corners or len(current_bbox_corners) != 8:
             return
         
-        # 获取12条边的数据（使用原始定义）
-        edges_data = original_dimensions.get('edges_data', {})
-        
-        # 动态计算当前尺寸，包括三条边分析 - 长宽高分析完成
-        current_dimensions = self.calculate_current_dimensions(current_bbox_corners, edges_data)
+        if current_dimensions is None:
+            # 动态计算当前尺寸，包括三条边分析 - 长宽高分析完成
+            current_dimensions = self.calculate_current_dimensions(current_bbox_corners, edges_data)
         
         # 从分析结果中获取最终确定的边索引
         final_edges = current_dimensions.get('final_edges', {})
@@ -454,21 +1141,23 @@ class MeasurementDrawHandler:
         
 
         
+        draw_line = line_batches.add_line if line_batches is not None else gpu_draw_line
+        
         # 基于分析结果绘制三条彩色实线
         # 1. 绘制长度线 (X轴) - 柔和红色
         length_start = current_bbox_corners[length_edge_indices[0]]
         length_end = current_bbox_corners[length_edge_indices[1]]
-        gpu_draw_line(length_start, length_end, (1.0, 0.0, 0.0, 0.9))  # 纯红
+        draw_line(length_start, length_end, (1.0, 0.0, 0.0, 0.9))  # 纯红
 
         # 2. 绘制宽度线 (Y轴) - 柔和绿色
         width_start = current_bbox_corners[width_edge_indices[0]]
         width_end = current_bbox_corners[width_edge_indices[1]]
-        gpu_draw_line(width_start, width_end, (0.0, 1.0, 0.0, 0.9))  # 纯绿
+        draw_line(width_start, width_end, (0.0, 1.0, 0.0, 0.9))  # 纯绿
 
         # 3. 绘制高度线 (Z轴) - 使用分析后的高度边
         height_start = current_bbox_corners[height_edge_indices[0]]
         height_end = current_bbox_corners[height_edge_indices[1]]
-        gpu_draw_line(height_start, height_end, (0.0, 0.0, 1.0, 0.9))  # 纯蓝
+        draw_line(height_start, height_end, (0.0, 0.0, 1.0, 0.9))  # 纯蓝
            
     def draw_measurement_text(self, context):
         """绘制测量文本标注 - 2D屏幕空间。
@@ -476,46 +1165,141 @@ class MeasurementDrawHandler:
         - 全局显示开启时：可见物体显示完整三项文本；被隐藏的物体仅显示“名称（隐藏）”。
         - 全局显示关闭时：所有已测量物体仅显示“名称（隐藏）”。
         """
-        if not measurement_results:
+        if not measurement_registry:
             return
         
+        start_time = time.perf_counter()
+        
         # 设置文本绘制参数
-        blf.size(0, 16)  # 增加字体大小，让文本更粗更清晰
+        blf.size(0, LABEL_FONT_SIZE)  # 增加字体大小，让文本更粗更清晰
         
-        for item in measurement_results:
-            obj = bpy.data.objects.get(item['name'])
-            if not obj or obj.type != 'MESH':
-                continue
-            
-            global object_annotation_states, show_3d_annotations
-            is_obj_visible = object_annotation_states.get(obj.name, True)
+        # 批量模式：先收集全部标注，再统一投影、剔除屏幕外标注并合并背景绘制
+        if use_batched_drawing():
+            self.label_queue = []
+        
+        try:
+            for item, obj, is_far in self.get_visible_items(context):
+                is_obj_visible = item.annotation_visible
 
-            if show_3d_annotations and is_obj_visible:
-                # 显示完整文本
-                self._draw_dynamic_text_calculation(obj, context, item)
-            else:
-                # 仅显示名称（隐藏）
-                current_bbox_corners = self.get_current_bbox_corners(obj, item['dimensions'])
-                if current_bbox_corners and len(current_bbox_corners) == 8:
-                    bbox_top_center = Vector((
-                        sum(corner.x for corner in current_bbox_corners) / 8,
-                        sum(corner.y for corner in current_bbox_corners) / 8,
-                        max(corner.z for corner in current_bbox_corners) + 0.2
-                    ))
+                if show_3d_annotations and is_obj_visible and not is_far:
+                    # 显示完整文本
+                    self._draw_dynamic_text_calculation(obj, context, item)
                 else:
-                    bbox_top_center = obj.location
-                self.draw_text_3d(f"名称: {obj.name}（隐藏）", bbox_top_center, context, (0.8, 0.8, 0.8, 1.0))
+                    # 仅显示名称（隐藏对象标注“隐藏”，远处对象只显示名称）
+                    current_bbox_corners = self.get_current_bbox_corners(obj)
+                    if current_bbox_corners and len(current_bbox_corners) == 8:
+                        bbox_top_center = Vector((
+                            sum(corner.x for corner in current_bbox_corners) / 8,
+                            sum(corner.y for corner in current_bbox_corners) / 8,
+                            max(corner.z for corner in current_bbox_corners) + 0.2
+                        ))
+                    else:
+                        bbox_top_center = obj.location
+                    if show_3d_annotations and is_obj_visible:
+                        self.draw_text_3d(f"名称: {obj.name}", bbox_top_center, context, (1.0, 1.0, 0.0, 1.0), LABEL_PRIORITY_NAME)
+                    else:
+                        self.draw_text_3d(f"名称: {obj.name}（隐藏）", bbox_top_center, context, (0.8, 0.8, 0.8, 1.0), LABEL_PRIORITY_HIDDEN)
+            
+            if self.label_queue is not None:
+                self._flush_labels(context)
+        finally:
+            self.label_queue = None
+        
+        self.text_timer.record(start_time)
+    
+    def measure_label(self, text):
+        """获取标注文本尺寸（按 文本/字号/DPI 缓存，避免每帧调用 blf.dimensions）"""
+        key = (text, LABEL_FONT_SIZE, bpy.context.preferences.system.dpi)
+        size = self.label_size_cache.get(key)
+        if size is None:
+            if len(self.label_size_cache) >= LABEL_SIZE_CACHE_LIMIT:
+                self.label_size_cache.clear()
+            blf.size(0, LABEL_FONT_SIZE)
+            size = blf.dimensions(0, text)
+            self.label_size_cache[key] = size
+        return size
+    
+    def _layout_labels(self, context):
+        """
+        批量布局已收集的标注：一次投影全部锚点，剔除视点后方与屏幕外的标注
+        
+        Returns:
+            list: [(text, color, text_x, text_y, bg_x, bg_y, bg_width, bg_height, priority), ...]
+        """
+        region = context.region
+        rv3d = context.region_data
+        if not region or not rv3d or not self.label_queue:
+            return []
+        
+        settings = getattr(bpy.context.scene, "object_measure_settings", None)
+        use_declutter = settings is None or settings.use_label_declutter
+        
+        # 视图与标注内容未变化时直接复用上次布局
+        layout_key = (
+            matrix_key(rv3d.perspective_matrix), region.width, region.height, use_declutter,
+            tuple((text, tuple(location), priority) for text, location, _, priority in self.label_queue)
+        )
+        if layout_key == self.label_layout_key:
+            return self.label_layout
+        
+        coords, in_front = project_points_to_region(region, rv3d, [location for _, location, _, _ in self.label_queue])
+        
+        layout = []
+        for (text, _, color, priority), (x, y), visible in zip(self.label_queue, coords, in_front):
+            if not visible:
+                continue
+            text_width, text_height = self.measure_label(text)
+            bg_width = text_width + LABEL_PADDING * 2
+            bg_height = text_height + LABEL_PADDING * 2
+            bg_x = x - bg_width / 2
+            bg_y = y - bg_height / 2
+            # 背景矩形完全位于区域外时跳过
+            if bg_x + bg_width < 0 or bg_y + bg_height < 0 or bg_x > region.width or bg_y > region.height:
+                continue
+            layout.append((text, color, x - text_width / 2, y - text_height / 2, bg_x, bg_y, bg_width, bg_height, priority))
+        
+        if use_declutter:
+            layout = declutter_labels(layout)
+        
+        self.label_layout_key = layout_key
+        self.label_layout = layout
+        return layout
+    
+    def _flush_labels(self, context):
+        """绘制已收集的标注：全部背景矩形合并为一个 TRIS 批次，随后逐个绘制文本"""
+        layout = self._layout_labels(context)
+        if not layout:
+            return
+        
+        vertices = []
+        indices = []
+        for _, _, _, _, x, y, width, height, _ in layout:
+            base = len(vertices)
+            vertices.extend(((x, y), (x + width, y), (x + width, y + height), (x, y + height)))
+            indices.extend(((base, base + 1, base + 2), (base, base + 2, base + 3)))
+        
+        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+        batch = batch_for_shader(shader, 'TRIS', {"pos": vertices}, indices=indices)
+        gpu.state.blend_set('ALPHA')
+        shader.bind()
+        shader.uniform_float("color", LABEL_BG_COLOR)
+        batch.draw(shader)
+        gpu.state.blend_set('NONE')
+        
+        blf.size(0, LABEL_FONT_SIZE)
+        for text, color, text_x, text_y, _, _, _, _, _ in layout:
+            blf.color(0, *color)
+            blf.position(0, text_x, text_y, 0)
+            blf.draw(0, text)
     
     
     def _draw_dynamic_text_calculation(self, obj, context, item):
         """动态文本计算逻辑"""
-        current_bbox_corners = self.get_current_bbox_corners(obj, item['dimensions'])
+        # 复用本帧线条处理器已完成的分析结果
+        current_bbox_corners, current_dimensions = self.get_frame_analysis(obj, item)
         if current_bbox_corners and len(current_bbox_corners) == 8:
             # 获取12条边的数据
-            edges_data = item['dimensions'].get('edges_data', {})
-            
-            # 动态计算当前测量数据，包括最终确定的边索引
-            current_dimensions = self.calculate_current_dimensions(current_bbox_corners, edges_data)
+            edges_data = item.edges_data
             
             # 从分析结果中获取最终确定的边索引
             final_edges = current_dimensions.get('final_edges', {})
@@ -554,19 +1338,14 @@ class MeasurementDrawHandler:
                 sum(corner.y for corner in current_bbox_corners) / 8,
                 max(corner.z for corner in current_bbox_corners) + 0.2  # 在最高点上方0.2米
             ))
-            self.draw_text_3d(f"名称: {obj.name}", bbox_top_center, context, (1.0, 1.0, 0.0, 1.0))  # 黄色显示物体名称
+            self.draw_text_3d(f"名称: {obj.name}", bbox_top_center, context, (1.0, 1.0, 0.0, 1.0), LABEL_PRIORITY_NAME)  # 黄色显示物体名称
             
             # 面积文本 - 显示在对象中心位置（根据状态显示不同文本）
             obj_center = obj.location
             static_area = edges_data.get('static_area', 0)  # 使用静态缓存的表面积
             
-            # 更新面积状态（这会触发状态检测和更新）
-            self._is_area_expired(obj, item)
-            
-            # 获取更新后的面积状态
-            global object_area_states
-            area_state = object_area_states.get(obj.name, {})
-            state = area_state.get('state', 'initial')
+            # 面积状态由 AreaDirtyTracker 在对象变化时预先更新，这里只读取标记
+            state = item.area_state
             
             # 根据状态显示不同的文本和颜色
             if state == 'expired':
@@ -576,7 +1355,7 @@ class MeasurementDrawHandler:
                 area_text = f"面积: {static_area:.2f}m2"
                 area_color = (1.0, 1.0, 1.0, 1.0)  # 白色表示正常
             
-            self.draw_text_3d(area_text, obj_center, context, area_color)
+            self.draw_text_3d(area_text, obj_center, context, area_color, LABEL_PRIORITY_AREA)
     
     def _draw_cached_text(self, obj, context):
         """使用缓存数据绘制文本 - 已废弃，现在所有文本都使用动态计算"""
@@ -597,58 +1376,21 @@ class MeasurementDrawHandler:
         width_edge_indices = final_edges.get('width_edge_indices', (1, 2))
         height_edge_indices = final_edges.get('height_edge_indices', (0, 4))
         
-        # 改进：按边的方向自动分组，找出三组平行边
-        world_z_axis = Vector((0, 0, 1))  # 世界坐标Z轴方向
-        
-        # 定义所有12条边
-        all_edges = build_all_edges(current_bbox_corners)
-        
-        # 使用全局的平行边分组函数
-        
-        # 获取三组平行边
-        parallel_groups = group_parallel_edges(all_edges)
-        
-        # 使用全局的代表边选择函数
-        
-        # 确保我们有三组平行边
-        if len(parallel_groups) >= 3:
-            # 为每组计算与Z轴的对齐度，并选择代表边
-            group_representatives = []
-            
-            for group in parallel_groups:
-                edge_indices, edge_length, z_alignment = select_representative_edge(group, world_z_axis)
-                if edge_indices:
-                    group_representatives.append((edge_indices, edge_length, z_alignment, group))
+        # 优先使用闭式轴分析（常数时间），退化包围盒回退到逐对平行边分组
+        axis_analysis = analyze_bbox_axes(current_bbox_corners) or analyze_bbox_groups_pairwise(current_bbox_corners)
+        if axis_analysis is not None:
+            height_edge_indices = axis_analysis['height_edge_indices']
+            length_edge_indices = axis_analysis['length_edge_indices']
+            width_edge_indices = axis_analysis['width_edge_indices']
+            bbox_height = axis_analysis['height']
+            bbox_length = axis_analysis['length']
+            bbox_width = axis_analysis['width']
             
-            # 确保我们有三个有效的代表边
-            if len(group_representatives) >= 3:
-                # 选择与Z轴最对齐的作为高度
-                group_representatives.sort(key=lambda x: x[2], reverse=True)  # 按Z轴对齐度排序
-                
-                # 高度：Z轴对齐度最高的组
-                height_edge_indices = group_representatives[0][0]
-                bbox_height = group_representatives[0][1]
-                
-                # 长度和宽度：剩下两组按边长度排序
-                remaining_groups = group_representatives[1:3]
-                remaining_groups.sort(key=lambda x: x[1], reverse=True)  # 按边长度排序
-                
-                length_edge_indices = remaining_groups[0][0]
-                bbox_length = remaining_groups[0][1]
-                
-                width_edge_indices = remaining_groups[1][0]
-                bbox_width = remaining_groups[1][1]
-                
-                # 更新原始数据中的边索引
-                if 'final_edges' in edges_data:
-                    edges_data['final_edges']['height_edge_indices'] = height_edge_indices
-                    edges_data['final_edges']['length_edge_indices'] = length_edge_indices
-                    edges_data['final_edges']['width_edge_indices'] = width_edge_indices
-            else:
-                # 回退到原来的逻辑
-                bbox_length = (current_bbox_corners[length_edge_indices[1]] - current_bbox_corners[length_edge_indices[0]]).length
-                bbox_width = (current_bbox_corners[width_edge_indices[1]] - current_bbox_corners[width_edge_indices[0]]).length
-                bbox_height = (current_bbox_corners[height_edge_indices[1]] - current_bbox_corners[height_edge_indices[0]]).length
+            # 更新原始数据中的边索引
+            if 'final_edges' in edges_data:
+                edges_data['final_edges']['height_edge_indices'] = height_edge_indices
+                edges_data['final_edges']['length_edge_indices'] = length_edge_indices
+                edges_data['final_edges']['width_edge_indices'] = width_edge_indices
         else:
             # 回退到原来的逻辑
             bbox_length = (current_bbox_corners[length_edge_indices[1]] - current_bbox_corners[length_edge_indices[0]]).length
@@ -718,8 +1460,13 @@ class MeasurementDrawHandler:
         shader.uniform_float("color", color)
         batch.draw(shader)
     
-    def draw_text_3d(self, text, location, context, color):
-        """在3D空间中绘制文本（带半透明矩形背景）"""
+    def draw_text_3d(self, text, location, context, color, priority=LABEL_PRIORITY_DIMENSION):
+        """在3D空间中绘制文本（带半透明矩形背景）
+        批量模式下只把标注加入 label_queue，由 _flush_labels 统一布局（去重叠时按 priority 取舍）并绘制"""
+        if self.label_queue is not None:
+            self.label_queue.append((text, location, color, priority))
+            return
+        
         # 导入view3d_utils
         from bpy_extras import view3d_utils
         
@@ -790,13 +1537,1630 @@ class MeasurementDrawHandler:
             bpy.types.SpaceView3D.draw_handler_remove(self.text_handler, 'WINDOW')
             self.text_handler = None
 
-def calculate_surface_area_3d_print_style(obj):
+# ==================== 测量结果注册表 ====================
+
+class MeasurementRecord:
+    """单个已测量对象的紧凑记录（__slots__）
+    
+    合并了原先分散在测量结果列表、标注显示状态与面积状态字典中的每对象数据；
+    只保留绘制与刷新所需的字段，不再保存世界角点、边列表等可随时重算的中间结果。
     """
-    参照3D print box方法计算表面积
-    使用bmesh进行更精确的计算，考虑对象变换
     
-    Args:
-        obj: Blender对象
+    __slots__ = (
+        'uid', 'name',
+        'length', 'width', 'height', 'area', 'volume',
+        'edges_data',  # {'selected_height_edge', 'static_area', 'area_info', 'hull_info'}
+        'final_edges', 'analysis_info',
+        'annotation_visible',  # 该物体的标注是否显示
+        'area_state',  # 'current' / 'expired'
+        'recorded_length', 'recorded_width', 'recorded_height',  # 面积有效时记录的长宽高
+        'fingerprint',  # 面积有效时记录的网格指纹
+        'local_box',  # 最小定向包围盒局部角点（未开启 OBB 时为 None，绘制使用 obj.bound_box）
+    )
+    
+    def __init__(self, obj, dimensions):
+        self.uid = MeasurementRegistry.object_key(obj)
+        self.name = obj.name
+        self.annotation_visible = True
+        self.update_dimensions(dimensions)
+        self.mark_current(dimensions.get('length', 0), dimensions.get('width', 0), dimensions.get('height', 0), measured_fingerprint(obj))
+    
+    def update_dimensions(self, dimensions):
+        """用 get_mesh_dimensions 的结果更新尺寸与面积数据"""
+        edges_data = dimensions.get('edges_data', {})
+        self.length = dimensions.get('length', 0)
+        self.width = dimensions.get('width', 0)
+        self.height = dimensions.get('height', 0)
+        self.area = dimensions.get('area', 0)
+        self.volume = dimensions.get('volume', 0)
+        self.edges_data = {
+            'selected_height_edge': edges_data.get('selected_height_edge'),
+            'static_area': edges_data.get('static_area', self.area),
+            'area_info': edges_data.get('area_info', {}),
+            'hull_info': edges_data.get('hull_info')
+        }
+        self.final_edges = dimensions.get('final_edges', {})
+        self.analysis_info = dimensions.get('analysis_info', {})
+        self.local_box = dimensions.get('local_box')
+    
+    def mark_current(self, length, width, height, fingerprint):
+        """记录面积有效时的长宽高与网格指纹，并将面积状态设为当前"""
+        self.recorded_length = length
+        self.recorded_width = width
+        self.recorded_height = height
+        self.fingerprint = fingerprint
+        self.area_state = 'current'
+    
+
+class MeasurementRegistry:
+    """已测量对象注册表 - 以对象 session_uid 为键的字典
+    
+    - 增删查均为 O(1)，替代对测量结果列表的线性扫描与列表重建
+    - 同时维护名称 -> uid 映射，供空间索引与 depsgraph 跟踪按名称查找
+    - 对象改名时在下一次按对象查找（depsgraph 更新）时同步名称
+    """
+    
+    def __init__(self):
+        self.records = {}  # uid -> MeasurementRecord
+        self.uids = {}  # object name -> uid
+        self.hidden_unmeasured = set()  # 切换为隐藏但尚未测量的对象 uid（只影响虚线包围盒）
+    
+    @staticmethod
+    def object_key(obj):
+        """对象在本次会话内的稳定键（改名不变）；旧版本 Blender 没有 session_uid 时退回名称"""
+        return getattr(obj, 'session_uid', None) or obj.name_full
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __iter__(self):
+        return iter(list(self.records.values()))
+    
+    def get(self, obj):
+        """按对象查找记录（同步改名）"""
+        record = self.records.get(self.object_key(obj))
+        if record is not None and record.name != obj.name:
+            self.uids.pop(record.name, None)
+            record.name = obj.name
+            self.uids[record.name] = record.uid
+            measured_object_index.invalidate()
+        return record
+    
+    def get_by_name(self, name):
+        """按对象名称查找记录"""
+        uid = self.uids.get(name)
+        return self.records.get(uid) if uid is not None else None
+    
+    def add(self, obj, dimensions):
+        """为对象新建记录（已存在时返回 None）"""
+        if self.get(obj) is not None:
+            return None
+        record = MeasurementRecord(obj, dimensions)
+        self.records[record.uid] = record
+        self.uids[record.name] = record.uid
+        self.hidden_unmeasured.discard(record.uid)
+        return record
+    
+    def remove(self, obj):
+        """移除对象的记录与标注状态，返回被移除的记录（不存在时返回 None）"""
+        key = self.object_key(obj)
+        self.hidden_unmeasured.discard(key)
+        record = self.records.pop(key, None)
+        if record is not None and self.uids.get(record.name) == key:
+            del self.uids[record.name]
+        # 移除后对象不再被跟踪，丢弃其定向包围盒缓存
+        oriented_box_engine.invalidate(key)
+        return record
+    
+    def resolve(self, record):
+        """获取记录对应的 Blender 对象（对象已删除或同名对象不是原对象时返回 None）"""
+        obj = bpy.data.objects.get(record.name)
+        if obj is None or self.object_key(obj) != record.uid:
+            return None
+        return obj
+    
+    def is_annotation_visible(self, obj):
+        """物体的标注是否显示（未测量的物体也可被切换为隐藏）"""
+        record = self.get(obj)
+        if record is not None:
+            return record.annotation_visible
+        return self.object_key(obj) not in self.hidden_unmeasured
+    
+    def toggle_annotation(self, obj):
+        """切换物体的标注显示状态"""
+        record = self.get(obj)
+        if record is not None:
+            record.annotation_visible = not record.annotation_visible
+            return
+        key = self.object_key(obj)
+        if key in self.hidden_unmeasured:
+            self.hidden_unmeasured.remove(key)
+        else:
+            self.hidden_unmeasured.add(key)
+    
+    def annotation_counts(self):
+        """返回 (显示数量, 隐藏数量)"""
+        hidden = sum(1 for record in self.records.values() if not record.annotation_visible)
+        return len(self.records) - hidden, hidden + len(self.hidden_unmeasured)
+    
+    def clear(self):
+        self.records.clear()
+        self.uids.clear()
+        self.hidden_unmeasured.clear()
+        oriented_box_engine.invalidate()
+
+measurement_registry = MeasurementRegistry()
+
+# ==================== 测量结果持久化 ====================
+
+MEASURE_STORE_KEY = "object_measure_store"  # 场景 ID 属性：紧凑测量记录
+MEASURE_STORE_VERSION = 1
+# 每个对象一条定长记录（float64），整数字段（边索引、计数、标志位）以浮点精确保存
+MEASURE_RECORD_FIELDS = (
+    'length', 'width', 'height', 'area', 'volume',
+    'recorded_length', 'recorded_width', 'recorded_height',
+    'mesh_volume', 'min_face_area', 'max_face_area', 'avg_face_area',
+    'face_count', 'vertex_count', 'edge_count', 'method', 'flags',
+    'length_edge_0', 'length_edge_1', 'width_edge_0', 'width_edge_1',
+    'height_edge_0', 'height_edge_1', 'height_sel_0', 'height_sel_1',
+)
+MEASURE_RECORD_STRIDE = len(MEASURE_RECORD_FIELDS)
+MEASURE_CALC_METHODS = ('CALCULATION_FAILED', 'NUMPY_LOOP_TRIANGLES', 'BMESH_3D_PRINT_STYLE')
+MEASURE_FLAG_VISIBLE = 1  # 标注显示
+MEASURE_FLAG_EXPIRED = 2  # 面积已过期
+MEASURE_FLAG_HAS_EDGES = 4  # 记录了固定的长宽高边索引
+MEASURE_FLAG_HAS_SELECTED = 8  # 记录了选定的高度边
+
+def _pack_record(record):
+    """把一条测量记录编码为定长浮点序列"""
+    area_info = record.edges_data.get('area_info') or {}
+    final_edges = record.final_edges or {}
+    selected = record.edges_data.get('selected_height_edge')
+    method = area_info.get('calculation_method', 'CALCULATION_FAILED')
+    flags = 0
+    if record.annotation_visible:
+        flags |= MEASURE_FLAG_VISIBLE
+    if record.area_state == 'expired':
+        flags |= MEASURE_FLAG_EXPIRED
+    edges = (
+        final_edges.get('length_edge_indices'),
+        final_edges.get('width_edge_indices'),
+        final_edges.get('height_edge_indices'),
+    )
+    if all(edges):
+        flags |= MEASURE_FLAG_HAS_EDGES
+    else:
+        edges = ((0, 1), (1, 2), (0, 4))
+    if selected:
+        flags |= MEASURE_FLAG_HAS_SELECTED
+    else:
+        selected = (0, 0)
+    return (
+        record.length, record.width, record.height, record.area, record.volume,
+        record.recorded_length, record.recorded_width, record.recorded_height,
+        area_info.get('volume', 0.0), area_info.get('min_face_area', 0.0),
+        area_info.get('max_face_area', 0.0), area_info.get('avg_face_area', 0.0),
+        area_info.get('face_count', 0), area_info.get('vertex_count', 0), area_info.get('edge_count', 0),
+        MEASURE_CALC_METHODS.index(method) if method in MEASURE_CALC_METHODS else 0, flags,
+        edges[0][0], edges[0][1], edges[1][0], edges[1][1], edges[2][0], edges[2][1],
+        selected[0], selected[1],
+    )
+
+def _unpack_record(values):
+    """把定长浮点序列解码为 (dimensions, 状态字段)，dimensions 与 get_mesh_dimensions 结构一致"""
+    fields = dict(zip(MEASURE_RECORD_FIELDS, values))
+    flags = int(fields['flags'])
+    area = fields['area']
+    volume = fields['mesh_volume']
+    area_info = {
+        'total_area': area,
+        'face_count': int(fields['face_count']),
+        'vertex_count': int(fields['vertex_count']),
+        'edge_count': int(fields['edge_count']),
+        'min_face_area': fields['min_face_area'],
+        'max_face_area': fields['max_face_area'],
+        'avg_face_area': fields['avg_face_area'],
+        'volume': volume,
+        'area_volume_ratio': area / volume if volume > 0 else 0,
+        'calculation_method': MEASURE_CALC_METHODS[int(fields['method'])]
+    }
+    final_edges = {}
+    if flags & MEASURE_FLAG_HAS_EDGES:
+        final_edges = {
+            'length_edge_indices': (int(fields['length_edge_0']), int(fields['length_edge_1'])),
+            'width_edge_indices': (int(fields['width_edge_0']), int(fields['width_edge_1'])),
+            'height_edge_indices': (int(fields['height_edge_0']), int(fields['height_edge_1']))
+        }
+    selected = None
+    if flags & MEASURE_FLAG_HAS_SELECTED:
+        selected = (int(fields['height_sel_0']), int(fields['height_sel_1']))
+    dimensions = {
+        'length': fields['length'],
+        'width': fields['width'],
+        'height': fields['height'],
+        'area': area,
+        'volume': fields['volume'],
+        'edges_data': {
+            'selected_height_edge': selected,
+            'static_area': area,
+            'area_info': area_info
+        },
+        'final_edges': final_edges
+    }
+    state = {
+        'annotation_visible': bool(flags & MEASURE_FLAG_VISIBLE),
+        'expired': bool(flags & MEASURE_FLAG_EXPIRED),
+        'recorded': (fields['recorded_length'], fields['recorded_width'], fields['recorded_height'])
+    }
+    return dimensions, state
+
+def persist_measurements(scene):
+    """
+    把注册表写入场景 ID 属性（紧凑格式）
+    
+    - names: 对象名称列表
+    - records: 每个对象 MEASURE_RECORD_STRIDE 个 float64 的定长记录，整体作为一个数组属性
+    - face_area_stats: 每个对象 FACE_AREA_STATS_STRIDE 个 float64 的面积统计（含直方图），无统计的对象数量记为 -1
+    - hull_info: 每个对象 HULL_INFO_STRIDE 个 float64 的凸包与拓扑分析结果，未分析的对象凸包面积记为 -1
+    - area_breakdown / breakdown_attributes: 每个对象一段变长的面积拆分（见 _pack_area_breakdown）与分组属性名
+    """
+    records = list(measurement_registry)
+    if not records:
+        if MEASURE_STORE_KEY in scene:
+            del scene[MEASURE_STORE_KEY]
+        return
+    
+    packed = array.array('d')
+    packed_stats = array.array('d')
+    packed_hulls = array.array('d')
+    packed_breakdowns = array.array('d')
+    breakdown_attributes = []
+    missing_stats = (-1.0,) + (0.0,) * (FACE_AREA_STATS_STRIDE - 1)
+    missing_hull = (-1.0,) + (0.0,) * (HULL_INFO_STRIDE - 1)
+    for record in records:
+        packed.extend(_pack_record(record))
+        stats = (record.edges_data.get('area_info') or {}).get('face_area_stats')
+        packed_stats.extend(_pack_face_area_stats(stats) if stats else missing_stats)
+        hull_info = record.edges_data.get('hull_info')
+        packed_hulls.extend(_pack_hull_info(hull_info) if hull_info else missing_hull)
+        area_breakdown = (record.edges_data.get('area_info') or {}).get('area_breakdown')
+        packed_breakdowns.extend(_pack_area_breakdown(area_breakdown))
+        breakdown_attributes.append(area_breakdown['attribute'] if area_breakdown else "")
+    
+    scene[MEASURE_STORE_KEY] = {
+        'version': MEASURE_STORE_VERSION,
+        'stride': MEASURE_RECORD_STRIDE,
+        'names': [record.name for record in records],
+        'records': packed,
+        'face_area_stats': packed_stats,
+        'hull_info': packed_hulls,
+        'area_breakdown': packed_breakdowns,
+        'breakdown_attributes': breakdown_attributes
+    }
+    
+    # 旧版本整体写入的测量结果（含逐面面积列表）不再保留
+    if 'mesh_measurements' in scene:
+        del scene['mesh_measurements']
+
+HULL_INFO_FIELDS = ('hull_area', 'hull_volume', 'boundary_edges', 'nonmanifold_edges', 'flipped_edges', 'loose_edges')
+HULL_INFO_STRIDE = len(HULL_INFO_FIELDS)
+
+def _pack_hull_info(hull_info):
+    """把凸包与拓扑分析结果编码为定长浮点序列"""
+    return tuple(float(hull_info[field]) for field in HULL_INFO_FIELDS)
+
+def _unpack_hull_info(values):
+    """由定长浮点序列还原凸包与拓扑分析结果（无结果时返回 None）"""
+    if values[0] < 0:
+        return None
+    hull_info = dict(zip(HULL_INFO_FIELDS, values))
+    for field in HULL_INFO_FIELDS[2:]:
+        hull_info[field] = int(hull_info[field])
+    hull_info['is_closed'] = hull_info['boundary_edges'] == 0
+    hull_info['is_manifold'] = hull_info['nonmanifold_edges'] == 0 and hull_info['flipped_edges'] == 0
+    hull_info['is_watertight'] = hull_info['is_closed'] and hull_info['is_manifold'] and hull_info['loose_edges'] == 0
+    return hull_info
+
+def _pack_area_breakdown(area_breakdown):
+    """把面积拆分编码为变长浮点段：[模式, 组数, (编号, 面积, 体积, 三角形数) × 组数]"""
+    if not area_breakdown:
+        return (0.0, 0.0)
+    values = [float(AREA_BREAKDOWN_MODES.index(area_breakdown['mode'])), float(len(area_breakdown['groups']))]
+    for group in area_breakdown['groups']:
+        values.extend(float(value) for value in group)
+    return values
+
+def _unpack_area_breakdown(values, offset, attribute):
+    """
+    从 offset 处解码一段面积拆分
+    
+    Returns:
+        (面积拆分或 None, 下一段的 offset)
+    """
+    mode = int(values[offset])
+    count = int(values[offset + 1])
+    end = offset + 2 + 4 * count
+    if mode == 0:
+        return None, end
+    groups = [
+        (int(values[i]), values[i + 1], values[i + 2], int(values[i + 3]))
+        for i in range(offset + 2, end, 4)
+    ]
+    return {'mode': AREA_BREAKDOWN_MODES[mode], 'attribute': attribute, 'groups': groups}, end
+
+def _pack_face_area_stats(stats):
+    """把面积统计字典编码为定长浮点序列"""
+    values = (stats['count'], stats['sum'], stats['min'], stats['max'], stats['mean'], stats['variance'] * stats['count'])
+    return tuple(float(v) for v in values) + tuple(float(c) for c in stats['histogram'])
+
+def _unpack_face_area_stats(values):
+    """由定长浮点序列还原面积统计字典（无统计时返回 None）"""
+    if values[0] < 0:
+        return None
+    return FaceAreaStats.from_values(values).as_dict()
+
+def face_area_stats_from_list(face_areas):
+    """由旧版逐面面积列表计算面积统计（迁移旧文件用）"""
+    stats = FaceAreaStats()
+    if np is not None:
+        stats.update(face_areas)
+    else:
+        for value in face_areas:
+            stats.add(value)
+    return stats.as_dict()
+
+def restore_measurements(scene):
+    """从场景 ID 属性恢复测量记录（兼容旧版 mesh_measurements 列表，恢复后改写为紧凑格式）"""
+    entries = []
+    store = scene.get(MEASURE_STORE_KEY)
+    if store is not None and store.get('version') == MEASURE_STORE_VERSION:
+        stride = store.get('stride', MEASURE_RECORD_STRIDE)
+        values = store['records'].to_list()
+        stats_values = store['face_area_stats'].to_list() if 'face_area_stats' in store else []
+        hull_values = store['hull_info'].to_list() if 'hull_info' in store else []
+        breakdown_values = store['area_breakdown'].to_list() if 'area_breakdown' in store else []
+        breakdown_attributes = list(store.get('breakdown_attributes', ()))
+        breakdown_offset = 0
+        for index, name in enumerate(store['names']):
+            if stride != MEASURE_RECORD_STRIDE:
+                break
+            dimensions, state = _unpack_record(values[index * stride:(index + 1) * stride])
+            stats = stats_values[index * FACE_AREA_STATS_STRIDE:(index + 1) * FACE_AREA_STATS_STRIDE]
+            if len(stats) == FACE_AREA_STATS_STRIDE:
+                face_area_stats = _unpack_face_area_stats(stats)
+                if face_area_stats is not None:
+                    dimensions['edges_data']['area_info']['face_area_stats'] = face_area_stats
+            hull = hull_values[index * HULL_INFO_STRIDE:(index + 1) * HULL_INFO_STRIDE]
+            if len(hull) == HULL_INFO_STRIDE:
+                dimensions['edges_data']['hull_info'] = _unpack_hull_info(hull)
+            if breakdown_offset + 2 <= len(breakdown_values):
+                attribute = breakdown_attributes[index] if index < len(breakdown_attributes) else ""
+                area_breakdown, breakdown_offset = _unpack_area_breakdown(breakdown_values, breakdown_offset, attribute)
+                if area_breakdown is not None:
+                    dimensions['edges_data']['area_info']['area_breakdown'] = area_breakdown
+            entries.append((name, dimensions, state))
+    
+    legacy = scene.get('mesh_measurements')
+    migrate = store is None and legacy is not None
+    if migrate:
+        for item in legacy:
+            item = item.to_dict() if hasattr(item, 'to_dict') else dict(item)
+            dims = item.get('dimensions')
+            if item.get('name') and dims:
+                # 旧版逐面面积列表折算为定长统计后丢弃
+                area_info = dims.get('edges_data', {}).get('area_info', {})
+                face_areas = area_info.pop('face_areas', None)
+                if face_areas:
+                    area_info['face_area_stats'] = face_area_stats_from_list(face_areas)
+                entries.append((item['name'], dims, None))
+    
+    restored = 0
+    for name, dimensions, state in entries:
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.type != 'MESH':
+            continue
+        record = measurement_registry.add(obj, dimensions)
+        if record is None:
+            continue
+        record.local_box = oriented_local_box(obj)
+        if state is not None:
+            record.annotation_visible = state['annotation_visible']
+            if state['expired']:
+                record.area_state = 'expired'
+                record.fingerprint = None
+            else:
+                record.mark_current(*state['recorded'], measured_fingerprint(obj))
+        restored += 1
+    
+    if migrate:
+        persist_measurements(scene)
+    return restored
+
+_restore_pending = False  # 文件加载后尚未恢复测量记录
+
+def ensure_measurements_restored():
+    """若文件加载后尚未恢复测量记录，则立即恢复并启动绘制"""
+    global _restore_pending, show_3d_annotations, measurement_draw_handler, bounding_box_draw_handler
+    if not _restore_pending:
+        return
+    _restore_pending = False
+    
+    # 先启动跟踪器：恢复时记录的评估网格指纹需要带上跟踪器的版本号
+    area_dirty_tracker.start()
+    restored = 0
+    for scene in bpy.data.scenes:
+        if MEASURE_STORE_KEY in scene or 'mesh_measurements' in scene:
+            restored += restore_measurements(scene)
+    if not restored:
+        if not measurement_registry:
+            area_dirty_tracker.stop()
+        return
+    
+    measured_object_index.invalidate()
+    show_3d_annotations = bool(bpy.context.scene.get('show_3d_annotations', True))
+    if measurement_draw_handler is None:
+        measurement_draw_handler = MeasurementDrawHandler()
+    measurement_draw_handler.start(bpy.context)
+    if bounding_box_draw_handler is None:
+        bounding_box_draw_handler = BoundingBoxDrawHandler()
+    bounding_box_draw_handler.start(bpy.context)
+
+def _restore_measurements_timer():
+    """文件加载完成后的一次性定时器：在界面空闲时恢复测量记录"""
+    try:
+        ensure_measurements_restored()
+    except Exception as e:
+        print(f"[objectmeasure] 测量记录恢复失败: {e}")
+    return None
+
+@persistent
+def _on_load_post(*args):
+    """文件加载回调：丢弃上一个文件的测量记录，只标记待恢复（不在加载过程中解码）"""
+    global _restore_pending, collection_aggregate, clearance_results
+    collection_aggregate = None
+    clearance_results = None
+    annotation_datablock_pool.clear()
+    edit_selection_measure.states.clear()
+    edit_selection_measure.subscribe()
+    measurement_registry.clear()
+    measured_object_index.clear()
+    animation_series.clear()
+    if measurement_draw_handler is not None:
+        measurement_draw_handler.clear_cache()
+    _restore_pending = True
+    if not bpy.app.timers.is_registered(_restore_measurements_timer):
+        bpy.app.timers.register(_restore_measurements_timer, first_interval=0.1)
+
+# 输出随时间变化的修改器类型（不依赖 F 曲线也会逐帧改变几何）
+TIME_DEPENDENT_MODIFIERS = {
+    'CLOTH', 'SOFT_BODY', 'COLLISION', 'DYNAMIC_PAINT', 'FLUID', 'OCEAN', 'WAVE',
+    'MESH_CACHE', 'MESH_SEQUENCE_CACHE', 'EXPLODE', 'PARTICLE_SYSTEM', 'PARTICLE_INSTANCE', 'NODES',
+}
+
+def _has_animation(id_data):
+    animation_data = getattr(id_data, 'animation_data', None) if id_data is not None else None
+    return animation_data is not None and (animation_data.action is not None or len(animation_data.drivers) > 0
+                                           or len(animation_data.nla_tracks) > 0)
+
+def animation_state(obj):
+    """
+    判断对象在帧变化时可能改变的内容
+    
+    Returns:
+        tuple: (变换可能变化, 几何可能变化)
+    """
+    transform = False
+    parent = obj
+    while parent is not None and not transform:
+        transform = _has_animation(parent)
+        parent = parent.parent
+    
+    mesh = obj.data
+    # 修改器属性的 F 曲线/驱动器存放在对象的 animation_data 中
+    geometry = _has_animation(obj) and len(obj.modifiers) > 0
+    geometry = geometry or _has_animation(mesh) or _has_animation(getattr(mesh, 'shape_keys', None))
+    if not geometry:
+        for modifier in obj.modifiers:
+            if modifier.type in TIME_DEPENDENT_MODIFIERS:
+                geometry = True
+                break
+            # 骨架修改器随动画骨架变形
+            if modifier.type == 'ARMATURE' and _has_animation(getattr(modifier, 'object', None)):
+                geometry = True
+                break
+    return transform, geometry
+
+class AreaDirtyTracker:
+    """面积过期跟踪器 - 基于 depsgraph_update_post
+    
+    仅当已测量对象的几何或变换真正变化（is_updated_geometry / is_updated_transform）时，
+    才重新分析该对象的长宽高并更新 measurement_registry 记录中的过期标记；
+    绘制回调只读取预先计算的标记，空闲重绘的开销不再随对象数量增长。
+    """
+    
+    def __init__(self):
+        self.dirty_objects = set()  # 待重新分析的对象名称
+        self.geometry_dirty = set()  # 其中几何（含修改器栈输出）可能变化的对象名称
+        self.evaluations = 0  # 累计分析次数（调试用）
+        self.generations = {}  # object_key -> 评估几何版本号（is_updated_geometry 时递增）
+        self.epoch = None  # 回调注册期间的会话标识，停止后旧版本号全部作废
+    
+    def evaluated_generation(self, obj):
+        """对象评估几何的版本号；回调未注册（无法得知修改器栈输出是否变化）时返回 None"""
+        if self.epoch is None:
+            return None
+        return (self.epoch, self.generations.get(MeasurementRegistry.object_key(obj), 0))
+    
+    def on_depsgraph_update(self, scene, depsgraph):
+        """收集发生变化的已测量对象，并使对应网格的测量缓存失效"""
+        for update in depsgraph.updates:
+            id_data = getattr(update.id, 'original', update.id)
+            if isinstance(id_data, bpy.types.Mesh):
+                if update.is_updated_geometry:
+                    measurement_cache.invalidate_geometry(getattr(id_data, 'session_uid', None) or id_data.name_full)
+                continue
+            if not isinstance(id_data, bpy.types.Object):
+                continue
+            if update.is_updated_geometry:
+                # 未测量的对象同样递增（间隙检测按评估网格缓存 BVH）
+                key = MeasurementRegistry.object_key(id_data)
+                self.generations[key] = self.generations.get(key, 0) + 1
+            if not measurement_registry:
+                continue
+            # 按对象查找同时同步改名
+            record = measurement_registry.get(id_data)
+            if record is None:
+                continue
+            if update.is_updated_geometry or update.is_updated_transform:
+                self.mark(id_data, record, update.is_updated_geometry)
+        if self.dirty_objects:
+            measured_object_index.mark_dirty(self.dirty_objects)
+            self.flush()
+    
+    def mark(self, obj, record, geometry):
+        """标记对象待重新分析；geometry 为 True 时修改器栈输出可能变化，评估网格缓存失效"""
+        if geometry:
+            measurement_cache.invalidate_geometry(evaluated_geometry_key(obj))
+            oriented_box_engine.invalidate(record.uid)
+            self.geometry_dirty.add(record.name)
+        self.dirty_objects.add(record.name)
+    
+    def on_frame_change(self, scene):
+        """帧变化时只标记带动画的已测量对象（其余对象的变化仍由 depsgraph 更新报告）"""
+        if not measurement_registry:
+            return
+        for record in measurement_registry:
+            obj = measurement_registry.resolve(record)
+            if obj is None or obj.type != 'MESH':
+                continue
+            transform, geometry = animation_state(obj)
+            if transform or geometry:
+                self.mark(obj, record, geometry)
+        if self.dirty_objects:
+            measured_object_index.mark_dirty(self.dirty_objects)
+            self.flush()
+    
+    def flush(self):
+        """重新分析所有脏对象的面积状态"""
+        if not self.dirty_objects:
+            return
+        analyzer = measurement_draw_handler or MeasurementDrawHandler()
+        dirty = self.dirty_objects
+        geometry_dirty = self.geometry_dirty
+        self.dirty_objects = set()
+        self.geometry_dirty = set()
+        for name in dirty:
+            item = measurement_registry.get_by_name(name)
+            obj = measurement_registry.resolve(item) if item is not None else None
+            if obj is None or obj.type != 'MESH':
+                continue
+            # 定向包围盒在此处更新（几何失效或缩放变化时才重新拟合），绘制回调只读取记录中的角点
+            item.local_box = oriented_local_box(obj)
+            analyzer.evaluate_area_state(obj, item, name in geometry_dirty)
+            self.evaluations += 1
+    
+    def start(self):
+        """注册 depsgraph / 帧变化回调（避免重复添加）"""
+        if self.epoch is None:
+            self.epoch = time.perf_counter()
+        if _on_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+        if _on_frame_change_post not in bpy.app.handlers.frame_change_post:
+            bpy.app.handlers.frame_change_post.append(_on_frame_change_post)
+    
+    def stop(self):
+        """移除 depsgraph / 帧变化回调"""
+        if _on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+        if _on_frame_change_post in bpy.app.handlers.frame_change_post:
+            bpy.app.handlers.frame_change_post.remove(_on_frame_change_post)
+        self.dirty_objects.clear()
+        self.geometry_dirty.clear()
+        self.generations.clear()
+        self.epoch = None
+
+area_dirty_tracker = AreaDirtyTracker()
+
+def _on_depsgraph_update_post(scene, depsgraph):
+    """depsgraph 更新回调：转发给面积过期跟踪器"""
+    try:
+        area_dirty_tracker.on_depsgraph_update(scene, depsgraph)
+    except Exception as e:
+        print(f"[objectmeasure] 面积状态跟踪失败: {e}")
+
+def _on_frame_change_post(scene, depsgraph=None):
+    """帧变化回调：转发给面积过期跟踪器"""
+    try:
+        area_dirty_tracker.on_frame_change(scene)
+    except Exception as e:
+        print(f"[objectmeasure] 面积状态跟踪失败: {e}")
+
+# ==================== 编辑模式选区测量 ====================
+
+EDIT_MEASURE_TEXT_COLOR = (1.0, 0.85, 0.3, 1.0)
+EDIT_MEASURE_TEXT_MARGIN = 20  # 读数距视口左下角的像素
+
+class EditSelectionState:
+    """单个编辑中网格的选区测量状态
+    
+    - 拓扑计数、选中数与 select_history 末元素都未变：只是移动了顶点，只重算已选元素（O(选中数)）
+    - 选中数变化且恰好是点选新增一个面/一条边（select_history 末元素）：增量加入，不扫描网格
+    - 其余情况（框选、反选、拓扑变化等）：扫描一次选中元素，之后回到增量路径
+    世界空间面积由面积向量经 cof(M) 变换得到，非均匀缩放同样精确
+    """
+    
+    __slots__ = ('topology', 'selection', 'active', 'faces', 'edges', 'area', 'length')
+    
+    def __init__(self):
+        self.topology = None
+        self.selection = None
+        self.active = None
+        self.faces = set()  # 选中的 BMFace
+        self.edges = set()  # 选中的 BMEdge
+        self.area = 0.0
+        self.length = 0.0
+    
+    def update(self, obj):
+        mesh = obj.data
+        bm = bmesh.from_edit_mesh(mesh)
+        topology = (len(bm.verts), len(bm.edges), len(bm.faces))
+        selection = (mesh.total_face_sel, mesh.total_edge_sel)
+        active = bm.select_history.active
+        active_key = (type(active).__name__, active.index) if active is not None else None
+        
+        try:
+            if topology != self.topology:
+                self._scan(bm)
+            elif selection != self.selection or active_key != self.active:
+                if not self._add_clicked(active, selection):
+                    self._scan(bm)
+            self.topology = topology
+            self.selection = selection
+            self.active = active_key
+            self._measure(obj.matrix_world)
+        except ReferenceError:
+            # 撤销等操作会重建 bmesh，旧元素引用失效：重新扫描
+            self._scan(bm)
+            self._measure(obj.matrix_world)
+    
+    def _scan(self, bm):
+        self.faces = {face for face in bm.faces if face.select}
+        self.edges = {edge for edge in bm.edges if edge.select}
+    
+    def _add_clicked(self, active, selection):
+        """点选新增单个面或边时增量更新；无法确定变化的元素时返回 False"""
+        if self.selection is None or active is None or not active.select:
+            return False
+        if isinstance(active, bmesh.types.BMFace):
+            if selection[0] != self.selection[0] + 1 or active in self.faces:
+                return False
+            new_edges = [edge for edge in active.edges if edge.select and edge not in self.edges]
+            if selection[1] != self.selection[1] + len(new_edges):
+                return False
+            self.faces.add(active)
+        elif isinstance(active, bmesh.types.BMEdge):
+            if selection != (self.selection[0], self.selection[1] + 1) or active in self.edges:
+                return False
+            new_edges = [active]
+        else:
+            return False
+        self.edges.update(new_edges)
+        return True
+    
+    def _measure(self, matrix):
+        linear = matrix.to_3x3()
+        # cof(M) 的列为 M 各列两两叉积：(Ma)×(Mb) = cof(M)(a×b)
+        c0, c1, c2 = linear.col
+        cofactor = Matrix((c1.cross(c2), c2.cross(c0), c0.cross(c1))).transposed()
+        self.area = sum((cofactor @ (face.normal * face.calc_area())).length for face in self.faces)
+        self.length = sum((linear @ (edge.verts[0].co - edge.verts[1].co)).length for edge in self.edges)
+
+class EditSelectionMeasure:
+    """编辑模式选区实时测量
+    
+    由 depsgraph_update_post（选区/几何变化）与 msgbus（进出编辑模式、切换选择模式）触发更新，
+    绘制回调只读取缓存的结果，不做任何网格遍历
+    """
+    
+    def __init__(self):
+        self.states = {}  # object_key -> EditSelectionState
+        self.draw_handler = None
+        self.msgbus_owner = object()
+        self.update_ms = 0.0
+    
+    def start(self):
+        if self.draw_handler is None:
+            self.draw_handler = bpy.types.SpaceView3D.draw_handler_add(self.draw, (), 'WINDOW', 'POST_PIXEL')
+        if _on_edit_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.append(_on_edit_depsgraph_update_post)
+        self.subscribe()
+    
+    def subscribe(self):
+        """订阅模式与选择模式变化（文件加载后 msgbus 订阅会被清空，需要重新订阅）"""
+        bpy.msgbus.clear_by_owner(self.msgbus_owner)
+        for key in ((bpy.types.Object, "mode"), (bpy.types.ToolSettings, "mesh_select_mode")):
+            bpy.msgbus.subscribe_rna(key=key, owner=self.msgbus_owner, args=(), notify=_on_edit_msgbus_notify)
+    
+    def stop(self):
+        if self.draw_handler is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.draw_handler, 'WINDOW')
+            self.draw_handler = None
+        if _on_edit_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(_on_edit_depsgraph_update_post)
+        bpy.msgbus.clear_by_owner(self.msgbus_owner)
+        self.states.clear()
+    
+    @staticmethod
+    def enabled(scene):
+        settings = getattr(scene, "object_measure_settings", None)
+        return settings is not None and settings.use_edit_measure
+    
+    def refresh(self, view_layer, updated=None):
+        """更新编辑中网格的选区测量；updated 为本次 depsgraph 更新涉及的原始 ID 名称集合（None 表示全部）"""
+        objects = [obj for obj in view_layer.objects if obj.type == 'MESH' and obj.mode == 'EDIT']
+        keys = set()
+        start = time.perf_counter()
+        for obj in objects:
+            key = MeasurementRegistry.object_key(obj)
+            keys.add(key)
+            state = self.states.get(key)
+            if state is None:
+                state = self.states[key] = EditSelectionState()
+            elif updated is not None and obj.name not in updated and obj.data.name not in updated:
+                continue
+            state.update(obj)
+        for key in [key for key in self.states if key not in keys]:
+            del self.states[key]
+        if objects:
+            self.update_ms = (time.perf_counter() - start) * 1000.0
+    
+    def totals(self):
+        faces = edges = 0
+        area = length = 0.0
+        for state in self.states.values():
+            faces += len(state.faces)
+            edges += len(state.edges)
+            area += state.area
+            length += state.length
+        return faces, edges, area, length
+    
+    def draw(self):
+        if not self.states or bpy.context.mode != 'EDIT_MESH' or not self.enabled(bpy.context.scene):
+            return
+        faces, edges, area, length = self.totals()
+        lines = (
+            f"选中面 {faces}: 面积 {area:.4f} m²",
+            f"选中边 {edges}: 总长 {length:.4f} m",
+            f"更新 {self.update_ms:.2f} ms",
+        )
+        blf.size(0, LABEL_FONT_SIZE)
+        blf.color(0, *EDIT_MEASURE_TEXT_COLOR)
+        line_height = blf.dimensions(0, "Hg")[1] * 1.5
+        for index, text in enumerate(reversed(lines)):
+            blf.position(0, EDIT_MEASURE_TEXT_MARGIN, EDIT_MEASURE_TEXT_MARGIN + index * line_height, 0)
+            blf.draw(0, text)
+
+edit_selection_measure = EditSelectionMeasure()
+
+def _tag_view3d_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+@persistent
+def _on_edit_depsgraph_update_post(scene, depsgraph):
+    """depsgraph 更新回调：编辑模式下只更新本次有变化的编辑网格"""
+    if not EditSelectionMeasure.enabled(scene) or bpy.context.mode != 'EDIT_MESH':
+        return
+    try:
+        updated = {update.id.original.name for update in depsgraph.updates if isinstance(update.id, (bpy.types.Object, bpy.types.Mesh))}
+        if updated:
+            edit_selection_measure.refresh(depsgraph.view_layer, updated)
+    except Exception as e:
+        print(f"[objectmeasure] 编辑模式选区测量失败: {e}")
+
+def _on_edit_msgbus_notify(*args):
+    """msgbus 回调：进出编辑模式或切换选择模式时全量刷新"""
+    try:
+        context = bpy.context
+        if EditSelectionMeasure.enabled(context.scene) and context.mode == 'EDIT_MESH':
+            edit_selection_measure.refresh(context.view_layer)
+        else:
+            edit_selection_measure.states.clear()
+        _tag_view3d_redraw()
+    except Exception as e:
+        print(f"[objectmeasure] 编辑模式选区测量失败: {e}")
+
+# ==================== 已测量对象空间索引 ====================
+
+class MeasuredObjectIndex:
+    """已测量对象的空间索引 - 世界空间包围盒的均匀网格
+    
+    - 对象变换/几何变化时由 AreaDirtyTracker 标记为脏，下次查询前只重建脏条目
+    - 测量结果增删时整体失效，下次查询前完整重建（并按对象尺寸重新选择网格单元大小）
+    - 查询时先用视锥裁剪被占用的网格单元，再逐个裁剪候选对象的包围盒
+    """
+    
+    MAX_CELLS_PER_OBJECT = 64  # 跨越过多单元的大对象单独存放，每次查询都直接测试
+    
+    def __init__(self):
+        self.cell_size = 4.0
+        self.items = {}  # name -> MeasurementRecord
+        self.boxes = {}  # name -> (min(3), max(3)) 世界空间包围盒
+        self.cells = {}  # (i, j, k) -> set(name)
+        self.object_cells = {}  # name -> [cell_key, ...]
+        self.large_objects = set()
+        self.dirty = set()
+        self.stale = True
+    
+    def invalidate(self):
+        """测量记录发生增删或改名时调用：下次查询前完整重建"""
+        self.stale = True
+    
+    def mark_dirty(self, names):
+        """对象变换/几何变化时调用：下次查询前更新这些对象的包围盒"""
+        self.dirty.update(name for name in names if name in self.items)
+    
+    def sync(self):
+        """按需重建索引（完整重建或只更新脏条目）"""
+        if self.stale:
+            self._rebuild()
+        elif self.dirty:
+            for name in self.dirty:
+                self._remove(name)
+                self._insert(name)
+            self.dirty.clear()
+    
+    def _rebuild(self):
+        self.items = {record.name: record for record in measurement_registry}
+        self.boxes.clear()
+        self.cells.clear()
+        self.object_cells.clear()
+        self.large_objects.clear()
+        self.dirty.clear()
+        self.stale = False
+        
+        boxes = {name: self._world_box(name) for name in self.items}
+        boxes = {name: box for name, box in boxes.items() if box is not None}
+        if boxes:
+            # 网格单元取对象包围盒对角线中位数的两倍，使大多数对象只落在少量单元内
+            diagonals = sorted(float(np.linalg.norm(box[1] - box[0])) for box in boxes.values())
+            self.cell_size = max(0.01, diagonals[len(diagonals) // 2] * 2.0)
+        for name, box in boxes.items():
+            self._insert(name, box)
+    
+    def _world_box(self, name):
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.type != 'MESH':
+            return None
+        corners = np.array([tuple(corner) for corner in obj.bound_box], dtype=np.float64)
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        world = corners @ matrix[:3, :3].T + matrix[:3, 3]
+        return world.min(axis=0), world.max(axis=0)
+    
+    def _insert(self, name, box=None):
+        if box is None:
+            box = self._world_box(name)
+            if box is None:
+                return
+        self.boxes[name] = box
+        lo = np.floor(box[0] / self.cell_size).astype(np.int64)
+        hi = np.floor(box[1] / self.cell_size).astype(np.int64)
+        if np.prod(hi - lo + 1) > self.MAX_CELLS_PER_OBJECT:
+            self.large_objects.add(name)
+            return
+        keys = [(i, j, k)
+                for i in range(lo[0], hi[0] + 1)
+                for j in range(lo[1], hi[1] + 1)
+                for k in range(lo[2], hi[2] + 1)]
+        for key in keys:
+            self.cells.setdefault(key, set()).add(name)
+        self.object_cells[name] = keys
+    
+    def _remove(self, name):
+        self.boxes.pop(name, None)
+        self.large_objects.discard(name)
+        for key in self.object_cells.pop(name, ()):
+            cell = self.cells.get(key)
+            if cell is not None:
+                cell.discard(name)
+                if not cell:
+                    del self.cells[key]
+    
+    @staticmethod
+    def frustum_planes(perspective_matrix):
+        """从透视矩阵提取6个视锥平面 (6, 4)，平面内侧满足 n·p + d >= 0"""
+        m = np.array(perspective_matrix, dtype=np.float64)
+        return np.array([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+    
+    @staticmethod
+    def boxes_in_frustum(planes, mins, maxs):
+        """向量化包围盒-视锥测试：取每个平面法线方向上的最远角点（p-vertex）判断是否完全在外侧"""
+        normals = planes[:, :3]
+        positive = normals > 0  # (6, 3)
+        p_vertex = np.where(positive[None, :, :], maxs[:, None, :], mins[:, None, :])  # (N, 6, 3)
+        distances = np.einsum('npk,pk->np', p_vertex, normals) + planes[:, 3]
+        return np.all(distances >= 0.0, axis=1)
+    
+    def query_frustum(self, perspective_matrix):
+        """返回与视锥相交的已测量对象名称列表"""
+        self.sync()
+        if not self.boxes:
+            return []
+        planes = self.frustum_planes(perspective_matrix)
+        
+        candidates = set(self.large_objects)
+        if self.cells:
+            keys = list(self.cells.keys())
+            cell_mins = np.array(keys, dtype=np.float64) * self.cell_size
+            visible_cells = self.boxes_in_frustum(planes, cell_mins, cell_mins + self.cell_size)
+            for key, visible in zip(keys, visible_cells):
+                if visible:
+                    candidates.update(self.cells[key])
+        if not candidates:
+            return []
+        
+        names = list(candidates)
+        mins = np.array([self.boxes[name][0] for name in names])
+        maxs = np.array([self.boxes[name][1] for name in names])
+        visible = self.boxes_in_frustum(planes, mins, maxs)
+        return [name for name, flag in zip(names, visible) if flag]
+    
+    def box_center(self, name):
+        box = self.boxes.get(name)
+        return None if box is None else (box[0] + box[1]) * 0.5
+    
+    def clear(self):
+        self.items.clear()
+        self.boxes.clear()
+        self.cells.clear()
+        self.object_cells.clear()
+        self.large_objects.clear()
+        self.dirty.clear()
+        self.stale = True
+
+measured_object_index = MeasuredObjectIndex()
+
+# ==================== 测量结果缓存 ====================
+# 缓存分两级，共用一个 LRU：
+# - ('geometry', 指纹)：网格局部空间数组，同一网格数据块的多个关联复制体共享
+# - ('result', 指纹, 矩阵键, 拆分键)：最终世界空间面积/体积结果，仅变换不变时直接复用
+# 指纹只读取网格数量与少量采样顶点，代价与网格大小基本无关
+
+class MeasurementCache:
+    """测量结果 LRU 缓存，按条目数与内存占用双重上限淘汰"""
+    
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self.total_bytes = 0
+        self.evictions = 0
+        self.counters = {'result': [0, 0], 'geometry': [0, 0]}  # kind -> [hits, misses]
+    
+    def configure(self, max_entries=None, max_bytes=None):
+        """更新缓存上限，并立即按新上限淘汰"""
+        if max_entries is not None:
+            self.max_entries = max(1, int(max_entries))
+        if max_bytes is not None:
+            self.max_bytes = max(0, int(max_bytes))
+        self._evict()
+    
+    def get(self, key):
+        """查询缓存，命中时移到最近使用端；按 key[0] 分类统计命中/未命中"""
+        counter = self.counters.setdefault(key[0], [0, 0])
+        entry = self._entries.get(key)
+        if entry is None:
+            counter[1] += 1
+            return None
+        self._entries.move_to_end(key)
+        counter[0] += 1
+        return entry[0]
+    
+    def put(self, key, value, nbytes=0):
+        """写入缓存；单个条目超过内存上限时不缓存"""
+        if nbytes > self.max_bytes:
+            return False
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+        return True
+    
+    def invalidate_geometry(self, mesh_uid):
+        """移除某个网格数据块的全部缓存条目（指纹首项为网格 session_uid）"""
+        stale = [key for key in self._entries if key[1][0] == mesh_uid]
+        for key in stale:
+            self.total_bytes -= self._entries.pop(key)[1]
+        return len(stale)
+    
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
+    
+    def clear(self):
+        """清空缓存条目（保留统计计数）"""
+        self._entries.clear()
+        self.total_bytes = 0
+    
+    def reset_stats(self):
+        """重置命中统计"""
+        self.evictions = 0
+        for counter in self.counters.values():
+            counter[0] = counter[1] = 0
+    
+    def get_stats(self):
+        """获取缓存状态信息"""
+        return {
+            'entries': len(self._entries),
+            'total_bytes': self.total_bytes,
+            'evictions': self.evictions,
+            'result_hits': self.counters['result'][0],
+            'result_misses': self.counters['result'][1],
+            'geometry_hits': self.counters['geometry'][0],
+            'geometry_misses': self.counters['geometry'][1],
+        }
+
+measurement_cache = MeasurementCache()
+
+def mesh_fingerprint(mesh, samples=64, key=None):
+    """
+    计算网格数据块的廉价指纹：(session_uid, 顶点数, 面数, 循环数, 采样坐标校验和)
+    只按固定步长采样约 samples 个顶点，不遍历整个网格
+    key 用于替换首项（评估网格是临时数据块，改用对象键标识）
+    """
+    vertex_count = len(mesh.vertices)
+    checksum = 0.0
+    if vertex_count:
+        step = max(1, vertex_count // samples)
+        vertices = mesh.vertices
+        for i in range(0, vertex_count, step):
+            co = vertices[i].co
+            checksum += (i + 1) * (co.x + 3.0 * co.y + 7.0 * co.z)
+    mesh_uid = key if key is not None else (getattr(mesh, 'session_uid', None) or mesh.name_full)
+    return (mesh_uid, vertex_count, len(mesh.polygons), len(mesh.loops), round(checksum, 6))
+
+def evaluated_geometry_key(obj):
+    """评估网格指纹的首项：按对象区分（修改器结果属于对象而非网格数据块）"""
+    return ('evaluated', MeasurementRegistry.object_key(obj))
+
+def use_evaluated_geometry(obj, force=False):
+    """是否测量该对象的 depsgraph 评估网格（开启评估模式或 force 为真，且对象有修改器或形态键时）"""
+    settings = getattr(bpy.context.scene, "object_measure_settings", None)
+    if not force and (settings is None or not settings.use_evaluated_mesh):
+        return False
+    return len(obj.modifiers) > 0 or obj.data.shape_keys is not None
+
+def evaluated_fingerprint(obj):
+    """
+    评估网格的廉价指纹（不调用 to_mesh）：对象键 + 面积跟踪器记录的评估几何版本号 + 原始网格采样指纹，
+    几何可能随动画变化的对象再加上当前帧；跟踪器未运行（版本号不可信）时返回 None
+    """
+    generation = area_dirty_tracker.evaluated_generation(obj)
+    if generation is None:
+        return None
+    frame = bpy.context.scene.frame_current if animation_state(obj)[1] else None
+    return (evaluated_geometry_key(obj), generation, frame) + mesh_fingerprint(obj.data)[1:]
+
+@contextmanager
+def measured_mesh(obj, force_evaluated=False, fingerprint=None):
+    """
+    产出 (网格, 指纹)：评估模式下为 evaluated_get(...).to_mesh() 得到的评估网格
+    （阵列/镜像/实体化/几何节点结果），离开时释放临时网格；否则为 obj.data
+    force_evaluated 为真时不受设置影响，始终使用评估网格（间隙检测按实际外形计算）
+    评估网格只应在缓存未命中时生成：先用 measured_fingerprint 查缓存，未命中再进入并传入已算好的 fingerprint
+    """
+    if not use_evaluated_geometry(obj, force_evaluated):
+        yield obj.data, fingerprint or mesh_fingerprint(obj.data)
+        return
+    fingerprint = fingerprint or evaluated_fingerprint(obj)
+    obj_eval = obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    mesh = obj_eval.to_mesh()
+    try:
+        yield mesh, fingerprint or mesh_fingerprint(mesh, key=evaluated_geometry_key(obj))
+    finally:
+        obj_eval.to_mesh_clear()
+
+def measured_fingerprint(obj, force_evaluated=False):
+    """对象当前被测量几何的指纹（评估模式下对应修改器栈输出，跟踪器运行时不生成评估网格）"""
+    if use_evaluated_geometry(obj, force_evaluated):
+        fingerprint = evaluated_fingerprint(obj)
+        if fingerprint is not None:
+            return fingerprint
+    with measured_mesh(obj, force_evaluated) as (_, fingerprint):
+        return fingerprint
+
+def measured_geometry(obj, force_evaluated=False):
+    """对象被测量几何的局部空间数组 (geometry, fingerprint)，缓存命中时不生成评估网格"""
+    fingerprint = measured_fingerprint(obj, force_evaluated)
+    geometry = measurement_cache.get(('geometry', fingerprint))
+    if geometry is None:
+        with measured_mesh(obj, force_evaluated, fingerprint) as (mesh, fingerprint):
+            geometry = get_mesh_geometry(mesh, fingerprint)
+    return geometry, fingerprint
+
+def matrix_key(matrix, ndigits=6):
+    """把 4x4 矩阵转为可哈希的缓存键"""
+    return tuple(round(value, ndigits) for row in matrix for value in row)
+
+# 逐面面积直方图：以 10 为底的对数分箱，范围与分箱数固定（每个对象占用常数内存）
+# 第 0 箱收集小于 10^FACE_AREA_HIST_MIN_EXP（含零面积）的面，最后一箱收集大于 10^FACE_AREA_HIST_MAX_EXP 的面
+FACE_AREA_HIST_MIN_EXP = -12
+FACE_AREA_HIST_MAX_EXP = 6
+FACE_AREA_HIST_BINS_PER_DECADE = 2
+FACE_AREA_HIST_BINS = (FACE_AREA_HIST_MAX_EXP - FACE_AREA_HIST_MIN_EXP) * FACE_AREA_HIST_BINS_PER_DECADE + 2
+DEGENERATE_FACE_AREA_EXP = -10  # 面积小于 1e-10 m² 视为退化面（与分箱边界对齐）
+SLIVER_FACE_AREA_RATIO = 1e-3  # 面积小于中位数该倍数的面视为狭长/碎面
+FACE_AREA_QUANTILES = (('p05', 0.05), ('p50', 0.5), ('p95', 0.95))
+
+class FaceAreaStats:
+    """逐面面积的流式统计（常数内存，替代逐面面积列表）
+    
+    - 数量、补偿求和（Neumaier）、最小/最大值、均值/方差（Chan 合并）
+    - 固定分箱的对数直方图，近似分位数与退化/狭长面计数均由直方图得到
+    - update(array) 为 NumPy 向量化分块更新，add(value) 为纯 Python 逐值更新（bmesh 回退路径）
+    """
+    
+    __slots__ = ('count', 'total', 'compensation', 'min', 'max', 'mean', 'm2', 'histogram')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.histogram = [0] * FACE_AREA_HIST_BINS
+    
+    @staticmethod
+    def bin_index(value):
+        """面积所在的直方图分箱"""
+        if value <= 0.0:
+            return 0
+        index = int(math.floor((math.log10(value) - FACE_AREA_HIST_MIN_EXP) * FACE_AREA_HIST_BINS_PER_DECADE)) + 1
+        return min(max(index, 0), FACE_AREA_HIST_BINS - 1)
+    
+    @staticmethod
+    def bin_upper_edge(index):
+        """分箱上边界（最后一箱为无穷大）"""
+        if index >= FACE_AREA_HIST_BINS - 1:
+            return float('inf')
+        return 10.0 ** (FACE_AREA_HIST_MIN_EXP + index / FACE_AREA_HIST_BINS_PER_DECADE)
+    
+    def _add_sum(self, value):
+        """Neumaier 补偿求和"""
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+    
+    def add(self, value):
+        """逐值更新（Welford）"""
+        self.count += 1
+        self._add_sum(value)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.histogram[self.bin_index(value)] += 1
+    
+    def update(self, values):
+        """向量化分块更新：块内统计一次算出，再与累计值按 Chan 公式合并"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = values.size
+        if n == 0:
+            return
+        chunk_sum = float(values.sum())  # NumPy 成对求和，块间再做补偿求和
+        chunk_mean = chunk_sum / n
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+        
+        total_count = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total_count
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total_count
+        self.count = total_count
+        self._add_sum(chunk_sum)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        
+        with np.errstate(divide='ignore'):
+            exponents = np.log10(values)
+        indices = np.floor((exponents - FACE_AREA_HIST_MIN_EXP) * FACE_AREA_HIST_BINS_PER_DECADE) + 1
+        indices = np.nan_to_num(indices, nan=0.0, neginf=0.0, posinf=FACE_AREA_HIST_BINS - 1)
+        indices = np.clip(indices, 0, FACE_AREA_HIST_BINS - 1).astype(np.int64)
+        counts = np.bincount(indices, minlength=FACE_AREA_HIST_BINS)
+        self.histogram = [a + int(b) for a, b in zip(self.histogram, counts)]
+    
+    def quantile(self, q):
+        """由直方图估算分位数（分箱内按对数线性插值，并夹在最小/最大值之间）"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.histogram):
+            if count and cumulative + count >= target:
+                if index == 0:
+                    lower_exp = upper_exp = None
+                else:
+                    lower_exp = FACE_AREA_HIST_MIN_EXP + (index - 1) / FACE_AREA_HIST_BINS_PER_DECADE
+                    upper_exp = lower_exp + 1.0 / FACE_AREA_HIST_BINS_PER_DECADE
+                if lower_exp is None or index == FACE_AREA_HIST_BINS - 1:
+                    value = self.min if index == 0 else self.max
+                else:
+                    fraction = (target - cumulative) / count
+                    value = 10.0 ** (lower_exp + fraction * (upper_exp - lower_exp))
+                return min(max(value, self.min), self.max)
+            cumulative += count
+        return self.max
+    
+    def count_below(self, threshold):
+        """直方图中上边界不超过阈值的分箱计数之和（保守估计，不额外遍历面）"""
+        total = 0
+        for index, count in enumerate(self.histogram):
+            if self.bin_upper_edge(index) > threshold:
+                break
+            total += count
+        return total
+    
+    def to_values(self):
+        """编码为定长浮点序列（持久化用）：数量、和、最小、最大、均值、M2、直方图"""
+        return (float(self.count), self.total + self.compensation, self.min, self.max, self.mean, self.m2) + tuple(float(c) for c in self.histogram)
+    
+    @classmethod
+    def from_values(cls, values):
+        """由 to_values 的结果还原"""
+        stats = cls()
+        stats.count = int(values[0])
+        stats.total, stats.min, stats.max, stats.mean, stats.m2 = (float(v) for v in values[1:6])
+        stats.histogram = [int(c) for c in values[6:6 + FACE_AREA_HIST_BINS]]
+        return stats
+    
+    def as_dict(self):
+        """汇总为面积结果中的统计字典"""
+        empty = self.count == 0
+        variance = self.m2 / self.count if self.count else 0.0
+        degenerate_count = self.count_below(10.0 ** DEGENERATE_FACE_AREA_EXP)
+        median = self.quantile(0.5)
+        sliver_count = max(self.count_below(median * SLIVER_FACE_AREA_RATIO) - degenerate_count, 0) if not empty else 0
+        return {
+            'count': self.count,
+            'sum': self.total + self.compensation,
+            'min': 0.0 if empty else self.min,
+            'max': 0.0 if empty else self.max,
+            'mean': self.mean,
+            'variance': variance,
+            'std': math.sqrt(variance),
+            'quantiles': {name: self.quantile(q) for name, q in FACE_AREA_QUANTILES},
+            'histogram': list(self.histogram),
+            'degenerate_count': degenerate_count,
+            'sliver_count': sliver_count
+        }
+
+FACE_AREA_STATS_STRIDE = 6 + FACE_AREA_HIST_BINS
+
+def _area_info_nbytes(area_info):
+    """估算面积结果条目占用内存（面积统计为定长，条目大小与面数无关）"""
+    groups = (area_info.get('area_breakdown') or {}).get('groups', ())
+    return 1024 + 32 * FACE_AREA_HIST_BINS + 96 * len(groups)
+
+def calculate_surface_area_3d_print_style(obj):
+    """
+    参照3D print box方法计算表面积与体积
+    优先使用 NumPy 向量化内核，失败或缺少 numpy 时回退到 bmesh 逐面计算
+    结果按 (网格指纹, 变换矩阵) 缓存，关联复制体共享局部空间数组
+    开启评估模式时测量修改器/几何节点的输出网格，按评估网格指纹缓存
+    
+    Args:
+        obj: Blender对象
+        
+    Returns:
+        dict: 包含表面积信息的字典
+    """
+    if obj.type != 'MESH':
+        return None
+    
+    # 评估模式下指纹对应修改器栈输出，栈输出不变时直接命中缓存
+    breakdown_key = area_breakdown_key()
+    fingerprint = measured_fingerprint(obj)
+    result_key = ('result', fingerprint, matrix_key(obj.matrix_world), breakdown_key)
+    cached = measurement_cache.get(result_key)
+    if cached is not None:
+        return dict(cached)
+    
+    with measured_mesh(obj, fingerprint=fingerprint) as (mesh, fingerprint):
+        area_info = None
+        if np is not None:
+            try:
+                geometry = get_mesh_geometry(mesh, fingerprint)
+                breakdown = area_breakdown_input(mesh, fingerprint, geometry, breakdown_key)
+                area_info = area_info_from_arrays(geometry, obj.matrix_world, breakdown)
+            except Exception as e:
+                print(f"[objectmeasure] 向量化面积计算失败，回退到bmesh: {obj.name} - {e}")
+        
+        if area_info is None:
+            area_info = _calculate_surface_area_bmesh(obj, mesh, breakdown_key)
+    
+    if area_info:
+        measurement_cache.put(result_key, area_info, _area_info_nbytes(area_info))
+        area_info = dict(area_info)
+    return area_info
+
+def read_mesh_arrays(mesh):
+    """
+    通过 foreach_get 一次性读取网格局部空间数组
+    
+    Returns:
+        dict: co(float32, N×3)、tri_verts(int32, T×3)、tri_polys/tri_material(int32, T)、
+              loop_vertex(int32, L)、poly_loop_start/poly_loop_total(int32, F)、edge_verts(int32, E×2) 及元素数量
+    """
+    mesh.calc_loop_triangles()
+    
+    vertex_count = len(mesh.vertices)
+    tri_count = len(mesh.loop_triangles)
+    
+    co = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    
+    tri_verts = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+    tri_polys = np.empty(tri_count, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("polygon_index", tri_polys)
+    tri_material = np.empty(tri_count, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", tri_material)
+    
+    # 面-角点拓扑（拓扑分析用）：每个角点的顶点索引与每个面的角点区间
+    loop_vertex = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertex)
+    poly_loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", poly_loop_start)
+    poly_loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", poly_loop_total)
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    
+    return {
+        'co': co.reshape(-1, 3),
+        'tri_verts': tri_verts.reshape(-1, 3),
+        'tri_polys': tri_polys,
+        'tri_material': tri_material,
+        'loop_vertex': loop_vertex,
+        'poly_loop_start': poly_loop_start,
+        'poly_loop_total': poly_loop_total,
+        'edge_verts': edge_verts.reshape(-1, 2),
+        'vertex_count': vertex_count,
+        'face_count': len(mesh.polygons),
+        'edge_count': len(mesh.edges),
+    }
+
+def _mesh_arrays_nbytes(geometry):
+    return sum(geometry[key].nbytes for key in (
+        'co', 'tri_verts', 'tri_polys', 'tri_material', 'loop_vertex', 'poly_loop_start', 'poly_loop_total', 'edge_verts'))
+
+def area_info_from_arrays(geometry, matrix, breakdown=None):
+    """
+    向量化表面积/体积内核（NumPy）
+    1. 以一次矩阵乘法把局部坐标转换到世界坐标
+    2. 用数组叉积/点积归约得到三角形面积与有符号体积
+    3. 按 polygon_index 把三角形面积累加回原始面，保持与 bmesh 方法一致的逐面统计
+    
+    Args:
+        geometry: read_mesh_arrays 返回的数组字典
+        matrix: 4x4 世界变换矩阵
+        breakdown: (拆分键, 逐三角形分组编号)，见 area_breakdown_input；为 None 时不拆分
+        
+    Returns:
+        dict: 与 _calculate_surface_area_bmesh 结构一致的表面积信息字典
+    """
+    face_count = geometry['face_count']
+    tri_verts = geometry['tri_verts']
+    tri_polys = geometry['tri_polys']
+    
+    # float64 累加以保证大网格精度
+    matrix = np.array(matrix, dtype=np.float64)
+    co = geometry['co'].astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    
+    v0 = co[tri_verts[:, 0]]
+    v1 = co[tri_verts[:, 1]]
+    v2 = co[tri_verts[:, 2]]
+    
+    # 三角形面积 = |(v1-v0) × (v2-v0)| / 2
+    cross = np.cross(v1 - v0, v2 - v0)
+    tri_areas = 0.5 * np.sqrt(np.einsum('ij,ij->i', cross, cross))
+    
+    # 有符号体积 = Σ v0·(v1×v2) / 6（与 bm.calc_volume 同一公式）
+    # 拆分时保留逐三角形体积，与面积一起按分组编号各做一次 bincount
+    area_breakdown = None
+    if breakdown is None:
+        signed_volume = float(np.einsum('ij,ij->', v0, np.cross(v1, v2))) / 6.0
+    else:
+        tri_volumes = np.einsum('ij,ij->i', v0, np.cross(v1, v2)) / 6.0
+        signed_volume = float(tri_volumes.sum())
+        area_breakdown = group_area_breakdown(breakdown[0], breakdown[1], tri_areas, tri_volumes)
+    volume = abs(signed_volume)
+    
+    # 三角形面积按原始面累加，得到与 bmesh face.calc_area 对应的逐面面积
+    # 逐面面积只作为临时数组参与一次流式统计，结果中不再保留逐面列表
+    face_areas = np.bincount(tri_polys, weights=tri_areas, minlength=face_count)
+    stats = FaceAreaStats()
+    stats.update(face_areas)
+    face_area_stats = stats.as_dict()
+    total_area = float(tri_areas.sum())
+    min_face_area = face_area_stats['min']
+    max_face_area = face_area_stats['max']
+    avg_face_area = face_area_stats['mean']
+    
+    area_volume_ratio = total_area / volume if volume > 0 else 0
+    
+    area_info = {
+        'total_area': total_area,
+        'face_count': face_count,
+        'vertex_count': geometry['vertex_count'],
+        'edge_count': geometry['edge_count'],
+        'min_face_area': min_face_area,
+        'max_face_area': max_face_area,
+        'avg_face_area': avg_face_area,
+        'volume': volume,
+        'area_volume_ratio': area_volume_ratio,
+        'face_area_stats': face_area_stats,
+        'calculation_method': 'NUMPY_LOOP_TRIANGLES'
+    }
+    if area_breakdown is not None:
+        area_info['area_breakdown'] = area_breakdown
+    return area_info
+
+# 面积拆分：按材质槽或整数面属性（旧版为面贴图）分组汇总面积与体积
+# 分组编号逐三角形给出，与三角形面积/体积各做一次 bincount，相对普通面积内核只多几次线性归约
+AREA_BREAKDOWN_MODES = ('NONE', 'MATERIAL', 'ATTRIBUTE')
+AREA_BREAKDOWN_DENSE_LIMIT = 1 << 20  # 分组编号跨度不超过该值（或三角形数的 4 倍）时直接 bincount，否则先 unique 压缩
+
+def area_breakdown_key():
+    """当前设置下的拆分键：None、('MATERIAL',) 或 ('ATTRIBUTE', 属性名)；参与结果缓存键"""
+    settings = getattr(bpy.context.scene, "object_measure_settings", None)
+    if settings is None or settings.area_breakdown == 'NONE':
+        return None
+    if settings.area_breakdown == 'MATERIAL':
+        return ('MATERIAL',)
+    return ('ATTRIBUTE', settings.breakdown_attribute)
+
+def read_face_groups(mesh, attribute_name):
+    """
+    读取整数面属性的逐面取值；属性名为空时读取旧版面贴图（Blender 4.0 之前，未指定的面为 -1）
+    
+    Returns:
+        numpy.ndarray(int32, F) 或 None（属性不存在或不在面域上）
+    """
+    values = np.empty(len(mesh.polygons), dtype=np.int32)
+    if attribute_name:
+        attribute = mesh.attributes.get(attribute_name)
+        if attribute is None or attribute.domain != 'FACE':
+            return None
+        if attribute.data_type == 'BOOLEAN':
+            flags = np.empty(len(mesh.polygons), dtype=bool)
+            attribute.data.foreach_get("value", flags)
+            return flags.astype(np.int32)
+        if attribute.data_type not in ('INT', 'INT8'):
+            return None
+        attribute.data.foreach_get("value", values)
+        return values
+    face_maps = getattr(mesh, 'face_maps', None)
+    layer = face_maps.active if face_maps else None
+    if layer is None:
+        return None
+    layer.data.foreach_get("value", values)
+    return values
+
+def area_breakdown_input(mesh, fingerprint, geometry, key):
+    """
+    拆分键对应的逐三角形分组编号（材质直接取 tri_material，面属性按 tri_polys 展开并按指纹缓存）
+    
+    Returns:
+        (拆分键, numpy.ndarray(int32, T)) 或 None
+    """
+    if key is None:
+        return None
+    if key[0] == 'MATERIAL':
+        return key, geometry['tri_material']
+    groups_key = ('face_groups', fingerprint, key[1])
+    face_groups = measurement_cache.get(groups_key)
+    if face_groups is None:
+        face_groups = read_face_groups(mesh, key[1])
+        if face_groups is None:
+            return None
+        measurement_cache.put(groups_key, face_groups, face_groups.nbytes)
+    return key, face_groups[geometry['tri_polys']]
+
+def group_area_breakdown(key, tri_groups, tri_areas, tri_volumes):
+    """
+    按分组编号归约三角形面积与有符号体积
+    
+    组体积为该组三角形的有符号体积之和，只有组自身构成封闭壳体时才是实体体积；各组之和等于总体积
+    
+    Returns:
+        dict: mode、attribute、groups [(编号, 面积, 体积, 三角形数)]（按面积降序）
+    """
+    groups = []
+    if len(tri_groups):
+        low = int(tri_groups.min())
+        span = int(tri_groups.max()) - low + 1
+        if span <= max(AREA_BREAKDOWN_DENSE_LIMIT, 4 * len(tri_groups)):
+            ids = tri_groups - low if low else tri_groups
+            counts = np.bincount(ids, minlength=span)
+            present = np.flatnonzero(counts)
+            group_ids = present + low
+        else:
+            group_ids, ids = np.unique(tri_groups, return_inverse=True)
+            counts = np.bincount(ids)
+            present = np.arange(len(group_ids))
+            span = len(group_ids)
+        areas = np.bincount(ids, weights=tri_areas, minlength=span)[present]
+        volumes = np.bincount(ids, weights=tri_volumes, minlength=span)[present]
+        groups = [
+            (int(group_id), float(area), float(volume), int(count))
+            for group_id, area, volume, count in zip(group_ids, areas, volumes, counts[present])
+        ]
+        groups.sort(key=lambda group: -group[1])
+    return {'mode': key[0], 'attribute': key[1] if len(key) > 1 else '', 'groups': groups}
+
+def area_breakdown_label(obj, area_breakdown, group_id):
+    """分组显示名：材质模式为材质名（空槽/越界显示槽号），属性模式为 属性名=编号"""
+    if area_breakdown['mode'] == 'MATERIAL':
+        slots = obj.material_slots if obj is not None else ()
+        if 0 <= group_id < len(slots) and slots[group_id].material is not None:
+            return slots[group_id].material.name
+        return f"槽{group_id}"
+    return f"{area_breakdown['attribute'] or 'face_map'}={group_id}"
+
+def get_mesh_geometry(mesh, fingerprint=None):
+    """获取网格局部空间数组（按网格指纹缓存）"""
+    if fingerprint is None:
+        fingerprint = mesh_fingerprint(mesh)
+    
+    geometry_key = ('geometry', fingerprint)
+    geometry = measurement_cache.get(geometry_key)
+    if geometry is None:
+        geometry = read_mesh_arrays(mesh)
+        measurement_cache.put(geometry_key, geometry, _mesh_arrays_nbytes(geometry))
+    return geometry
+
+def _calculate_surface_area_bmesh(obj, mesh=None, breakdown_key=None):
+    """
+    参照3D print box方法计算表面积（bmesh回退路径）
+    使用bmesh进行更精确的计算，考虑对象变换
+    
+    Args:
+        obj: Blender对象
+        breakdown_key: 拆分键（见 area_breakdown_key），为 None 时不拆分
         
     Returns:
         dict: 包含表面积信息的字典
@@ -809,29 +3173,40 @@ def calculate_surface_area_3d_print_style(obj):
     
     try:
         # 从网格数据创建bmesh
-        bm.from_mesh(obj.data)
+        bm.from_mesh(mesh if mesh is not None else obj.data)
         
         # 应用对象的变换矩阵到bmesh
         bm.transform(obj.matrix_world)
         
-        # 计算表面积
-        total_area = 0.0
-        face_areas = []
-        
-        # 遍历所有面
+        # 遍历所有面，逐面面积直接进入流式统计（补偿求和得到总面积）
+        stats = FaceAreaStats()
+        group_layer = None
+        if breakdown_key is not None and breakdown_key[0] == 'ATTRIBUTE':
+            if breakdown_key[1]:
+                group_layer = bm.faces.layers.int.get(breakdown_key[1])
+            elif hasattr(bm.faces.layers, 'face_map'):
+                group_layer = bm.faces.layers.face_map.active
+        groups = {} if breakdown_key is not None and (breakdown_key[0] == 'MATERIAL' or group_layer is not None) else None
         for face in bm.faces:
-            # 计算面的面积
             face_area = face.calc_area()
-            total_area += face_area
-            face_areas.append(face_area)
+            stats.add(face_area)
+            if groups is not None:
+                group_id = face.material_index if group_layer is None else face[group_layer]
+                verts = face.verts
+                face_volume = sum(
+                    verts[0].co.dot(verts[i].co.cross(verts[i + 1].co)) for i in range(1, len(verts) - 1)
+                ) / 6.0
+                group = groups.setdefault(group_id, [0.0, 0.0, 0])
+                group[0] += face_area
+                group[1] += face_volume
+                group[2] += len(verts) - 2
         
         # 计算统计信息
-        if face_areas:
-            min_face_area = min(face_areas)
-            max_face_area = max(face_areas)
-            avg_face_area = sum(face_areas) / len(face_areas)
-        else:
-            min_face_area = max_face_area = avg_face_area = 0.0
+        face_area_stats = stats.as_dict()
+        total_area = face_area_stats['sum']
+        min_face_area = face_area_stats['min']
+        max_face_area = face_area_stats['max']
+        avg_face_area = face_area_stats['mean']
         
         # 计算网格复杂度指标
         vertex_count = len(bm.verts)
@@ -842,7 +3217,7 @@ def calculate_surface_area_3d_print_style(obj):
         volume = calculate_mesh_volume(bm)
         area_volume_ratio = total_area / volume if volume > 0 else 0
         
-        return {
+        area_info = {
             'total_area': total_area,
             'face_count': face_count,
             'vertex_count': vertex_count,
@@ -852,76 +3227,981 @@ def calculate_surface_area_3d_print_style(obj):
             'avg_face_area': avg_face_area,
             'volume': volume,
             'area_volume_ratio': area_volume_ratio,
-            'face_areas': face_areas,
+            'face_area_stats': face_area_stats,
             'calculation_method': 'BMESH_3D_PRINT_STYLE'
         }
+        if groups is not None:
+            area_info['area_breakdown'] = {
+                'mode': breakdown_key[0],
+                'attribute': breakdown_key[1] if len(breakdown_key) > 1 else '',
+                'groups': sorted(
+                    ((group_id, area, volume, count) for group_id, (area, volume, count) in groups.items()),
+                    key=lambda group: -group[1]
+                ),
+            }
+        return area_info
         
     finally:
         # 清理bmesh
         bm.free()
 
-def calculate_mesh_volume(bm):
+def calculate_mesh_volume(bm):
+    """
+    计算网格体积（使用bmesh）
+    
+    Args:
+        bm: bmesh对象
+        
+    Returns:
+        float: 网格体积
+    """
+    try:
+        # 使用bmesh计算体积
+        volume = bm.calc_volume()
+        return abs(volume)  # 确保体积为正数
+    except:
+        # 如果bmesh计算失败，返回0
+        return 0.0
+
+# ==================== 凸包与拓扑分析 ====================
+
+HULL_BLOCK_ELEMENTS = 1 << 22  # 点-平面距离分块计算时每块的元素数（顶点数×凸包面数）
+HULL_TOLERANCE = 1e-5  # 相对包围盒对角线的容差：距凸包不超过该距离的点视为在凸包上
+HULL_MAX_ITERATIONS = 64
+
+def _hull_planes(hull_points, hull_tris):
+    """凸包各三角形的外法向平面 (normals, offsets)，点 x 在平面内侧时 n·x <= offset"""
+    a, b, c = (hull_points[hull_tris[:, i]] for i in range(3))
+    normals = np.cross(b - a, c - a)
+    lengths = np.linalg.norm(normals, axis=1)
+    keep = lengths > 1e-12
+    normals = normals[keep] / lengths[keep, None]
+    a = a[keep]
+    center = hull_points.mean(axis=0)
+    flip = np.einsum('ij,ij->i', normals, a - center) < 0
+    normals[flip] = -normals[flip]
+    return normals, np.einsum('ij,ij->i', normals, a)
+
+def quickhull(co):
+    """
+    大网格凸包（quickhull 式迭代）
+    
+    1. 以方向极值点的凸包作为初始凸包
+    2. 分块求剩余候选点到各凸包面的最大有符号距离，容差内的点不可能再落到凸包外，直接剔除
+    3. 每个面取最远的外部点加入，重建凸包，直到没有外部点
+    凸包只增不减，每轮只需检查上一轮的外部点；bmesh 只处理凸包顶点与新增点，百万顶点网格也只需少量轮次
+    
+    Args:
+        co: (N,3) 局部空间顶点坐标
+        
+    Returns:
+        (hull_points(H,3), hull_tris(F,3))
+    """
+    co = np.ascontiguousarray(co, dtype=np.float32)
+    if len(co) <= OBB_HULL_POINT_CAP:
+        return convex_hull_arrays(co.astype(np.float64))
+    
+    tolerance = HULL_TOLERANCE * float(np.linalg.norm(np.ptp(co, axis=0)))
+    hull_points, hull_tris = convex_hull_arrays(co[extreme_point_indices(co)].astype(np.float64))
+    candidates = np.arange(len(co))
+    for _ in range(HULL_MAX_ITERATIONS):
+        if not len(hull_tris):
+            break
+        normals, offsets = _hull_planes(hull_points, hull_tris)
+        normals = normals.astype(np.float32)
+        offsets = offsets.astype(np.float32)
+        chunk = max(1024, HULL_BLOCK_ELEMENTS // max(len(normals), 1))
+        distance = np.empty(len(candidates), dtype=np.float32)
+        nearest_face = np.empty(len(candidates), dtype=np.int64)
+        for start in range(0, len(candidates), chunk):
+            block = co[candidates[start:start + chunk]] @ normals.T - offsets
+            nearest_face[start:start + len(block)] = block.argmax(axis=1)
+            distance[start:start + len(block)] = block[np.arange(len(block)), nearest_face[start:start + len(block)]]
+        
+        outside = distance > tolerance
+        if not outside.any():
+            return hull_points, hull_tris
+        candidates = candidates[outside]
+        distance = distance[outside]
+        nearest_face = nearest_face[outside]
+        
+        # 每个凸包面取距离最远的外部点（按面分组、组内距离降序后取组首）
+        order = np.lexsort((-distance, nearest_face))
+        first = np.concatenate(([True], nearest_face[order][1:] != nearest_face[order][:-1]))
+        farthest = co[candidates[order[first]]].astype(np.float64)
+        hull_points, hull_tris = convex_hull_arrays(np.concatenate((hull_points, farthest)))
+    
+    # 退化或迭代未收敛时直接用剩余候选点求凸包（结果同样精确，只是更慢）
+    return convex_hull_arrays(np.concatenate((hull_points, co[candidates].astype(np.float64))))
+
+def hull_area_volume(hull_points, hull_tris, matrix):
+    """
+    凸包在世界空间的表面积与体积
+    仿射变换下凸包拓扑不变，只变换凸包顶点；体积以内部点为锥顶求和，与三角形朝向无关
+    """
+    if not len(hull_tris):
+        return 0.0, 0.0
+    matrix = np.array(matrix, dtype=np.float64)
+    points = hull_points @ matrix[:3, :3].T + matrix[:3, 3]
+    center = points.mean(axis=0)
+    a, b, c = (points[hull_tris[:, i]] - center for i in range(3))
+    cross = np.cross(b - a, c - a)
+    area = 0.5 * float(np.sqrt(np.einsum('ij,ij->i', cross, cross)).sum())
+    volume = float(np.abs(np.einsum('ij,ij->i', a, np.cross(b, c))).sum()) / 6.0
+    return area, volume
+
+def get_mesh_hull(geometry, fingerprint):
+    """网格局部空间凸包（按网格指纹缓存）"""
+    hull_key = ('hull', fingerprint)
+    hull = measurement_cache.get(hull_key)
+    if hull is None:
+        co = geometry['co']
+        if len(co) < 4:
+            hull = (co.astype(np.float64), np.zeros((0, 3), dtype=np.int64))
+        else:
+            hull = quickhull(co)
+        measurement_cache.put(hull_key, hull, hull[0].nbytes + hull[1].nbytes)
+    return hull
+
+def analyze_mesh_topology(geometry):
+    """
+    由面-角点数组统计边的使用情况（纯 NumPy，可在工作线程运行）
+    每个面的相邻角点构成一条有向边；无向边被 1 个面使用为开放边界，超过 2 个面为非流形，
+    恰被 2 个面同向使用说明两侧法向不一致；不属于任何面的网格边为游离边
+    
+    Returns:
+        dict: boundary_edges、nonmanifold_edges、flipped_edges、loose_edges 及 is_closed、is_manifold、is_watertight
+    """
+    loop_vertex = geometry['loop_vertex'].astype(np.int64)
+    loop_start = geometry['poly_loop_start'].astype(np.int64)
+    loop_total = geometry['poly_loop_total'].astype(np.int64)
+    vertex_count = max(int(geometry['vertex_count']), 1)
+    
+    # 每个角点的下一个角点：面内顺序后移一位，面的最后一个角点回绕到首个角点
+    next_loop = np.arange(1, len(loop_vertex) + 1, dtype=np.int64)
+    if len(loop_start):
+        next_loop[loop_start + loop_total - 1] = loop_start
+    v0 = loop_vertex
+    v1 = loop_vertex[next_loop] if len(loop_vertex) else loop_vertex
+    
+    low = np.minimum(v0, v1)
+    high = np.maximum(v0, v1)
+    undirected = low * vertex_count + high
+    edge_keys, inverse, uses = np.unique(undirected, return_inverse=True, return_counts=True)
+    
+    boundary = int(np.count_nonzero(uses == 1))
+    nonmanifold = int(np.count_nonzero(uses > 2))
+    # 恰被两个面使用的边：两次方向相同（正向计数为 0 或 2）即为翻转
+    forward = np.bincount(inverse, weights=(v0 < v1), minlength=len(edge_keys))
+    flipped = int(np.count_nonzero((uses == 2) & (forward != 1)))
+    
+    loose = 0
+    edge_verts = geometry.get('edge_verts')
+    if edge_verts is not None and len(edge_verts):
+        edges = edge_verts.astype(np.int64)
+        mesh_keys = edges.min(axis=1) * vertex_count + edges.max(axis=1)
+        loose = int(np.count_nonzero(~np.isin(mesh_keys, edge_keys)))
+    
+    is_closed = boundary == 0
+    is_manifold = nonmanifold == 0 and flipped == 0
+    return {
+        'boundary_edges': boundary,
+        'nonmanifold_edges': nonmanifold,
+        'flipped_edges': flipped,
+        'loose_edges': loose,
+        'is_closed': is_closed,
+        'is_manifold': is_manifold,
+        'is_watertight': is_closed and is_manifold and loose == 0,
+    }
+
+def get_mesh_topology(geometry, fingerprint):
+    """网格拓扑分析结果（按网格指纹缓存）"""
+    topology_key = ('topology', fingerprint)
+    topology = measurement_cache.get(topology_key)
+    if topology is None:
+        topology = analyze_mesh_topology(geometry)
+        measurement_cache.put(topology_key, topology, 512)
+    return topology
+
+def use_hull_analysis():
+    settings = getattr(bpy.context.scene, "object_measure_settings", None)
+    return np is not None and settings is not None and settings.use_hull_analysis
+
+def analyze_hull_and_topology(obj):
+    """
+    凸包与水密性分析阶段
+    凸包与拓扑按网格指纹缓存（与面积共享同一份局部空间数组），世界空间面积/体积随变换即时求出
+    
+    Returns:
+        dict: hull_area、hull_volume 与 analyze_mesh_topology 的各项计数；失败时返回 None
+    """
+    if obj.type != 'MESH' or np is None:
+        return None
+    try:
+        geometry, fingerprint = measured_geometry(obj)
+        hull_points, hull_tris = get_mesh_hull(geometry, fingerprint)
+        hull_area, hull_volume = hull_area_volume(hull_points, hull_tris, obj.matrix_world)
+        hull_info = dict(get_mesh_topology(geometry, fingerprint))
+    except Exception as e:
+        print(f"[objectmeasure] 凸包/拓扑分析失败: {obj.name} - {e}")
+        return None
+    hull_info['hull_area'] = hull_area
+    hull_info['hull_volume'] = hull_volume
+    return hull_info
+
+# ==================== 后台测量任务 ====================
+
+MEASURE_JOB_TICK_SECONDS = 0.05  # 模态计时器间隔
+MEASURE_JOB_TICK_BUDGET = 0.03  # 每次计时器事件在主线程上花费的时间预算（秒）
+
+def measure_snapshot(snapshot):
+    """
+    工作线程：对主线程读取的网格数组快照运行面积内核与拓扑分析
+    只做 NumPy 运算，不调用 bpy/bmesh/mathutils，也不访问测量缓存；失败时错误信息交回主线程输出
+    （凸包与定向包围盒依赖 bmesh 与 mathutils.geometry，留在主线程按时间预算计算）
+    
+    Args:
+        snapshot: MeasurementJob._snapshot 生成的字典
+        
+    Returns:
+        dict: 按需包含 area_info、topology 与 errors
+    """
+    geometry = snapshot['geometry']
+    result = {'errors': []}
+    if snapshot['area']:
+        try:
+            result['area_info'] = area_info_from_arrays(geometry, snapshot['matrix'], snapshot['breakdown'])
+        except Exception as e:
+            result['errors'].append(f"后台面积计算失败，改为同步计算 - {e}")
+    if snapshot['topology']:
+        try:
+            result['topology'] = analyze_mesh_topology(geometry)
+        except Exception as e:
+            result['errors'].append(f"后台拓扑分析失败，改为同步计算 - {e}")
+    return result
+
+class MeasurementJob:
+    """后台测量任务
+    
+    - 主线程：按时间预算逐个读取网格数组快照（foreach_get，按指纹复用缓存），提交到线程池
+    - 工作线程：只对快照数组运行面积内核与拓扑分析（measure_snapshot，NumPy 运算期间释放 GIL），不访问 bpy
+    - 主线程：按时间预算收集完成的结果写入测量缓存，再计算凸包、定向包围盒与包围盒尺寸并加入注册表
+    - 缺少 numpy 时退回在主线程逐个对象同步测量（仍按时间预算分摊到多次计时器事件）
+    """
+    
+    def __init__(self, objects, max_workers=None):
+        self.pending = deque((obj.name, MeasurementRegistry.object_key(obj)) for obj in objects)
+        self.total = len(self.pending)
+        self.completed = 0
+        self.failed = 0
+        self.added = []  # [{'name': ..., 'dimensions': ...}, ...]
+        self.futures = {}  # future -> (name, uid, snapshot)
+        self.max_in_flight = 1
+        self.executor = None
+        if np is not None:
+            workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="objectmeasure")
+            self.max_in_flight = workers * 2  # 限制同时持有的快照数量，避免大批量时内存峰值
+    
+    @property
+    def finished(self):
+        return not self.pending and not self.futures
+    
+    def _resolve(self, name, uid):
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.type != 'MESH' or MeasurementRegistry.object_key(obj) != uid:
+            return None
+        return obj
+    
+    def _register(self, obj, precomputed=None):
+        """主线程：计算尺寸（面积与拓扑已在缓存中，凸包与定向包围盒在此计算）并加入注册表"""
+        dims = get_mesh_dimensions(obj, precomputed)
+        if dims and measurement_registry.add(obj, dims) is not None:
+            self.added.append({'name': obj.name, 'dimensions': dims})
+        elif not dims:
+            self.failed += 1
+        self.completed += 1
+    
+    def _snapshot(self, obj, fingerprint):
+        """主线程：只读取数组与缓存，生成工作线程的输入；面积与拓扑都已缓存时返回 None"""
+        matrix = obj.matrix_world
+        breakdown_key = area_breakdown_key()
+        result_key = ('result', fingerprint, matrix_key(matrix), breakdown_key)
+        need_area = measurement_cache.get(result_key) is None
+        need_topology = use_hull_analysis() and measurement_cache.get(('topology', fingerprint)) is None
+        if not need_area and not need_topology:
+            return None
+        with measured_mesh(obj, fingerprint=fingerprint) as (mesh, fingerprint):
+            geometry = get_mesh_geometry(mesh, fingerprint)
+            breakdown = area_breakdown_input(mesh, fingerprint, geometry, breakdown_key) if need_area else None
+        return {
+            'fingerprint': fingerprint,
+            'result_key': result_key,
+            'geometry': geometry,
+            'matrix': np.array(matrix, dtype=np.float64),
+            'area': need_area,
+            'breakdown': breakdown,
+            'topology': need_topology,
+        }
+    
+    def _submit(self, obj):
+        """主线程：读取快照并提交计算；结果全部命中缓存或无 numpy 时直接同步完成"""
+        if self.executor is None:
+            self._register(obj)
+            return
+        snapshot = self._snapshot(obj, measured_fingerprint(obj))
+        if snapshot is None:
+            self._register(obj)
+            return
+        future = self.executor.submit(measure_snapshot, snapshot)
+        self.futures[future] = (obj.name, MeasurementRegistry.object_key(obj), snapshot)
+    
+    def _store(self, snapshot, result):
+        """主线程：把工作线程的结果写入测量缓存，返回 get_mesh_dimensions 的预计算输入"""
+        precomputed = {}
+        area_info = result.get('area_info')
+        if area_info is not None:
+            measurement_cache.put(snapshot['result_key'], area_info, _area_info_nbytes(area_info))
+            precomputed['area_info'] = dict(area_info)
+        topology = result.get('topology')
+        if topology is not None:
+            measurement_cache.put(('topology', snapshot['fingerprint']), topology, 512)
+        return precomputed
+    
+    def _collect(self, start, budget):
+        """主线程：处理已完成的计算结果（超出时间预算时余下结果留到下一次计时器事件）"""
+        for future in [future for future in self.futures if future.done()]:
+            if time.perf_counter() - start > budget:
+                break
+            name, uid, snapshot = self.futures.pop(future)
+            obj = self._resolve(name, uid)
+            if obj is None:
+                self.completed += 1
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[objectmeasure] 后台测量失败，改为同步计算: {name} - {e}")
+                precomputed = None
+            else:
+                for error in result['errors']:
+                    print(f"[objectmeasure] {error}: {name}")
+                precomputed = self._store(snapshot, result)
+            self._register(obj, precomputed)
+    
+    def step(self, budget=MEASURE_JOB_TICK_BUDGET):
+        """执行一次计时器事件的工作量，返回本次新加入注册表的对象数"""
+        start = time.perf_counter()
+        added_before = len(self.added)
+        self._collect(start, budget)
+        while self.pending and len(self.futures) < self.max_in_flight:
+            if time.perf_counter() - start > budget:
+                break
+            name, uid = self.pending.popleft()
+            obj = self._resolve(name, uid)
+            if obj is None:
+                self.completed += 1
+            else:
+                try:
+                    self._submit(obj)
+                except Exception as e:
+                    print(f"[objectmeasure] 测量失败: {name} - {e}")
+                    self.failed += 1
+                    self.completed += 1
+        return len(self.added) - added_before
+    
+    def cancel(self):
+        """取消尚未开始的计算；已提交的计算结果直接丢弃"""
+        self.pending.clear()
+        for future in self.futures:
+            future.cancel()
+        self.futures.clear()
+        self.shutdown()
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+# ==================== 动画测量（逐帧时间序列） ====================
+
+ANIMATION_SERIES_FIELDS = ('frame', 'length', 'width', 'height', 'area', 'volume', 'bbox_volume')
+ANIMATION_SERIES_STRIDE = len(ANIMATION_SERIES_FIELDS)
+ANIMATION_TICK_BUDGET = 0.2  # 每次计时器事件推进帧的时间预算（秒，至少推进一帧）
+
+class MeasurementSeries:
+    """单个对象的逐帧测量序列：每帧 ANIMATION_SERIES_STRIDE 个 float64，整体保存在一个 array('d') 中"""
+    
+    __slots__ = ('name', 'values', 'skipped')
+    
+    def __init__(self, name):
+        self.name = name
+        self.values = array.array('d')
+        self.skipped = 0  # 几何与变换均未变化、直接沿用上一帧结果的帧数
+    
+    def __len__(self):
+        return len(self.values) // ANIMATION_SERIES_STRIDE
+    
+    def append(self, row):
+        self.values.extend(row)
+    
+    def row(self, index):
+        return self.values[index * ANIMATION_SERIES_STRIDE:(index + 1) * ANIMATION_SERIES_STRIDE]
+    
+    def summary(self):
+        """各字段的最小/最大值及所在帧：{field: (min, min_frame, max, max_frame)}"""
+        result = {}
+        if not len(self):
+            return result
+        frames = self.values[0::ANIMATION_SERIES_STRIDE]
+        for offset, field in enumerate(ANIMATION_SERIES_FIELDS[1:], 1):
+            column = self.values[offset::ANIMATION_SERIES_STRIDE]
+            low = min(range(len(column)), key=column.__getitem__)
+            high = max(range(len(column)), key=column.__getitem__)
+            result[field] = (column[low], frames[low], column[high], frames[high])
+        return result
+
+animation_series = {}  # object_key -> MeasurementSeries（最近一次动画测量的结果）
+
+def write_animation_report(series_list, report_path):
+    """
+    导出逐帧序列 CSV，并在同目录写出 <文件名>_summary.csv（各字段最小/最大值及所在帧）
+    
+    Returns:
+        str: 汇总文件路径
+    """
+    with open(report_path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(('object',) + ANIMATION_SERIES_FIELDS)
+        for series in series_list:
+            for index in range(len(series)):
+                row = series.row(index)
+                writer.writerow((series.name, int(row[0])) + tuple(row[1:]))
+    
+    base, extension = os.path.splitext(report_path)
+    summary_path = f"{base}_summary{extension or '.csv'}"
+    with open(summary_path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(('object', 'field', 'min', 'min_frame', 'max', 'max_frame', 'frames', 'skipped_frames'))
+        for series in series_list:
+            for field, (low, low_frame, high, high_frame) in series.summary().items():
+                writer.writerow((series.name, field, low, int(low_frame), high, int(high_frame), len(series), series.skipped))
+    return summary_path
+
+class AnimationMeasureJob:
+    """逐帧测量任务
+    
+    每帧 frame_set 后读取各对象评估网格的顶点坐标并做全量哈希：
+    - 坐标与变换均未变化：沿用上一帧结果（只改帧号）
+    - 仅变换变化：复用上一帧的网格数组，只重跑向量化面积内核与闭式包围盒分析
+    - 坐标变化：重新读取网格数组
+    采样指纹（mesh_fingerprint）可能漏掉蒙皮的局部形变，这里改用全部顶点坐标的哈希判断是否变化
+    """
+    
+    def __init__(self, scene, objects, frames):
+        self.scene = scene
+        self.frames = deque(frames)
+        self.total = len(self.frames)
+        self.completed = 0
+        self.original_frame = scene.frame_current
+        self.targets = [(obj.name, MeasurementRegistry.object_key(obj)) for obj in objects]
+        self.series = {uid: MeasurementSeries(name) for name, uid in self.targets}
+        self.states = {}  # uid -> (坐标哈希, 矩阵键, 网格数组, 上一帧结果)
+    
+    @property
+    def finished(self):
+        return not self.frames
+    
+    def step(self, context, budget=ANIMATION_TICK_BUDGET):
+        start = time.perf_counter()
+        while self.frames:
+            frame = self.frames.popleft()
+            self.scene.frame_set(frame)
+            depsgraph = context.evaluated_depsgraph_get()
+            for name, uid in self.targets:
+                obj = bpy.data.objects.get(name)
+                if obj is None or obj.type != 'MESH':
+                    continue
+                row = self._measure(obj.evaluated_get(depsgraph), uid, frame)
+                if row is not None:
+                    self.series[uid].append(row)
+            self.completed += 1
+            if time.perf_counter() - start > budget:
+                break
+    
+    def _measure(self, obj_eval, uid, frame):
+        mesh = obj_eval.to_mesh()
+        try:
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", co)
+            co_hash = hash((len(mesh.polygons), len(mesh.loops), co.tobytes()))
+            matrix = obj_eval.matrix_world.copy()
+            key = matrix_key(matrix)
+            
+            state = self.states.get(uid)
+            if state is not None and state[0] == co_hash and state[1] == key:
+                self.series[uid].skipped += 1
+                return (frame,) + state[3][1:]
+            if state is not None and state[0] == co_hash:
+                geometry = state[2]
+            else:
+                geometry = read_mesh_arrays(mesh)
+        finally:
+            obj_eval.to_mesh_clear()
+        
+        if not geometry['vertex_count']:
+            row = (frame,) + (0.0,) * (ANIMATION_SERIES_STRIDE - 1)
+            self.states[uid] = (co_hash, key, geometry, row)
+            return row
+        area_info = area_info_from_arrays(geometry, matrix)
+        local_corners = oriented_box_corners(geometry['co'].astype(np.float64), np.eye(3))
+        world_corners = [matrix @ Vector(corner) for corner in local_corners]
+        analysis = analyze_bbox_axes(world_corners) or _analyze_bbox_edges_pairwise(world_corners)
+        row = (
+            frame, analysis['length'], analysis['width'], analysis['height'],
+            area_info['total_area'], area_info['volume'],
+            analysis['length'] * analysis['width'] * analysis['height'],
+        )
+        self.states[uid] = (co_hash, key, geometry, row)
+        return row
+    
+    def restore_frame(self):
+        self.scene.frame_set(self.original_frame)
+
+# ==================== 集合汇总测量（实例去重） ====================
+
+AGGREGATE_UNIFORM_TOLERANCE = 1e-6  # 判断线性变换为均匀缩放（含旋转/镜像）的相对容差
+AGGREGATE_NO_MATERIAL = "（无材质）"
+
+class AggregateMesh:
+    """唯一网格的局部空间数据：每个三角形的局部叉积、材质槽索引，以及按槽累加的局部面积与有符号体积
+    
+    实例的世界空间结果由线性部分 M 解析得到：
+    - 体积 = |局部有符号体积 × det(M)|
+    - 均匀缩放（MᵀM = s²I）：面积 = 局部面积 × s²（精确）
+    - 非均匀缩放：三角形叉积满足 (Ma)×(Mb) = cof(M)(a×b)，一次矩阵乘法即得全部世界空间叉积，无需重新变换顶点
+    """
+    
+    __slots__ = ('cross', 'tri_material', 'slot_area', 'signed_volume', 'results')
+    
+    def __init__(self, geometry):
+        co = geometry['co'].astype(np.float64)
+        tri_verts = geometry['tri_verts']
+        v0 = co[tri_verts[:, 0]]
+        v1 = co[tri_verts[:, 1]]
+        v2 = co[tri_verts[:, 2]]
+        self.cross = np.cross(v1 - v0, v2 - v0)
+        self.tri_material = geometry['tri_material']
+        tri_areas = 0.5 * np.sqrt(np.einsum('ij,ij->i', self.cross, self.cross))
+        self.slot_area = np.bincount(self.tri_material, weights=tri_areas)
+        self.signed_volume = float(np.einsum('ij,ij->', v0, np.cross(v1, v2))) / 6.0
+        self.results = {}  # 线性部分键 -> (按槽面积, 体积)，相同缩放/旋转的实例共享
+    
+    def transformed(self, linear):
+        """线性部分为 linear (3×3) 的实例的 (按槽面积, 体积)"""
+        key = tuple(np.round(linear, 6).ravel())
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+        
+        det = float(np.linalg.det(linear))
+        gram = linear.T @ linear
+        scale2 = float(np.trace(gram)) / 3.0
+        if np.abs(gram - scale2 * np.eye(3)).max() <= AGGREGATE_UNIFORM_TOLERANCE * max(scale2, 1e-12):
+            slot_area = self.slot_area * scale2
+        else:
+            c0, c1, c2 = linear.T
+            cofactor = np.stack((np.cross(c1, c2), np.cross(c2, c0), np.cross(c0, c1)), axis=1)
+            world_cross = self.cross @ cofactor.T
+            tri_areas = 0.5 * np.sqrt(np.einsum('ij,ij->i', world_cross, world_cross))
+            slot_area = np.bincount(self.tri_material, weights=tri_areas, minlength=len(self.slot_area))
+        result = (slot_area, abs(self.signed_volume * det))
+        self.results[key] = result
+        return result
+
+collection_aggregate = None  # 最近一次集合汇总结果
+
+def _aggregate_group_collection(obj, hierarchy, default):
+    """对象在目标集合层级中所属的集合名称（用于按集合分组）"""
+    for collection in obj.users_collection:
+        if collection.name in hierarchy:
+            return collection.name
+    return default
+
+def measure_collection_aggregate(collection, depsgraph):
+    """
+    汇总集合（含子集合与集合实例）的世界空间面积与体积
+    
+    遍历 depsgraph.object_instances：每个唯一网格（未修改的网格按网格数据块，有修改器/形态键的按对象）
+    只读取一次局部空间数组，各实例由变换矩阵解析组合（见 AggregateMesh）
+    
+    Returns:
+        dict: total_area、total_volume、instance_count、unique_mesh_count、
+              by_material {材质: 面积}、by_collection {集合: {'area', 'volume', 'count'}}
+    """
+    members = {obj.name for obj in collection.all_objects}
+    hierarchy = {collection.name} | {child.name for child in collection.children_recursive}
+    meshes = {}
+    by_material = {}
+    by_collection = {}
+    total_area = 0.0
+    total_volume = 0.0
+    instance_count = 0
+    
+    for instance in depsgraph.object_instances:
+        obj = instance.object
+        if obj.type != 'MESH':
+            continue
+        owner = instance.parent.original if instance.is_instance and instance.parent is not None else obj.original
+        if owner.name not in members:
+            continue
+        
+        source = obj.original
+        evaluated = len(source.modifiers) > 0 or source.data.shape_keys is not None
+        if evaluated:
+            mesh_key = evaluated_geometry_key(source)
+        else:
+            mesh_key = getattr(source.data, 'session_uid', None) or source.data.name_full
+        aggregate = meshes.get(mesh_key)
+        if aggregate is None:
+            if evaluated:
+                mesh = obj.to_mesh()
+                try:
+                    geometry = read_mesh_arrays(mesh)
+                finally:
+                    obj.to_mesh_clear()
+            else:
+                geometry = get_mesh_geometry(source.data)
+            aggregate = AggregateMesh(geometry)
+            meshes[mesh_key] = aggregate
+        
+        linear = np.array(instance.matrix_world.to_3x3(), dtype=np.float64)
+        slot_area, volume = aggregate.transformed(linear)
+        area = float(slot_area.sum())
+        total_area += area
+        total_volume += volume
+        instance_count += 1
+        
+        slots = obj.material_slots
+        for slot_index, value in enumerate(slot_area):
+            if value <= 0.0:
+                continue
+            material = slots[slot_index].material if slot_index < len(slots) else None
+            name = material.name if material is not None else AGGREGATE_NO_MATERIAL
+            by_material[name] = by_material.get(name, 0.0) + float(value)
+        
+        group = by_collection.setdefault(
+            _aggregate_group_collection(owner, hierarchy, collection.name),
+            {'area': 0.0, 'volume': 0.0, 'count': 0}
+        )
+        group['area'] += area
+        group['volume'] += volume
+        group['count'] += 1
+    
+    return {
+        'collection': collection.name,
+        'total_area': total_area,
+        'total_volume': total_volume,
+        'instance_count': instance_count,
+        'unique_mesh_count': len(meshes),
+        'by_material': dict(sorted(by_material.items(), key=lambda item: -item[1])),
+        'by_collection': dict(sorted(by_collection.items(), key=lambda item: -item[1]['area'])),
+    }
+
+# ==================== 间隙与对象间距离（BVH） ====================
+# 粗检测：评估对象包围盒的世界 AABB 沿 X 轴排序扫描，AABB 间距超过检测距离的对象对直接剔除
+# 细检测：世界空间 BVHTree 按 (几何指纹, 矩阵键) 缓存，未移动、未编辑的对象再次检测时直接复用；
+#   先以 overlap 判断碰撞，再以射线奇偶判断一方是否整体嵌在另一方内部（同样计为碰撞），
+#   否则取双方顶点到对方表面的最近点（只查询落在对方扩展 AABB 内的顶点）
+
+CLEARANCE_COLLISION_COLOR = (1.0, 0.15, 0.15, 1.0)
+CLEARANCE_GAP_COLOR = (1.0, 0.75, 0.1, 1.0)
+CLEARANCE_RAY_DIRECTION = Vector((0.5774, 0.5773, 0.5772)).normalized()  # 内外判断射线方向（略偏离对角线，避免沿边/顶点擦过）
+CLEARANCE_RAY_EPSILON = 1e-6  # 射线穿过表面后继续前进的距离
+CLEARANCE_RAY_MAX_HITS = 1024
+
+class ClearanceGeometry:
+    """一个对象的世界空间 BVH 与顶点（间隙检测用）"""
+    
+    def __init__(self, tree, co, tris):
+        self.tree = tree
+        self.co = co  # numpy (N, 3) 或 [Vector]
+        self.tris = tris
+    
+    def points_within(self, lower, upper):
+        """落在 [lower, upper] 范围内的顶点"""
+        if np is not None:
+            lower = np.asarray(tuple(lower))
+            upper = np.asarray(tuple(upper))
+            mask = np.all((self.co >= lower) & (self.co <= upper), axis=1)
+            return self.co[mask].tolist()
+        return [co for co in self.co if all(lower[i] <= co[i] <= upper[i] for i in range(3))]
+    
+    def triangle_center(self, index):
+        a, b, c = self.tris[index]
+        return (Vector(self.co[a]) + Vector(self.co[b]) + Vector(self.co[c])) / 3.0
+
+clearance_results = None  # 最近一次间隙检测结果
+
+def get_clearance_geometry(obj):
+    """获取对象的世界空间 BVH（评估网格，按几何指纹与矩阵缓存）；无三角面返回 None"""
+    matrix = obj.matrix_world
+    fingerprint = measured_fingerprint(obj, force_evaluated=True)
+    key = ('bvh', fingerprint, matrix_key(matrix))
+    cached = measurement_cache.get(key)
+    if cached is not None:
+        return cached
+    with measured_mesh(obj, True, fingerprint) as (mesh, fingerprint):
+        if np is not None:
+            geometry = get_mesh_geometry(mesh, fingerprint)
+            m = np.array(matrix, dtype=np.float64)
+            co = geometry['co'] @ m[:3, :3].T + m[:3, 3]
+            tris = geometry['tri_verts']
+            if not len(tris):
+                return None
+            tree = BVHTree.FromPolygons(co.tolist(), tris.tolist(), all_triangles=True)
+            nbytes = co.nbytes + tris.nbytes * 3
+        else:
+            mesh.calc_loop_triangles()
+            co = [matrix @ v.co for v in mesh.vertices]
+            tris = [tuple(tri.vertices) for tri in mesh.loop_triangles]
+            if not tris:
+                return None
+            tree = BVHTree.FromPolygons(co, tris, all_triangles=True)
+            nbytes = len(co) * 96 + len(tris) * 128
+        entry = ClearanceGeometry(tree, co, tris)
+        measurement_cache.put(key, entry, nbytes)
+        return entry
+
+def world_aabb(obj, depsgraph):
+    """评估对象（含修改器）包围盒的世界空间 AABB"""
+    obj_eval = obj.evaluated_get(depsgraph)
+    matrix = obj_eval.matrix_world
+    points = [matrix @ Vector(corner) for corner in obj_eval.bound_box]
+    return (
+        Vector((min(p.x for p in points), min(p.y for p in points), min(p.z for p in points))),
+        Vector((max(p.x for p in points), max(p.y for p in points), max(p.z for p in points))),
+    )
+
+def aabb_gap(a_min, a_max, b_min, b_max):
+    """两个 AABB 之间的最短距离（相交时为 0），是两物体表面距离的下界"""
+    gap = [max(0.0, a_min[i] - b_max[i], b_min[i] - a_max[i]) for i in range(3)]
+    return math.sqrt(gap[0] * gap[0] + gap[1] * gap[1] + gap[2] * gap[2])
+
+def clearance_candidate_pairs(boxes, max_distance):
     """
-    计算网格体积（使用bmesh）
+    扫描排序粗检测
     
     Args:
-        bm: bmesh对象
+        boxes: [(对象, AABB 最小点, AABB 最大点)]
+        max_distance: 检测距离
         
     Returns:
-        float: 网格体积
+        list: AABB 间距不超过检测距离的 (i, j) 索引对
     """
-    try:
-        # 使用bmesh计算体积
-        volume = bm.calc_volume()
-        return abs(volume)  # 确保体积为正数
-    except:
-        # 如果bmesh计算失败，返回0
-        return 0.0
+    order = sorted(range(len(boxes)), key=lambda index: boxes[index][1].x)
+    active = []
+    pairs = []
+    for index in order:
+        _, box_min, box_max = boxes[index]
+        active = [other for other in active if boxes[other][2].x + max_distance >= box_min.x]
+        for other in active:
+            if aabb_gap(box_min, box_max, boxes[other][1], boxes[other][2]) <= max_distance:
+                pairs.append((other, index))
+        active.append(index)
+    return pairs
+
+def _nearest_points(source, target, target_min, target_max, limit):
+    """source 顶点到 target 表面的最近点（只在 limit 范围内查询，随结果收紧半径）"""
+    best = (limit, None, None)
+    margin = Vector((limit, limit, limit))
+    for co in source.points_within(target_min - margin, target_max + margin):
+        location, _, _, distance = target.tree.find_nearest(co, best[0])
+        if location is not None and distance < best[0]:
+            best = (distance, Vector(co), location)
+    return best
+
+def point_inside(geometry, point):
+    """射线奇偶判断点是否在闭合网格内部：沿固定方向穿过表面的次数为奇数时在内部"""
+    origin = Vector(point)
+    hits = 0
+    while hits < CLEARANCE_RAY_MAX_HITS:
+        location = geometry.tree.ray_cast(origin, CLEARANCE_RAY_DIRECTION)[0]
+        if location is None:
+            break
+        hits += 1
+        origin = location + CLEARANCE_RAY_DIRECTION * CLEARANCE_RAY_EPSILON
+    return hits % 2 == 1
+
+def _contained_point(inner, inner_box, outer, outer_box):
+    """
+    表面不相交时判断 inner 是否整体嵌在 outer 内部（只需检查一个顶点）
+    
+    Returns:
+        tuple: (inner 上的顶点, outer 表面上的最近点)；不在内部时返回 None
+    """
+    if not len(inner.co) or any(inner_box[0][i] < outer_box[0][i] or inner_box[1][i] > outer_box[1][i] for i in range(3)):
+        return None
+    point = Vector(inner.co[0])
+    if not point_inside(outer, point):
+        return None
+    location = outer.tree.find_nearest(point)[0]
+    return point, location if location is not None else point
+
+def measure_pair_clearance(geometry_a, box_a, geometry_b, box_b, max_distance):
+    """
+    一对对象的间隙
+    
+    距离取双方顶点到对方表面的最近距离（对凸角/面接近的情况精确，两条边交叉接近时略偏大）
+    
+    Returns:
+        dict: distance、point_a、point_b、colliding；距离超过 max_distance 返回 None
+    """
+    overlap = geometry_a.tree.overlap(geometry_b.tree)
+    if overlap:
+        point_a = geometry_a.triangle_center(overlap[0][0])
+        point_b = geometry_b.triangle_center(overlap[0][1])
+        return {'distance': 0.0, 'point_a': point_a, 'point_b': point_b, 'colliding': True}
+    # 表面不相交但一方嵌在另一方内部（嵌套零件）同样是碰撞
+    contained = _contained_point(geometry_a, box_a, geometry_b, box_b)
+    if contained is not None:
+        return {'distance': 0.0, 'point_a': contained[0], 'point_b': contained[1], 'colliding': True}
+    contained = _contained_point(geometry_b, box_b, geometry_a, box_a)
+    if contained is not None:
+        return {'distance': 0.0, 'point_a': contained[1], 'point_b': contained[0], 'colliding': True}
+    distance, point_a, point_b = _nearest_points(geometry_a, geometry_b, box_b[0], box_b[1], max_distance)
+    reverse = _nearest_points(geometry_b, geometry_a, box_a[0], box_a[1], distance)
+    if reverse[1] is not None:
+        distance, point_b, point_a = reverse
+    if point_a is None:
+        return None
+    return {'distance': distance, 'point_a': point_a, 'point_b': point_b, 'colliding': False}
+
+def measure_clearance(objects, max_distance, depsgraph):
+    """
+    检测一组网格对象两两之间的间隙与碰撞
+    
+    Returns:
+        dict: pairs（按距离升序的 {'a', 'b', 'distance', 'point_a', 'point_b', 'colliding'}）、
+              object_count、candidate_count、collision_count、bvh_built、elapsed
+    """
+    start = time.perf_counter()
+    boxes = [(obj,) + world_aabb(obj, depsgraph) for obj in objects]
+    candidates = clearance_candidate_pairs(boxes, max_distance)
+    
+    misses_before = measurement_cache.counters.setdefault('bvh', [0, 0])[1]
+    geometries = {}
+    pairs = []
+    for i, j in candidates:
+        for index in (i, j):
+            if index not in geometries:
+                geometries[index] = get_clearance_geometry(boxes[index][0])
+        if geometries[i] is None or geometries[j] is None:
+            continue
+        result = measure_pair_clearance(geometries[i], boxes[i][1:], geometries[j], boxes[j][1:], max_distance)
+        if result is not None:
+            result['a'] = boxes[i][0].name
+            result['b'] = boxes[j][0].name
+            pairs.append(result)
+    pairs.sort(key=lambda pair: pair['distance'])
+    
+    return {
+        'pairs': pairs,
+        'max_distance': max_distance,
+        'object_count': len(objects),
+        'candidate_count': len(candidates),
+        'collision_count': sum(1 for pair in pairs if pair['colliding']),
+        'bvh_built': measurement_cache.counters['bvh'][1] - misses_before,
+        'elapsed': time.perf_counter() - start,
+    }
+
+class ClearanceDrawHandler:
+    """间隙检测结果绘制：最近点连线（POST_VIEW）与距离标注（POST_PIXEL）"""
+    
+    def __init__(self):
+        self.draw_handler = None
+        self.text_handler = None
+        self.batches = None  # 结果不变时复用的线段批次
+    
+    def start(self):
+        if self.draw_handler is None:
+            self.draw_handler = bpy.types.SpaceView3D.draw_handler_add(self.draw_lines, (), 'WINDOW', 'POST_VIEW')
+        if self.text_handler is None:
+            self.text_handler = bpy.types.SpaceView3D.draw_handler_add(self.draw_text, (), 'WINDOW', 'POST_PIXEL')
+        self.batches = None
+    
+    def stop(self):
+        if self.draw_handler is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.draw_handler, 'WINDOW')
+            self.draw_handler = None
+        if self.text_handler is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.text_handler, 'WINDOW')
+            self.text_handler = None
+        self.batches = None
+    
+    @staticmethod
+    def pair_color(pair):
+        return CLEARANCE_COLLISION_COLOR if pair['colliding'] else CLEARANCE_GAP_COLOR
+    
+    def draw_lines(self):
+        if not clearance_results:
+            return
+        gpu.state.line_width_set(2.0)
+        if use_batched_drawing():
+            if self.batches is None:
+                collector = LineBatchCollector()
+                for pair in clearance_results['pairs']:
+                    collector.add_line(pair['point_a'], pair['point_b'], self.pair_color(pair))
+                self.batches = collector.build()
+            gpu_draw_batches(self.batches)
+        else:
+            for pair in clearance_results['pairs']:
+                gpu_draw_line(pair['point_a'], pair['point_b'], self.pair_color(pair))
+        gpu.state.line_width_set(1.0)
+    
+    def draw_text(self):
+        if not clearance_results:
+            return
+        from bpy_extras import view3d_utils
+        region = bpy.context.region
+        rv3d = bpy.context.region_data
+        if region is None or rv3d is None:
+            return
+        blf.size(0, LABEL_FONT_SIZE)
+        for pair in clearance_results['pairs']:
+            coord = view3d_utils.location_3d_to_region_2d(region, rv3d, (pair['point_a'] + pair['point_b']) / 2)
+            if coord is None:
+                continue
+            text = "碰撞" if pair['colliding'] else f"{pair['distance']:.4f} m"
+            width, height = blf.dimensions(0, text)
+            blf.color(0, *self.pair_color(pair))
+            blf.position(0, coord.x - width / 2, coord.y + height, 0)
+            blf.draw(0, text)
+
+clearance_draw_handler = ClearanceDrawHandler()
 
 # ==================== 数据获取策略说明 ====================
-# 表面积：使用改进的bmesh方法，只在初始测量时计算一次，通过手动刷新更新
+# 表面积：使用NumPy向量化方法（缺失时回退bmesh），只在初始测量时计算一次，通过手动刷新更新
 # 原因：表面积计算非常消耗性能，特别是在动态更新时
 # 其他数据（长度、宽度、高度、体积）：使用动态方法，实时计算
 # 原因：这些数据计算简单，可以实时更新，提供更准确的信息
 # 
 # 解决方案：
-# 1. 表面积：在初始测量时使用bmesh计算一次，存储到 static_area 字段，通过手动刷新更新
+# 1. 表面积：在初始测量时使用向量化内核计算一次，存储到 static_area 字段，通过手动刷新更新
 # 2. 其他数据：每次更新时重新计算，确保实时准确性
 # 3. 性能平衡：在保证准确性的同时，避免表面积重复计算
 # ====================================================
 
-def get_mesh_dimensions(obj):
+def _analyze_bbox_edges_pairwise(world_corners):
     """
-    获取网格对象的尺寸信息
-    基于边界框的12条边计算长宽高：
-    1. 获取对象的边界框数据 (obj.bound_box)
-    2. 应用对象的变换矩阵
-    3. 基于12条边计算长宽高数据
-    4. 分析并固定长宽高对应的边索引（后续变换时只更新数值，不重新选择边）
-    5. 使用改进的表面积计算方法（基于bmesh）
+    逐对比较12条边的平行关系来确定长宽高（旧方法，用于退化包围盒的回退）
     
     Args:
-        obj: Blender对象
+        world_corners: 8个世界坐标包围盒顶点
         
     Returns:
-        dict: 包含长宽高和面积信息的字典，以及固定的边索引
+        dict: 长宽高数值、最终边索引与Z轴对齐分析信息
     """
-    if obj.type != 'MESH':
-        return None
-    
-    # 获取边界框数据（与原生边界框相同的数据源）
-    bbox_corners = [Vector(corner) for corner in obj.bound_box]
-    
-    if not bbox_corners or len(bbox_corners) != 8:
-        return None
-    
-    # 将边界框顶点转换为世界坐标（包含缩放）
-    world_corners = [obj.matrix_world @ corner for corner in bbox_corners]
-    bounds_type = 'BOUNDING_BOX'
-    
-    # 基于12条边计算长宽高数据
-    edges = EDGES
-    
     # 从12条边计算长宽高
     # 长度 (X轴) - 使用底面边 (0,1) 和顶面边 (4,5)
     length_edge1 = (world_corners[1] - world_corners[0]).length  # 底面边 (0,1)
@@ -1055,6 +4335,72 @@ def get_mesh_dimensions(obj):
             final_length_edge_indices = new_length_edge
             final_width_edge_indices = new_width_edge
     
+    return {
+        'length': bbox_length,
+        'width': bbox_width,
+        'height': bbox_height,
+        'length_edge_indices': final_length_edge_indices,
+        'width_edge_indices': final_width_edge_indices,
+        'height_edge_indices': final_height_edge_indices,
+        'selected_height_edge': selected_height_edge,
+        'max_z_alignment': max_z_alignment,
+        'best_edge_name': best_edge_name
+    }
+
+def get_mesh_dimensions(obj, precomputed=None):
+    """
+    获取网格对象的尺寸信息
+    基于边界框的12条边计算长宽高：
+    1. 获取对象的边界框数据 (obj.bound_box)
+    2. 应用对象的变换矩阵
+    3. 基于12条边计算长宽高数据
+    4. 分析并固定长宽高对应的边索引（后续变换时只更新数值，不重新选择边）
+    5. 使用改进的表面积计算方法（NumPy向量化，回退bmesh）
+    
+    Args:
+        obj: Blender对象
+        precomputed: 后台任务在工作线程中算好的结果（可含 area_info），提供的项不再在主线程计算
+        
+    Returns:
+        dict: 包含长宽高和面积信息的字典，以及固定的边索引
+    """
+    if obj.type != 'MESH':
+        return None
+    precomputed = precomputed or {}
+    
+    # 未被注册表跟踪的对象，其定向包围盒缓存可能已过期
+    if measurement_registry.get(obj) is None:
+        oriented_box_engine.invalidate(MeasurementRegistry.object_key(obj))
+    oriented_box = oriented_local_box(obj)
+    
+    # 获取边界框数据（与原生边界框相同的数据源；开启 OBB 时为最小定向包围盒，角点顺序相同）
+    bbox_corners = [Vector(corner) for corner in (oriented_box or obj.bound_box)]
+    
+    if not bbox_corners or len(bbox_corners) != 8:
+        return None
+    
+    # 将边界框顶点转换为世界坐标（包含缩放）
+    world_corners = [obj.matrix_world @ corner for corner in bbox_corners]
+    bounds_type = 'BOUNDING_BOX'
+    
+    # 基于12条边计算长宽高数据
+    edges = EDGES
+    
+    # 优先使用闭式轴分析（常数时间）；退化包围盒（扁平/剪切）回退到逐对平行边分析
+    axis_analysis = analyze_bbox_axes(world_corners)
+    if axis_analysis is None:
+        axis_analysis = _analyze_bbox_edges_pairwise(world_corners)
+    
+    bbox_length = axis_analysis['length']
+    bbox_width = axis_analysis['width']
+    bbox_height = axis_analysis['height']
+    final_length_edge_indices = axis_analysis['length_edge_indices']
+    final_width_edge_indices = axis_analysis['width_edge_indices']
+    final_height_edge_indices = axis_analysis['height_edge_indices']
+    selected_height_edge = axis_analysis['selected_height_edge']
+    max_z_alignment = axis_analysis['max_z_alignment']
+    best_edge_name = axis_analysis['best_edge_name']
+    
     # 计算边界框的边界范围（用于绘制）
     world_min_x = min(corner.x for corner in world_corners)
     world_max_x = max(corner.x for corner in world_corners)
@@ -1064,7 +4410,7 @@ def get_mesh_dimensions(obj):
     world_max_z = max(corner.z for corner in world_corners)
     
     # 使用改进的表面积计算方法（参照3D print box）
-    surface_area_data = calculate_surface_area_3d_print_style(obj)
+    surface_area_data = precomputed.get('area_info') or calculate_surface_area_3d_print_style(obj)
     if surface_area_data:
         area = surface_area_data['total_area']
         area_info = surface_area_data
@@ -1076,6 +4422,9 @@ def get_mesh_dimensions(obj):
             'calculation_method': 'CALCULATION_FAILED'
         }
     
+    # 凸包面积/体积与水密性（开放或非流形网格的体积不可信）
+    hull_info = analyze_hull_and_topology(obj) if use_hull_analysis() else None
+    
     # 直接返回结果（已在上文按Z轴对齐判断选定高度边）
     return {
         'name': obj.name,
@@ -1091,6 +4440,7 @@ def get_mesh_dimensions(obj):
         },
         'bounds_type': bounds_type,
         'bbox_corners': world_corners,
+        'local_box': tuple(tuple(corner) for corner in oriented_box) if oriented_box else None,
         'edges_data': {
             'edges': edges,
             'length_edges': [(0, 1), (4, 5)],
@@ -1098,7 +4448,8 @@ def get_mesh_dimensions(obj):
             'height_edges': [(0, 4), (1, 5), (2, 6), (3, 7)],
             'selected_height_edge': selected_height_edge,
             'static_area': area,
-            'area_info': area_info
+            'area_info': area_info,
+            'hull_info': hull_info
         },
         'final_edges': {
             'length_edge_indices': final_length_edge_indices,
@@ -1112,46 +4463,667 @@ def get_mesh_dimensions(obj):
         }
     }
 
-def get_selected_mesh_measurements():
-    """
-    获取当前选中网格的测量信息
+def get_selected_mesh_measurements():
+    """
+    获取当前选中网格的测量信息
+    
+    Returns:
+        list: 包含所有选中网格测量信息的列表
+    """
+    selected_objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
+    
+    if not selected_objects:
+        return []
+    
+    measurements = []
+    
+    for obj in selected_objects:
+        dims = get_mesh_dimensions(obj)
+        if dims:
+            measurements.append({
+                'name': obj.name,
+                'dimensions': dims
+            })
+    
+    return measurements
+
+def print_measurements(measurements):
+    """
+    打印测量结果
+    
+    Args:
+        measurements: 测量结果列表
+    """
+    if not measurements:
+        return
+    
+    for item in measurements:
+        obj_name = item['name']
+        dims = item['dimensions']
+        
+        print(f"对象: {obj_name} - 长度: {dims['length']:.2f}m, 宽度: {dims['width']:.2f}m, 高度: {dims['height']:.2f}m, 面积: {dims['area']:.2f}m², 体积: {dims['volume']:.2f}m³")
+        
+MEASUREMENT_REPORT_FIELDS = (
+    'object', 'length', 'width', 'height', 'area', 'volume', 'mesh_volume',
+    'face_count', 'vertex_count', 'area_state', 'calculation_method',
+)
+AREA_BREAKDOWN_REPORT_FIELDS = ('object', 'mode', 'group', 'label', 'area', 'volume', 'triangles', 'area_share')
+
+def write_measurement_report(records, report_path):
+    """
+    导出注册表中的测量记录 CSV；记录带面积拆分时，同目录写出 <文件名>_breakdown.csv（每组一行）
+    
+    Returns:
+        str 或 None: 拆分文件路径（没有任何拆分时为 None）
+    """
+    breakdown_rows = []
+    with open(report_path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(MEASUREMENT_REPORT_FIELDS)
+        for record in records:
+            area_info = record.edges_data.get('area_info') or {}
+            writer.writerow((
+                record.name, record.length, record.width, record.height, record.area, record.volume,
+                area_info.get('volume', 0.0), area_info.get('face_count', 0), area_info.get('vertex_count', 0),
+                record.area_state, area_info.get('calculation_method', ''),
+            ))
+            area_breakdown = area_info.get('area_breakdown')
+            if not area_breakdown:
+                continue
+            obj = measurement_registry.resolve(record)
+            total_area = sum(group[1] for group in area_breakdown['groups'])
+            for group_id, area, volume, triangles in area_breakdown['groups']:
+                breakdown_rows.append((
+                    record.name, area_breakdown['mode'], group_id, area_breakdown_label(obj, area_breakdown, group_id),
+                    area, volume, triangles, area / total_area if total_area > 0 else 0.0,
+                ))
+    
+    if not breakdown_rows:
+        return None
+    base, extension = os.path.splitext(report_path)
+    breakdown_path = f"{base}_breakdown{extension or '.csv'}"
+    with open(breakdown_path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(AREA_BREAKDOWN_REPORT_FIELDS)
+        writer.writerows(breakdown_rows)
+    return breakdown_path
+
+# ==================== 外部网格文件测量（不导入 Blender） ====================
+
+MESH_FILE_EXTENSIONS = ('.stl', '.obj', '.ply')
+MESH_FILE_CHUNK_TRIANGLES = 1 << 20  # 二进制 STL 每块处理的三角形数（约 50 MB 映射数据）
+MESH_FILE_CHUNK_BYTES = 1 << 24  # ASCII 文件每次读取的字节数
+MESH_FILE_REPORT_FIELDS = (
+    'name', 'format', 'length', 'width', 'height', 'area', 'volume', 'signed_volume',
+    'triangle_count', 'vertex_count', 'min_x', 'min_y', 'min_z', 'max_x', 'max_y', 'max_z',
+    'seconds', 'error', 'path',
+)
+STL_RECORD_DTYPE = None if np is None else np.dtype([
+    ('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2'),
+])  # 二进制 STL 每个三角形 50 字节
+PLY_SCALAR_TYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+class MeshFileAccumulator:
+    """流式累加网格文件的包围盒、表面积与有符号体积（分块 float64 归约，内存与文件大小无关）"""
+    
+    __slots__ = ('low', 'high', 'area', 'signed_volume', 'triangle_count', 'vertex_count')
+    
+    def __init__(self):
+        self.low = np.full(3, np.inf)
+        self.high = np.full(3, -np.inf)
+        self.area = 0.0
+        self.signed_volume = 0.0
+        self.triangle_count = 0
+        self.vertex_count = 0
+    
+    def add_points(self, co):
+        if len(co):
+            self.low = np.minimum(self.low, co.min(axis=0))
+            self.high = np.maximum(self.high, co.max(axis=0))
+    
+    def add_triangles(self, v0, v1, v2):
+        """累加一块三角形（各为 (n,3) 数组）；面积与体积公式与 area_info_from_arrays 相同"""
+        v0 = v0.astype(np.float64)
+        v1 = v1.astype(np.float64)
+        v2 = v2.astype(np.float64)
+        cross = np.cross(v1 - v0, v2 - v0)
+        self.area += 0.5 * float(np.sqrt(np.einsum('ij,ij->i', cross, cross)).sum())
+        self.signed_volume += float(np.einsum('ij,ij->', v0, np.cross(v1, v2))) / 6.0
+        self.triangle_count += len(v0)
+    
+    def add_polygons(self, co, polygons):
+        """累加一组顶点数相同的多边形（(n,k) 顶点索引），按扇形三角化"""
+        for k in range(1, polygons.shape[1] - 1):
+            self.add_triangles(co[polygons[:, 0]], co[polygons[:, k]], co[polygons[:, k + 1]])
+    
+    def result(self):
+        if not np.isfinite(self.low).all():
+            low = high = np.zeros(3)
+        else:
+            low, high = self.low, self.high
+        size = high - low
+        return {
+            'length': float(size[0]), 'width': float(size[1]), 'height': float(size[2]),
+            'area': self.area,
+            'volume': abs(self.signed_volume),
+            'signed_volume': self.signed_volume,
+            'triangle_count': self.triangle_count,
+            'vertex_count': self.vertex_count,
+            'min_x': float(low[0]), 'min_y': float(low[1]), 'min_z': float(low[2]),
+            'max_x': float(high[0]), 'max_y': float(high[1]), 'max_z': float(high[2]),
+        }
+
+def iter_text_chunks(handle, chunk_bytes=MESH_FILE_CHUNK_BYTES):
+    """按块读取文本文件，每块在最后一个换行处截断，余下部分并入下一块"""
+    rest = b''
+    while True:
+        data = handle.read(chunk_bytes)
+        if not data:
+            if rest:
+                yield rest
+            return
+        data = rest + data
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            rest = data
+            continue
+        rest = data[cut:]
+        yield data[:cut]
+
+def _group_rows_by_length(lines):
+    """把若干行按 token 数分组，每组解析为二维 bytes 数组（同长度的行可整体向量化转换）"""
+    groups = {}
+    for position, line in enumerate(lines):
+        tokens = line.split()
+        if tokens:
+            groups.setdefault(len(tokens), ([], []))
+            groups[len(tokens)][0].extend(tokens)
+            groups[len(tokens)][1].append(position)
+    for length, (tokens, positions) in groups.items():
+        yield np.array(tokens).reshape(-1, length), np.array(positions, dtype=np.int64)
+
+def _measure_binary_stl(path, accumulator):
+    with open(path, 'rb') as handle:
+        handle.seek(80)
+        count = int(np.frombuffer(handle.read(4), dtype='<u4')[0])
+    if count == 0:
+        return
+    records = np.memmap(path, dtype=STL_RECORD_DTYPE, mode='r', offset=84, shape=(count,))
+    try:
+        for start in range(0, count, MESH_FILE_CHUNK_TRIANGLES):
+            vertices = np.asarray(records['vertices'][start:start + MESH_FILE_CHUNK_TRIANGLES], dtype=np.float64)
+            accumulator.add_points(vertices.reshape(-1, 3))
+            accumulator.add_triangles(vertices[:, 0], vertices[:, 1], vertices[:, 2])
+    finally:
+        del records
+    accumulator.vertex_count = count * 3
+
+def _measure_ascii_stl(path, accumulator):
+    carry = np.zeros((0, 3))
+    with open(path, 'rb') as handle:
+        for chunk in iter_text_chunks(handle):
+            tokens = np.array(chunk.split())
+            positions = np.flatnonzero(tokens == b'vertex')
+            if not len(positions):
+                continue
+            vertices = tokens[positions[:, None] + np.arange(1, 4)].astype(np.float64)
+            # 跨块的三角形：不足 3 个的顶点留到下一块
+            vertices = np.concatenate((carry, vertices))
+            usable = len(vertices) - len(vertices) % 3
+            carry = vertices[usable:]
+            vertices = vertices[:usable].reshape(-1, 3, 3)
+            accumulator.add_points(vertices.reshape(-1, 3))
+            accumulator.add_triangles(vertices[:, 0], vertices[:, 1], vertices[:, 2])
+            accumulator.vertex_count += usable
+
+def _measure_stl(path, accumulator):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as handle:
+        header = handle.read(84)
+    # ASCII STL 以 "solid" 开头，但部分导出器的二进制文件头也以 "solid" 开头：以文件长度判断
+    if len(header) == 84:
+        count = int(np.frombuffer(header[80:84], dtype='<u4')[0])
+        if size == 84 + 50 * count:
+            return _measure_binary_stl(path, accumulator)
+    return _measure_ascii_stl(path, accumulator)
+
+def _measure_obj(path, accumulator):
+    """
+    逐块解析 OBJ：顶点按 float32 追加保存（面索引可能引用任意之前的顶点），面按块即时三角化累加
+    支持 v/vt/vn 形式与负数（相对）索引
+    """
+    vertices = np.zeros((0, 3), dtype=np.float32)
+    with open(path, 'rb') as handle:
+        for chunk in iter_text_chunks(handle):
+            lines = chunk.split(b'\n')
+            vertex_lines = [line[2:] for line in lines if line.startswith(b'v ')]
+            face_lines = [line[2:] for line in lines if line.startswith(b'f ')]
+            base = len(vertices)
+            if vertex_lines:
+                # 分组会打乱顺序：按行号还原顶点顺序
+                new_vertices = np.empty((len(vertex_lines), 3), dtype=np.float32)
+                for rows, positions in _group_rows_by_length(vertex_lines):
+                    new_vertices[positions] = rows[:, :3].astype(np.float32)
+                vertices = np.concatenate((vertices, new_vertices))
+                accumulator.add_points(new_vertices.astype(np.float64))
+            if not face_lines:
+                continue
+            # 相对索引以该面之前已定义的顶点数为基准
+            before = np.cumsum([line.startswith(b'v ') for line in lines]) + base
+            face_positions = np.flatnonzero([line.startswith(b'f ') for line in lines])
+            for rows, positions in _group_rows_by_length(face_lines):
+                if rows.shape[1] < 3:
+                    continue
+                indices = np.char.partition(rows, b'/')[..., 0].astype(np.int64)
+                defined = before[face_positions[positions]][:, None]
+                indices = np.where(indices < 0, defined + indices, indices - 1)
+                accumulator.add_polygons(vertices, indices)
+    accumulator.vertex_count = len(vertices)
+
+def _read_ply_header(handle):
+    """解析 PLY 文件头，返回 (格式, [(元素名, 数量, [(属性名, 类型, 列表计数类型)])])"""
+    if handle.readline().strip() != b'ply':
+        raise ValueError("不是 PLY 文件")
+    fmt = None
+    elements = []
+    while True:
+        line = handle.readline()
+        if not line:
+            raise ValueError("PLY 文件头不完整")
+        tokens = line.decode('ascii', 'replace').split()
+        if not tokens or tokens[0] in ('comment', 'obj_info'):
+            continue
+        if tokens[0] == 'end_header':
+            return fmt, elements
+        if tokens[0] == 'format':
+            fmt = tokens[1]
+        elif tokens[0] == 'element':
+            elements.append((tokens[1], int(tokens[2]), []))
+        elif tokens[0] == 'property':
+            if tokens[1] == 'list':
+                elements[-1][2].append((tokens[4], PLY_SCALAR_TYPES[tokens[3]], PLY_SCALAR_TYPES[tokens[2]]))
+            else:
+                elements[-1][2].append((tokens[2], PLY_SCALAR_TYPES[tokens[1]], None))
+
+def _measure_ply(path, accumulator):
+    with open(path, 'rb') as handle:
+        fmt, elements = _read_ply_header(handle)
+        data_offset = handle.tell()
+    if fmt == 'ascii':
+        return _measure_ascii_ply(path, data_offset, elements, accumulator)
+    endian = '<' if fmt == 'binary_little_endian' else '>'
+    return _measure_binary_ply(path, data_offset, elements, endian, accumulator)
+
+def _ply_face_index_column(properties):
+    """ASCII 面元素中顶点索引列表的顶点数所在列（其前只允许标量属性）"""
+    lists = [position for position, prop in enumerate(properties) if prop[2] is not None]
+    if not lists:
+        raise ValueError("PLY 面元素缺少顶点索引列表")
+    names = [properties[position][0] for position in lists]
+    position = lists[names.index('vertex_indices')] if 'vertex_indices' in names else \
+        lists[names.index('vertex_index')] if 'vertex_index' in names else lists[0]
+    if any(prop[2] is not None for prop in properties[:position]):
+        raise ValueError("不支持的 PLY 面元素布局：顶点索引列表前还有其他列表属性")
+    return position
+
+def _measure_ascii_ply(path, data_offset, elements, accumulator):
+    vertices = None
+    with open(path, 'rb') as handle:
+        handle.seek(data_offset)
+        chunks = iter_text_chunks(handle)
+        pending = []
+        for name, count, properties in elements:
+            remaining = count
+            while remaining > 0:
+                while not pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        raise ValueError("incomplete PLY data")
+                    # 末块可能没有结尾换行，保留最后一行；跳过空行
+                    pending = [line for line in chunk.split(b'\n') if line.strip()]
+                lines, pending = pending[:remaining], pending[remaining:]
+                remaining -= len(lines)
+                if name == 'vertex':
+                    names = [prop[0] for prop in properties]
+                    columns = [names.index(axis) for axis in ('x', 'y', 'z')]
+                    rows = np.array(b' '.join(lines).split()).reshape(len(lines), -1)
+                    co = rows[:, columns].astype(np.float64)
+                    accumulator.add_points(co)
+                    vertices = co.astype(np.float32) if vertices is None else np.concatenate((vertices, co.astype(np.float32)))
+                elif name == 'face' and vertices is not None:
+                    # 顶点索引列表前的标量属性各占一列，其后为顶点数与索引；列表之后的逐面属性（如颜色）不参与计算
+                    lead = _ply_face_index_column(properties)
+                    for rows, _ in _group_rows_by_length(lines):
+                        if rows.shape[1] <= lead + 3:
+                            continue
+                        counts = rows[:, lead].astype(np.int64)
+                        for n in np.unique(counts):
+                            if n >= 3 and lead + 1 + n <= rows.shape[1]:
+                                accumulator.add_polygons(vertices, rows[counts == n, lead + 1:lead + 1 + n].astype(np.int64))
+    accumulator.vertex_count = 0 if vertices is None else len(vertices)
+
+def _measure_binary_ply(path, data_offset, elements, endian, accumulator):
+    """二进制 PLY：定长元素直接内存映射；面列表先按"全部为同一顶点数"的定长布局尝试映射，不满足时逐块解析"""
+    offset = data_offset
+    vertices = None
+    for name, count, properties in elements:
+        has_list = any(prop[2] is not None for prop in properties)
+        if not has_list:
+            dtype = np.dtype([(prop[0], endian + prop[1]) for prop in properties])
+            if name == 'vertex':
+                table = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+                vertices = np.empty((count, 3), dtype=np.float32)
+                for axis, column in enumerate(('x', 'y', 'z')):
+                    vertices[:, axis] = table[column]
+                del table
+                accumulator.add_points(vertices.astype(np.float64))
+            offset += dtype.itemsize * count
+            continue
+        if name != 'face' or vertices is None or len(properties) != 1 or count == 0:
+            raise ValueError(f"不支持的二进制 PLY 元素布局: {name}")
+        _, index_type, count_type = properties[0]
+        count_size = np.dtype(count_type).itemsize
+        with open(path, 'rb') as handle:
+            handle.seek(offset)
+            first = int(np.frombuffer(handle.read(count_size), dtype=endian + count_type)[0])
+        dtype = np.dtype([('n', endian + count_type), ('indices', endian + index_type, (first,))])
+        if offset + dtype.itemsize * count <= os.path.getsize(path):
+            faces = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+            if (faces['n'] == first).all():
+                for start in range(0, count, MESH_FILE_CHUNK_TRIANGLES):
+                    accumulator.add_polygons(vertices, np.asarray(faces['indices'][start:start + MESH_FILE_CHUNK_TRIANGLES], dtype=np.int64))
+                del faces
+                offset += dtype.itemsize * count
+                continue
+            del faces
+        offset = _accumulate_binary_ply_faces(path, offset, count, count_type, index_type, endian, vertices, accumulator)
+    accumulator.vertex_count = 0 if vertices is None else len(vertices)
+
+def _accumulate_binary_ply_faces(path, offset, count, count_type, index_type, endian, vertices, accumulator):
+    """顶点数不一的二进制面列表：逐块读取，按顶点数分组后累加"""
+    count_dtype = np.dtype(endian + count_type)
+    index_dtype = np.dtype(endian + index_type)
+    with open(path, 'rb') as handle:
+        handle.seek(offset)
+        remaining = count
+        buffer = b''
+        while remaining > 0:
+            data = handle.read(MESH_FILE_CHUNK_BYTES)
+            if not data:
+                raise ValueError("PLY 面数据不完整")
+            buffer += data
+            groups = {}
+            position = 0
+            while remaining > 0 and position + count_dtype.itemsize <= len(buffer):
+                n = int(np.frombuffer(buffer, dtype=count_dtype, count=1, offset=position)[0])
+                end = position + count_dtype.itemsize + n * index_dtype.itemsize
+                if end > len(buffer):
+                    break
+                groups.setdefault(n, []).append(np.frombuffer(buffer, dtype=index_dtype, count=n, offset=position + count_dtype.itemsize))
+                position = end
+                remaining -= 1
+            for n, polygons in groups.items():
+                if n >= 3:
+                    accumulator.add_polygons(vertices, np.array(polygons, dtype=np.int64))
+            offset += position
+            buffer = buffer[position:]
+    return offset
+
+MESH_FILE_READERS = {'.stl': _measure_stl, '.obj': _measure_obj, '.ply': _measure_ply}
+
+def measure_mesh_file(path):
+    """
+    直接读取 STL/OBJ/PLY 文件测量尺寸、表面积与体积，不创建任何数据块
+    
+    - 二进制 STL 以内存映射按块处理；ASCII STL/OBJ/PLY 按块流式解析
+    - 长宽高为文件坐标系下的轴对齐包围盒尺寸，数值单位即文件单位
+    - 体积为有符号体积的绝对值（与 area_info_from_arrays 相同公式，开放网格时不可信）
+    
+    Args:
+        path: 文件路径
+        
+    Returns:
+        dict: 字段见 MESH_FILE_REPORT_FIELDS；失败时 error 为错误信息
+    """
+    extension = os.path.splitext(path)[1].lower()
+    result = {'name': os.path.basename(path), 'format': extension.lstrip('.').upper(), 'path': path, 'error': ''}
+    start = time.perf_counter()
+    try:
+        if np is None:
+            raise RuntimeError("需要 numpy")
+        reader = MESH_FILE_READERS.get(extension)
+        if reader is None:
+            raise ValueError(f"不支持的文件格式: {extension}")
+        accumulator = MeshFileAccumulator()
+        reader(path, accumulator)
+        result.update(accumulator.result())
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def collect_mesh_files(directory, recursive=True):
+    """列出目录中可测量的网格文件（按路径排序）"""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(MESH_FILE_EXTENSIONS))
+        if not recursive:
+            break
+    return sorted(paths)
+
+def write_mesh_file_report(results, report_path):
+    """把文件测量结果写为 CSV（默认）或 JSON（扩展名为 .json 时）"""
+    if report_path.lower().endswith('.json'):
+        with open(report_path, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, ensure_ascii=False, indent=2)
+        return
+    with open(report_path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=MESH_FILE_REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+class MeshFileJob:
+    """网格文件批量测量任务
+    
+    工作线程逐个文件测量（内存映射读取与 NumPy 归约期间释放 GIL），
+    同时处理的文件数等于线程数，每个文件只持有一块数据，峰值内存与文件总大小无关
+    """
+    
+    def __init__(self, paths, max_workers=None):
+        self.pending = deque(paths)
+        self.total = len(self.pending)
+        self.results = []
+        workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="objectmeasure-file")
+        self.max_in_flight = workers
+        self.futures = set()
+    
+    @property
+    def completed(self):
+        return len(self.results)
+    
+    @property
+    def failed(self):
+        return sum(1 for result in self.results if result['error'])
+    
+    @property
+    def finished(self):
+        return not self.pending and not self.futures
+    
+    def step(self):
+        for future in [future for future in self.futures if future.done()]:
+            self.futures.discard(future)
+            self.results.append(future.result())
+        while self.pending and len(self.futures) < self.max_in_flight:
+            self.futures.add(self.executor.submit(measure_mesh_file, self.pending.popleft()))
+    
+    def run(self):
+        """阻塞执行到全部完成（脚本/命令行调用）"""
+        while not self.finished:
+            self.step()
+            if self.futures:
+                wait(self.futures, return_when=FIRST_COMPLETED)
+        self.shutdown()
+        return self.results
+    
+    def cancel(self):
+        self.pending.clear()
+        for future in self.futures:
+            future.cancel()
+        self.futures.clear()
+        self.shutdown()
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+def measure_mesh_files(paths, report_path=None, max_workers=None):
+    """批量测量网格文件并（可选）写出报告，返回按输入顺序排列的结果列表"""
+    order = {path: index for index, path in enumerate(paths)}
+    results = MeshFileJob(paths, max_workers).run()
+    results.sort(key=lambda result: order.get(result['path'], 0))
+    if report_path:
+        write_mesh_file_report(results, report_path)
+    return results
+
+# ==================== 设置属性组 ====================
+
+def _update_cache_limits(self, context):
+    """缓存上限属性变化时同步到全局缓存"""
+    apply_measure_settings(context.scene)
+
+def _update_oriented_box(self, context):
+    """切换 OBB 时重新求出各记录的定向包围盒角点（绘制回调只读取记录）"""
+    refresh_record_local_boxes()
+    _tag_view3d_redraw()
+
+def refresh_record_local_boxes():
+    for record in measurement_registry:
+        obj = measurement_registry.resolve(record)
+        if obj is not None and obj.type == 'MESH':
+            record.local_box = oriented_local_box(obj)
+
+def apply_measure_settings(scene):
+    """把场景中的测量设置同步到运行时对象（缓存上限等）"""
+    settings = getattr(scene, "object_measure_settings", None)
+    if settings is None:
+        return
+    measurement_cache.configure(
+        max_entries=settings.cache_max_entries,
+        max_bytes=settings.cache_max_mb * 1024 * 1024
+    )
+
+class ObjectMeasureSettings(PropertyGroup):
+    """网格测量设置属性组"""
     
-    Returns:
-        list: 包含所有选中网格测量信息的列表
-    """
-    selected_objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
+    # 视口绘制
+    use_batched_drawing: BoolProperty(
+        name="批量绘制",
+        description="将测量线与虚线包围盒按颜色合并为少量GPU批次绘制；关闭则使用逐段绘制（用于耗时对比）",
+        default=True
+    )
     
-    if not selected_objects:
-        return []
+    use_frustum_culling: BoolProperty(
+        name="视锥裁剪",
+        description="通过空间索引只绘制与当前视锥相交的已测量对象",
+        default=True
+    )
     
-    measurements = []
+    use_label_declutter: BoolProperty(
+        name="标注去重叠",
+        description="重叠的标注按优先级挪开或隐藏（名称 > 面积 > 长宽高）",
+        default=True
+    )
     
-    for obj in selected_objects:
-        dims = get_mesh_dimensions(obj)
-        if dims:
-            measurements.append({
-                'name': obj.name,
-                'dimensions': dims
-            })
+    use_distance_lod: BoolProperty(
+        name="距离LOD",
+        description="距视点超过阈值的已测量对象只显示名称标注",
+        default=False
+    )
     
-    return measurements
-
-def print_measurements(measurements):
-    """
-    打印测量结果
+    lod_distance: FloatProperty(
+        name="LOD距离",
+        description="超过该距离的对象只显示名称标注",
+        default=50.0,
+        min=0.0,
+        unit='LENGTH'
+    )
     
-    Args:
-        measurements: 测量结果列表
-    """
-    if not measurements:
-        return
+    # 测量几何
+    use_evaluated_mesh: BoolProperty(
+        name="测量评估网格",
+        description="测量修改器/几何节点计算后的网格（阵列、镜像、实体化等），按评估网格指纹缓存；关闭则只测量原始网格数据",
+        default=False
+    )
     
-    for item in measurements:
-        obj_name = item['name']
-        dims = item['dimensions']
-        
-        print(f"对象: {obj_name} - 长度: {dims['length']:.2f}m, 宽度: {dims['width']:.2f}m, 高度: {dims['height']:.2f}m, 面积: {dims['area']:.2f}m², 体积: {dims['volume']:.2f}m³")
-        
+    use_oriented_box: BoolProperty(
+        name="最小定向包围盒",
+        description="以网格凸包求最小体积定向包围盒（OBB）测量长宽高，适用于网格在自身坐标系内旋转的物体；需要 numpy",
+        default=False,
+        update=_update_oriented_box
+    )
+    
+    use_hull_analysis: BoolProperty(
+        name="凸包与水密性",
+        description="测量时计算凸包面积/体积，并统计开放边、非流形边与法向不一致的边（判断网格体积是否可信）；需要 numpy",
+        default=True
+    )
+    
+    annotation_font_path: StringProperty(
+        name="标注字体",
+        description="烘焙标注使用的字体文件；留空则自动查找 Windows/Linux/macOS 常见粗体字体",
+        default="",
+        subtype='FILE_PATH'
+    )
+    
+    area_breakdown: EnumProperty(
+        name="面积拆分",
+        description="测量时按材质槽或整数面属性分组汇总面积与体积（写入测量记录与 CSV 导出）",
+        items=(
+            ('NONE', "不拆分", "只计算总面积与体积"),
+            ('MATERIAL', "按材质", "按面的材质槽分组"),
+            ('ATTRIBUTE', "按面属性", "按整数面属性分组；属性名留空时使用旧版面贴图"),
+        ),
+        default='NONE'
+    )
+    
+    breakdown_attribute: StringProperty(
+        name="分组属性",
+        description="按面属性拆分时使用的整数（或布尔）面属性名",
+        default=""
+    )
+    
+    use_edit_measure: BoolProperty(
+        name="编辑模式选区测量",
+        description="编辑模式下在视口左下角实时显示选中面的面积与选中边的总长（世界空间）",
+        default=True
+    )
+    
+    # 测量缓存上限
+    cache_max_entries: IntProperty(
+        name="缓存条目上限",
+        description="测量缓存最多保留的条目数，超出后按最近最少使用淘汰",
+        default=128,
+        min=1,
+        max=100000,
+        update=_update_cache_limits
+    )
+    
+    cache_max_mb: IntProperty(
+        name="缓存内存上限(MB)",
+        description="测量缓存占用内存上限，超出后按最近最少使用淘汰",
+        default=256,
+        min=0,
+        max=65536,
+        update=_update_cache_limits
+    )
+
 # ==================== 操作符类 ====================
 
 class OBJECT_OT_measure_mesh(Operator):
@@ -1163,68 +5135,51 @@ class OBJECT_OT_measure_mesh(Operator):
     
     def execute(self, context):
         """执行测量操作"""
+        ensure_measurements_restored()
         selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
         
         if not selected_objects:
             self.report({'WARNING'}, "请选择至少一个网格对象")
             return {'CANCELLED'}
         
-        # 获取测量数据
-        new_measurements = get_selected_mesh_measurements()
-        
-        if not new_measurements:
-            self.report({'ERROR'}, "无法获取测量数据")
-            return {'CANCELLED'}
-        
-        # 已在 get_mesh_dimensions 中完成Z轴对齐，无需再次处理
+        # 跳过已测量的物体（注册表按对象键 O(1) 判重，已测量物体不再重复计算）
+        pending_objects = [obj for obj in selected_objects if measurement_registry.get(obj) is None]
+        if not pending_objects:
+            self.report({'INFO'}, "选中的物体已经测量过了")
+            return {'FINISHED'}
         
-        # 获取现有的测量结果
-        global measurement_results, show_3d_annotations, object_annotation_states
+        apply_measure_settings(context.scene)
         
-        # 创建现有物体名称的集合，用于检查重复
-        existing_object_names = {item.get('name') for item in measurement_results if item and 'name' in item}
+        # 启动面积过期跟踪器（仅在对象变化时更新过期标记）；先于测量启动，记录的评估网格指纹带上跟踪器版本号
+        area_dirty_tracker.start()
         
-        # 过滤出新的测量数据（避免重复添加）
+        # 获取测量数据（已在 get_mesh_dimensions 中完成Z轴对齐，无需再次处理）
+        # 新记录的标注状态为显示，并记录当前长宽高与网格指纹作为面积有效的基准
         added_measurements = []
-        for measurement in new_measurements:
-            if measurement and 'name' in measurement:
-                if measurement['name'] not in existing_object_names:
-                    added_measurements.append(measurement)
-                    existing_object_names.add(measurement['name'])
+        for obj in pending_objects:
+            dims = get_mesh_dimensions(obj)
+            if dims and measurement_registry.add(obj, dims) is not None:
+                added_measurements.append({'name': obj.name, 'dimensions': dims})
         
         if not added_measurements:
-            self.report({'INFO'}, "选中的物体已经测量过了")
-            return {'FINISHED'}
+            if not measurement_registry:
+                area_dirty_tracker.stop()
+            self.report({'ERROR'}, "无法获取测量数据")
+            return {'CANCELLED'}
         
-        # 将新测量数据追加到现有结果中
-        measurement_results.extend(added_measurements)
+        measured_object_index.invalidate()
         
         # 打印新添加的测量结果
         print_measurements(added_measurements)
         
-        # 存储测量结果到场景属性中
-        context.scene['mesh_measurements'] = measurement_results
+        # 存储测量结果到场景属性中（紧凑定长记录）
+        persist_measurements(context.scene)
         
         # 启用3D标注显示
+        global show_3d_annotations
         context.scene['show_3d_annotations'] = True
         show_3d_annotations = True
         
-        # 设置新测量物体的标注状态为显示，并初始化面积状态
-        global object_area_states
-        for measurement in added_measurements:
-            if measurement and 'name' in measurement:
-                object_annotation_states[measurement['name']] = True
-                # 初始化面积状态，记录当前长宽高，设置为当前状态
-                dims = measurement['dimensions']
-                object_area_states[measurement['name']] = {
-                    'current_area': dims.get('area', 0),
-                    'recorded_length': dims.get('length', 0),
-                    'recorded_width': dims.get('width', 0),
-                    'recorded_height': dims.get('height', 0),
-                    'is_expired': False,
-                    'state': 'current'  # 当前状态，表示面积数据有效
-                }
-        
         # 启动测量绘制处理器，确保测量后视口能显示标注
         global measurement_draw_handler
         if measurement_draw_handler is None:
@@ -1238,7 +5193,106 @@ class OBJECT_OT_measure_mesh(Operator):
         bounding_box_draw_handler.start(context)
         
         
-        self.report({'INFO'}, f"已测量 {len(added_measurements)} 个新对象，总计 {len(measurement_results)} 个对象")
+        self.report({'INFO'}, f"已测量 {len(added_measurements)} 个新对象，总计 {len(measurement_registry)} 个对象")
+        return {'FINISHED'}
+
+class OBJECT_OT_measure_mesh_background(Operator):
+    """在后台测量选中网格对象（不阻塞界面）"""
+    bl_idname = "object.measure_mesh_background"
+    bl_label = "后台测量"
+    bl_description = "在后台线程中计算选中网格对象的面积与体积，结果逐个加入标注，状态栏显示进度，按 ESC 取消"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    _timer = None
+    _job = None
+    
+    def invoke(self, context, event):
+        ensure_measurements_restored()
+        selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        
+        if not selected_objects:
+            self.report({'WARNING'}, "请选择至少一个网格对象")
+            return {'CANCELLED'}
+        
+        pending_objects = [obj for obj in selected_objects if measurement_registry.get(obj) is None]
+        if not pending_objects:
+            self.report({'INFO'}, "选中的物体已经测量过了")
+            return {'FINISHED'}
+        
+        apply_measure_settings(context.scene)
+        self._job = MeasurementJob(pending_objects)
+        
+        # 先启动标注绘制，结果完成一个显示一个
+        global show_3d_annotations, measurement_draw_handler, bounding_box_draw_handler
+        context.scene['show_3d_annotations'] = True
+        show_3d_annotations = True
+        area_dirty_tracker.start()
+        if measurement_draw_handler is None:
+            measurement_draw_handler = MeasurementDrawHandler()
+        measurement_draw_handler.start(context)
+        if bounding_box_draw_handler is None:
+            bounding_box_draw_handler = BoundingBoxDrawHandler()
+        bounding_box_draw_handler.start(context)
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(MEASURE_JOB_TICK_SECONDS, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, self._job.total)
+        self._update_status(context)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        # ESC 取消：已完成的对象保留在测量结果中
+        if event.type == 'ESC':
+            self._job.cancel()
+            return self._finish(context, cancelled=True)
+        
+        # 仅处理计时器事件，其余事件交给界面（视口保持可交互）
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        if self._job.step():
+            measured_object_index.invalidate()
+            for area in context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+        self._update_status(context)
+        
+        if self._job.finished:
+            return self._finish(context)
+        return {'PASS_THROUGH'}
+    
+    def _update_status(self, context):
+        job = self._job
+        context.window_manager.progress_update(job.completed)
+        if context.workspace is not None:
+            context.workspace.status_text_set(
+                f"后台测量: {job.completed}/{job.total}（计算中 {len(job.futures)}），按 ESC 取消"
+            )
+    
+    def _finish(self, context, cancelled=False):
+        job = self._job
+        job.shutdown()
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+        
+        if job.added:
+            measured_object_index.invalidate()
+            print_measurements(job.added)
+            persist_measurements(context.scene)
+        
+        message = f"已测量 {len(job.added)} 个新对象，总计 {len(measurement_registry)} 个对象"
+        if job.failed:
+            message += f"（{job.failed} 个失败）"
+        if cancelled:
+            self.report({'WARNING'}, f"后台测量已取消，{message}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, message)
         return {'FINISHED'}
 
 class OBJECT_OT_toggle_3d_annotations(Operator):
@@ -1249,7 +5303,8 @@ class OBJECT_OT_toggle_3d_annotations(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        global show_3d_annotations, object_annotation_states
+        global show_3d_annotations
+        ensure_measurements_restored()
         
         # 获取选中的物体
         selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
@@ -1262,16 +5317,13 @@ class OBJECT_OT_toggle_3d_annotations(Operator):
         else:
             # 针对选中的物体进行操作
             for obj in selected_objects:
-                if obj.name not in object_annotation_states:
-                    object_annotation_states[obj.name] = True  # 默认显示
-                
-                # 切换该物体的标注状态
-                object_annotation_states[obj.name] = not object_annotation_states[obj.name]
+                # 切换该物体的标注状态（默认显示）
+                measurement_registry.toggle_annotation(obj)
             
             # 统计显示和隐藏的物体数量
-            visible_count = sum(1 for state in object_annotation_states.values() if state)
-            hidden_count = len(object_annotation_states) - visible_count
+            visible_count, hidden_count = measurement_registry.annotation_counts()
             
+            persist_measurements(context.scene)
             self.report({'INFO'}, f"已切换 {len(selected_objects)} 个物体的标注状态（显示: {visible_count}, 隐藏: {hidden_count}）")
         
         # 刷新界面
@@ -1287,16 +5339,17 @@ class OBJECT_OT_clear_measurements(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        global measurement_results, show_3d_annotations, measurement_draw_handler, bounding_box_draw_handler, object_annotation_states, object_area_states
+        global show_3d_annotations, measurement_draw_handler, bounding_box_draw_handler
+        ensure_measurements_restored()
         
         # 获取选中的物体
         selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
         
         if not selected_objects:
             # 如果没有选中物体，则清除所有测量结果
-            measurement_results.clear()
-            object_annotation_states.clear()
-            object_area_states.clear()
+            measurement_registry.clear()
+            area_dirty_tracker.stop()
+            measured_object_index.clear()
             
             # 清除测量绘制缓存
             if measurement_draw_handler:
@@ -1317,113 +5370,427 @@ class OBJECT_OT_clear_measurements(Operator):
             # 针对选中的物体进行操作
             cleared_count = 0
             for obj in selected_objects:
-                obj_name = obj.name
-                
-                # 从测量结果中移除该物体
-                measurement_results = [item for item in measurement_results if item.get('name') != obj_name]
-                
-                # 从标注状态中移除该物体
-                if obj_name in object_annotation_states:
-                    del object_annotation_states[obj_name]
-                
-                # 从面积状态中移除该物体
-                if obj_name in object_area_states:
-                    del object_area_states[obj_name]
+                # 从注册表中移除该物体的测量结果、标注状态与面积状态
+                if measurement_registry.remove(obj) is not None:
                     cleared_count += 1
             
+            measured_object_index.invalidate()
+            
             # 清除测量绘制缓存中对应物体的数据
             if measurement_draw_handler:
                 measurement_draw_handler.clear_cache()
             
             self.report({'INFO'}, f"已清除 {cleared_count} 个物体的测量结果")
         
+        persist_measurements(context.scene)
+        
+        # 刷新界面
+        context.area.tag_redraw()
+        
+        return {'FINISHED'}
+
+class OBJECT_OT_refresh_expired_areas(Operator):
+    """刷新过期面积数据"""
+    bl_idname = "object.refresh_expired_areas"
+    bl_label = "刷新面积"
+    bl_description = "重新计算并刷新选中物体的过期面积数据"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        global measurement_draw_handler
+        ensure_measurements_restored()
+        
+        # 获取选中的物体
+        selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        
+        if not selected_objects:
+            self.report({'WARNING'}, "请选择至少一个网格对象")
+            return {'CANCELLED'}
+        
+        apply_measure_settings(context.scene)
+        refreshed_count = 0
+        
+        for obj in selected_objects:
+            # 检查该物体是否有过期的面积数据
+            record = measurement_registry.get(obj)
+            if record is None or record.area_state != 'expired':
+                continue
+            
+            # 重新计算面积数据
+            new_dimensions = get_mesh_dimensions(obj)
+            if not new_dimensions:
+                continue
+            
+            # 更新记录中的面积数据（凸包与水密性分析随面积一同过期，一并刷新）
+            record.area = new_dimensions['area']
+            record.edges_data['static_area'] = new_dimensions['area']
+            record.edges_data['area_info'] = new_dimensions['edges_data']['area_info']
+            record.edges_data['hull_info'] = new_dimensions['edges_data'].get('hull_info')
+            
+            # 获取当前的长宽高数据用于记录
+            current_bbox_corners = measurement_draw_handler.get_current_bbox_corners(obj)
+            if current_bbox_corners:
+                current_dimensions = measurement_draw_handler.calculate_current_dimensions(
+                    current_bbox_corners, new_dimensions.get('edges_data', {})
+                )
+                current_length = current_dimensions.get('length', 0)
+                current_width = current_dimensions.get('width', 0)
+                current_height = current_dimensions.get('height', 0)
+            else:
+                current_length = new_dimensions.get('length', 0)
+                current_width = new_dimensions.get('width', 0)
+                current_height = new_dimensions.get('height', 0)
+            
+            # 更新面积状态记录（设置为当前状态，表示面积数据有效）
+            record.mark_current(current_length, current_width, current_height, measured_fingerprint(obj))
+            
+            refreshed_count += 1
+        
+        # 清除缓存
+        if measurement_draw_handler:
+            measurement_draw_handler.clear_cache()
+        
+        if refreshed_count > 0:
+            persist_measurements(context.scene)
+            self.report({'INFO'}, f"已刷新 {refreshed_count} 个物体的面积数据")
+        else:
+            self.report({'INFO'}, "没有找到需要刷新的过期面积数据")
+        
         # 刷新界面
         context.area.tag_redraw()
         
         return {'FINISHED'}
 
-class OBJECT_OT_refresh_expired_areas(Operator):
-    """刷新过期面积数据"""
-    bl_idname = "object.refresh_expired_areas"
-    bl_label = "刷新面积"
-    bl_description = "重新计算并刷新选中物体的过期面积数据"
-    bl_options = {'REGISTER', 'UNDO'}
+class OBJECT_OT_clear_measurement_cache(Operator):
+    """清空测量缓存"""
+    bl_idname = "object.clear_measurement_cache"
+    bl_label = "清空测量缓存"
+    bl_description = "清空面积/体积测量缓存并重置命中统计"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        measurement_cache.clear()
+        measurement_cache.reset_stats()
+        self.report({'INFO'}, "测量缓存已清空")
+        return {'FINISHED'}
+
+class OBJECT_OT_measure_mesh_files(Operator):
+    """测量目录中的 STL/OBJ/PLY 文件（不导入场景）"""
+    bl_idname = "object.measure_mesh_files"
+    bl_label = "测量网格文件"
+    bl_description = "直接读取目录中的 STL/OBJ/PLY 文件计算尺寸、面积与体积并写出报告，不导入场景、不创建数据块，按 ESC 取消"
+    bl_options = {'REGISTER'}
+    
+    directory: StringProperty(
+        name="目录",
+        description="包含网格文件的目录",
+        subtype='DIR_PATH'
+    )
+    
+    recursive: BoolProperty(
+        name="包含子目录",
+        description="同时测量子目录中的文件",
+        default=True
+    )
+    
+    report_format: EnumProperty(
+        name="报告格式",
+        items=(
+            ('CSV', "CSV", "逗号分隔表格"),
+            ('JSON', "JSON", "JSON 列表"),
+        ),
+        default='CSV'
+    )
+    
+    _timer = None
+    _job = None
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        if np is None:
+            self.report({'ERROR'}, "测量网格文件需要 numpy")
+            return {'CANCELLED'}
+        directory = bpy.path.abspath(self.directory)
+        if not os.path.isdir(directory):
+            self.report({'WARNING'}, "请选择有效的目录")
+            return {'CANCELLED'}
+        paths = collect_mesh_files(directory, self.recursive)
+        if not paths:
+            self.report({'WARNING'}, "目录中没有 STL/OBJ/PLY 文件")
+            return {'CANCELLED'}
+        
+        self._order = {path: index for index, path in enumerate(paths)}
+        self._report_path = os.path.join(directory, f"objectmeasure_report.{self.report_format.lower()}")
+        self._job = MeshFileJob(paths)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(MEASURE_JOB_TICK_SECONDS, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, self._job.total)
+        self._update_status(context)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._job.cancel()
+            return self._finish(context, cancelled=True)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        self._job.step()
+        self._update_status(context)
+        if self._job.finished:
+            return self._finish(context)
+        return {'PASS_THROUGH'}
+    
+    def _update_status(self, context):
+        job = self._job
+        context.window_manager.progress_update(job.completed)
+        if context.workspace is not None:
+            context.workspace.status_text_set(
+                f"测量网格文件: {job.completed}/{job.total}（读取中 {len(job.futures)}），按 ESC 取消"
+            )
+    
+    def _finish(self, context, cancelled=False):
+        job = self._job
+        job.shutdown()
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+        
+        results = sorted(job.results, key=lambda result: self._order.get(result['path'], 0))
+        if results:
+            try:
+                write_mesh_file_report(results, self._report_path)
+            except OSError as e:
+                self.report({'ERROR'}, f"写出报告失败: {e}")
+                return {'CANCELLED'}
+        
+        message = f"已测量 {len(results)}/{job.total} 个文件，报告: {self._report_path}"
+        if job.failed:
+            message += f"（{job.failed} 个失败）"
+        if cancelled:
+            self.report({'WARNING'}, f"文件测量已取消，{message}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class OBJECT_OT_measure_animation(Operator):
+    """逐帧测量选中网格对象的尺寸、面积与体积"""
+    bl_idname = "object.measure_animation"
+    bl_label = "动画测量"
+    bl_description = "在帧范围内逐帧测量选中对象（评估网格）的长宽高、面积与体积，导出逐帧 CSV 与最小/最大值汇总，按 ESC 取消"
+    bl_options = {'REGISTER'}
+    
+    frame_start: IntProperty(name="起始帧", default=1)
+    frame_end: IntProperty(name="结束帧", default=250)
+    frame_step: IntProperty(name="步长", default=1, min=1)
+    filepath: StringProperty(
+        name="导出文件",
+        description="逐帧序列 CSV 路径（汇总写到同目录 *_summary.csv）；留空则只保留结果不导出",
+        default="//objectmeasure_animation.csv",
+        subtype='FILE_PATH'
+    )
+    
+    _timer = None
+    _job = None
+    
+    def invoke(self, context, event):
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def execute(self, context):
+        if np is None:
+            self.report({'ERROR'}, "动画测量需要 numpy")
+            return {'CANCELLED'}
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not objects:
+            self.report({'WARNING'}, "请选择至少一个网格对象")
+            return {'CANCELLED'}
+        frames = range(self.frame_start, self.frame_end + 1, self.frame_step)
+        if not frames:
+            self.report({'WARNING'}, "帧范围为空")
+            return {'CANCELLED'}
+        
+        self._job = AnimationMeasureJob(context.scene, objects, frames)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(MEASURE_JOB_TICK_SECONDS, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, self._job.total)
+        self._update_status(context)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self._finish(context, cancelled=True)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        self._job.step(context)
+        self._update_status(context)
+        if self._job.finished:
+            return self._finish(context)
+        return {'PASS_THROUGH'}
+    
+    def _update_status(self, context):
+        job = self._job
+        context.window_manager.progress_update(job.completed)
+        if context.workspace is not None:
+            context.workspace.status_text_set(f"动画测量: {job.completed}/{job.total} 帧，按 ESC 取消")
+    
+    def _finish(self, context, cancelled=False):
+        job = self._job
+        job.restore_frame()
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+        
+        animation_series.update(job.series)
+        series_list = [series for series in job.series.values() if len(series)]
+        message = f"已测量 {job.completed}/{job.total} 帧，{len(series_list)} 个对象"
+        skipped = sum(series.skipped for series in series_list)
+        if skipped:
+            message += f"（{skipped} 个对象帧几何未变化，沿用上一帧）"
+        if series_list and self.filepath:
+            report_path = bpy.path.abspath(self.filepath)
+            try:
+                summary_path = write_animation_report(series_list, report_path)
+            except OSError as e:
+                self.report({'ERROR'}, f"导出失败: {e}")
+                return {'CANCELLED'}
+            message += f"，已导出 {report_path} 与 {os.path.basename(summary_path)}"
+        if cancelled:
+            self.report({'WARNING'}, f"动画测量已取消，{message}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class OBJECT_OT_measure_collection(Operator):
+    """汇总集合（含集合实例）的总面积与体积"""
+    bl_idname = "object.measure_collection"
+    bl_label = "集合汇总"
+    bl_description = "遍历集合及其实例，唯一网格只计算一次，按材质与集合汇总世界空间面积与体积"
+    bl_options = {'REGISTER'}
+    
+    collection: StringProperty(name="集合", description="要汇总的集合")
+    
+    def invoke(self, context, event):
+        if not self.collection and context.collection is not None:
+            self.collection = context.collection.name
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def draw(self, context):
+        self.layout.prop_search(self, "collection", bpy.data, "collections")
+    
+    def execute(self, context):
+        global collection_aggregate
+        if np is None:
+            self.report({'ERROR'}, "集合汇总需要 numpy")
+            return {'CANCELLED'}
+        collection = bpy.data.collections.get(self.collection)
+        if collection is None:
+            self.report({'WARNING'}, "请选择有效的集合")
+            return {'CANCELLED'}
+        
+        result = measure_collection_aggregate(collection, context.evaluated_depsgraph_get())
+        if not result['instance_count']:
+            self.report({'WARNING'}, f"集合 {collection.name} 中没有可见的网格对象")
+            return {'CANCELLED'}
+        collection_aggregate = result
+        self.report({'INFO'}, (
+            f"{collection.name}: 面积 {result['total_area']:.4f} m²，体积 {result['total_volume']:.4f} m³"
+            f"（{result['instance_count']} 个实例，{result['unique_mesh_count']} 个唯一网格）"
+        ))
+        return {'FINISHED'}
+
+class OBJECT_OT_export_measurements(Operator):
+    """导出测量记录为 CSV"""
+    bl_idname = "object.export_measurements"
+    bl_label = "导出测量CSV"
+    bl_description = "把全部测量记录写入 CSV；带面积拆分的记录另写 _breakdown.csv"
+    bl_options = {'REGISTER'}
+    
+    filepath: StringProperty(name="文件路径", subtype='FILE_PATH', default="objectmeasure.csv")
+    filter_glob: StringProperty(default="*.csv", options={'HIDDEN'})
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        ensure_measurements_restored()
+        records = list(measurement_registry)
+        if not records:
+            self.report({'WARNING'}, "没有可导出的测量记录")
+            return {'CANCELLED'}
+        report_path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".csv")
+        try:
+            breakdown_path = write_measurement_report(records, report_path)
+        except OSError as e:
+            self.report({'ERROR'}, f"导出失败: {e}")
+            return {'CANCELLED'}
+        message = f"已导出 {len(records)} 条测量记录: {report_path}"
+        if breakdown_path:
+            message += f"，面积拆分: {breakdown_path}"
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+class OBJECT_OT_measure_clearance(Operator):
+    """检测选中网格对象两两之间的间隙与碰撞"""
+    bl_idname = "object.measure_clearance"
+    bl_label = "间隙检测"
+    bl_description = "以包围盒粗检测剔除远离的对象对，再用缓存的 BVH 求最近点距离与碰撞，并在视口中连线标注"
+    bl_options = {'REGISTER'}
+    
+    max_distance: FloatProperty(
+        name="检测距离",
+        description="只报告间距不超过该距离的对象对",
+        default=0.5,
+        min=0.0,
+        unit='LENGTH'
+    )
+    
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def execute(self, context):
+        global clearance_results
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if len(objects) < 2:
+            self.report({'WARNING'}, "请选择至少两个网格对象")
+            return {'CANCELLED'}
+        
+        result = measure_clearance(objects, self.max_distance, context.evaluated_depsgraph_get())
+        clearance_results = result
+        clearance_draw_handler.start()
+        _tag_view3d_redraw()
+        self.report({'INFO'}, (
+            f"{len(result['pairs'])} 对间距不超过 {self.max_distance:.4f} m，其中碰撞 {result['collision_count']} 对"
+            f"（粗检测保留 {result['candidate_count']} 对，耗时 {result['elapsed']:.3f}s）"
+        ))
+        return {'FINISHED'}
+
+class OBJECT_OT_clear_clearance(Operator):
+    """清除间隙检测结果"""
+    bl_idname = "object.clear_clearance"
+    bl_label = "清除间隙检测"
+    bl_options = {'REGISTER'}
     
     def execute(self, context):
-        global measurement_draw_handler, object_area_states, measurement_results
-        
-        # 获取选中的物体
-        selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
-        
-        if not selected_objects:
-            self.report({'WARNING'}, "请选择至少一个网格对象")
-            return {'CANCELLED'}
-        
-        refreshed_count = 0
-        
-        for obj in selected_objects:
-            obj_name = obj.name
-            
-            # 检查该物体是否有过期的面积数据
-            if obj_name not in object_area_states:
-                continue
-                
-            area_state = object_area_states[obj_name]
-            if area_state.get('state') != 'expired':
-                continue
-            
-            # 重新计算面积数据
-            new_dimensions = get_mesh_dimensions(obj)
-            if not new_dimensions:
-                continue
-            
-            # 更新测量结果中的面积数据
-            for measurement in measurement_results:
-                if measurement and measurement.get('name') == obj_name:
-                    # 更新面积数据
-                    measurement['dimensions']['area'] = new_dimensions['area']
-                    measurement['dimensions']['edges_data']['static_area'] = new_dimensions['area']
-                    measurement['dimensions']['edges_data']['area_info'] = new_dimensions['edges_data']['area_info']
-                    break
-            
-            # 获取当前的长宽高数据用于记录
-            current_bbox_corners = measurement_draw_handler.get_current_bbox_corners(obj, new_dimensions)
-            if current_bbox_corners:
-                current_dimensions = measurement_draw_handler.calculate_current_dimensions(
-                    current_bbox_corners, new_dimensions.get('edges_data', {})
-                )
-                current_length = current_dimensions.get('length', 0)
-                current_width = current_dimensions.get('width', 0)
-                current_height = current_dimensions.get('height', 0)
-            else:
-                current_length = new_dimensions.get('length', 0)
-                current_width = new_dimensions.get('width', 0)
-                current_height = new_dimensions.get('height', 0)
-            
-            # 更新面积状态记录
-            object_area_states[obj_name] = {
-                'current_area': new_dimensions['area'],
-                'recorded_length': current_length,
-                'recorded_width': current_width,
-                'recorded_height': current_height,
-                'is_expired': False,
-                'state': 'current'  # 设置为当前状态，表示面积数据有效
-            }
-            
-            refreshed_count += 1
-        
-        # 清除缓存
-        if measurement_draw_handler:
-            measurement_draw_handler.clear_cache()
-        
-        if refreshed_count > 0:
-            self.report({'INFO'}, f"已刷新 {refreshed_count} 个物体的面积数据")
-        else:
-            self.report({'INFO'}, "没有找到需要刷新的过期面积数据")
-        
-        # 刷新界面
-        context.area.tag_redraw()
-        
+        global clearance_results
+        clearance_results = None
+        clearance_draw_handler.stop()
+        _tag_view3d_redraw()
         return {'FINISHED'}
 
 def _ensure_collection(collection_name: str):
@@ -1528,38 +5895,114 @@ def _ensure_principled_gray_alpha_material(mat_name: str, alpha: float = 1.0):
         pass
     return mat
 
-def _ensure_bold_font_datablock():
-    """确保加载并返回一个粗体字体(Font)数据块。
+FONT_CANDIDATE_PATHS = [
+    r"C:\\Windows\\Fonts\\msyhbd.ttc",   # 微软雅黑 粗体（若存在）
+    r"C:\\Windows\\Fonts\\simhei.ttf",   # 黑体
+    r"C:\\Windows\\Fonts\\arialbd.ttf", # Arial Bold
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/liberation-sans/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/Library/Fonts/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+]
 
-    优先尝试常见的 Windows 粗体字体；若 `bpy.ops.font.open` 失败，则回退到 `bpy.data.fonts.load`。
-    返回可直接赋给 `Curve.font`/`Curve.font_bold` 的 Font 对象；失败返回 None。
+class AnnotationDatablockPool:
     """
-    candidate_paths = [
-        r"C:\\Windows\\Fonts\\msyhbd.ttc",   # 微软雅黑 粗体（若存在）
-        r"C:\\Windows\\Fonts\\simhei.ttf",   # 黑体
-        r"C:\\Windows\\Fonts\\arialbd.ttf", # Arial Bold
-    ]
-    for path in candidate_paths:
-        if not os.path.exists(path):
-            continue
-        # 优先通过 ops 载入（满足用户“使用 bpy.ops.font.open()”的需求）
-        try:
-            bpy.ops.font.open(filepath=path)
-        except Exception:
-            pass
-        # 在已载入字体中查找同一路径的 Font
+    烘焙会话内共享的材质/字体数据块池
+    
+    - 材质按 (颜色, 强度) 复用，同色标注共用一个材质（AF_Mat_<RRGGBBAA>_<强度>）
+    - 字体按路径复用，每个会话只解析一次（自定义路径优先，其次 Windows/Linux/macOS 常见粗体字体）
+    """
+    
+    def __init__(self):
+        self.materials = {}
+        self.fonts = {}
+        self.font_path = ""
+        self._font_resolved = False
+        self._font = None
+    
+    def begin_session(self, scene=None):
+        """开始一次烘焙：清空会话缓存并读取设置中的字体路径"""
+        self.materials.clear()
+        self._font_resolved = False
+        self._font = None
+        settings = getattr(scene, "object_measure_settings", None) if scene is not None else None
+        self.font_path = bpy.path.abspath(settings.annotation_font_path) if settings is not None and settings.annotation_font_path else ""
+    
+    @staticmethod
+    def _alive(datablock):
         try:
-            for f in bpy.data.fonts:
-                if getattr(f, 'filepath', None) and os.path.normcase(os.path.abspath(f.filepath)) == os.path.normcase(os.path.abspath(path)):
-                    return f
-        except Exception:
-            pass
-        # 回退直接 load
+            return datablock is not None and datablock.name is not None
+        except ReferenceError:
+            return False
+    
+    def material(self, color=(1.0, 1.0, 1.0, 1.0), strength=3.0):
+        """按 (颜色, 强度) 取共享材质"""
+        col = tuple(color) if len(color) == 4 else (color[0], color[1], color[2], 1.0)
+        key = (tuple(round(c, 4) for c in col), round(float(strength), 4))
+        mat = self.materials.get(key)
+        if mat is None or not self._alive(mat):
+            hex_color = "".join(f"{max(0, min(255, int(round(c * 255)))):02X}" for c in col)
+            mat = _ensure_emission_material(f"AF_Mat_{hex_color}_{key[1]:g}", color=col, strength=strength)
+            self.materials[key] = mat
+        return mat
+    
+    def box_material(self, alpha=1.0):
+        """包围盒方体共享的灰色材质"""
+        key = ('bbox', round(float(alpha), 4))
+        mat = self.materials.get(key)
+        if mat is None or not self._alive(mat):
+            mat = _ensure_principled_gray_alpha_material(f"AF_Mat_BBox_{key[1]:g}", alpha=alpha)
+            self.materials[key] = mat
+        return mat
+    
+    def font_for_path(self, path):
+        """按路径取字体数据块（check_existing 复用已加载字体，不调用操作符）"""
+        key = os.path.normcase(os.path.abspath(path))
+        font = self.fonts.get(key)
+        if font is not None and self._alive(font):
+            return font
         try:
-            return bpy.data.fonts.load(path)
+            font = bpy.data.fonts.load(path, check_existing=True)
         except Exception:
-            pass
-    return None
+            return None
+        self.fonts[key] = font
+        return font
+    
+    def font(self):
+        """本次会话的标注字体；无可用字体返回 None（使用 Blender 内置字体）"""
+        if self._font_resolved and (self._font is None or self._alive(self._font)):
+            return self._font
+        self._font = None
+        candidates = [self.font_path] if self.font_path else []
+        for path in candidates + FONT_CANDIDATE_PATHS:
+            if path and os.path.exists(path):
+                self._font = self.font_for_path(path)
+                if self._font is not None:
+                    break
+        self._font_resolved = True
+        return self._font
+    
+    def clear(self):
+        self.materials.clear()
+        self.fonts.clear()
+        self._font_resolved = False
+        self._font = None
+
+annotation_datablock_pool = AnnotationDatablockPool()
+
+def _ensure_bold_font_datablock():
+    """确保加载并返回一个粗体字体(Font)数据块。
+
+    由数据块池解析：优先设置中的自定义字体路径，其次 Windows/Linux/macOS 常见粗体字体，
+    以 `bpy.data.fonts.load(check_existing=True)` 载入，同一会话内只解析一次。
+    返回可直接赋给 `Curve.font`/`Curve.font_bold` 的 Font 对象；失败返回 None。
+    """
+    return annotation_datablock_pool.font()
 
 def _create_curve_segment(obj_name: str, start, end, color=(1.0, 1.0, 1.0, 1.0), bevel: float = 0.003):
     """创建一条两点的3D曲线线段，并附加发光材质。"""
@@ -1572,8 +6015,7 @@ def _create_curve_segment(obj_name: str, start, end, color=(1.0, 1.0, 1.0, 1.0),
     crv.bevel_depth = bevel
 
     obj = bpy.data.objects.new(obj_name, crv)
-    mat = _ensure_emission_material(f"Mat_{obj_name}", color=color, strength=3.0)
-    obj.data.materials.append(mat)
+    obj.data.materials.append(annotation_datablock_pool.material(color, 3.0))
     return obj
 
 def _create_text_label(obj_name: str, text: str, location, color=(1.0, 1.0, 1.0, 1.0), size: float = 0.2, face_camera: bool = True):
@@ -1581,7 +6023,7 @@ def _create_text_label(obj_name: str, text: str, location, color=(1.0, 1.0, 1.0,
     cu = bpy.data.curves.new(name=obj_name, type='FONT')
     cu.body = text
     cu.size = size
-    # 使用粗体字体：通过 bpy.ops.font.open 加载常见粗体字形，并赋给 font/font_bold
+    # 使用粗体字体：由数据块池解析（会话内只载入一次），并赋给 font/font_bold
     try:
         bold_font = _ensure_bold_font_datablock()
         if bold_font is not None:
@@ -1606,8 +6048,7 @@ def _create_text_label(obj_name: str, text: str, location, color=(1.0, 1.0, 1.0,
         pass
     obj = bpy.data.objects.new(obj_name, cu)
     obj.location = location
-    mat = _ensure_emission_material(f"Mat_{obj_name}", color=color)
-    obj.data.materials.append(mat)
+    obj.data.materials.append(annotation_datablock_pool.material(color, 3.0))
     if face_camera:
         try:
             _attach_face_camera_geonodes(
@@ -1852,6 +6293,451 @@ def _attach_face_camera_geonodes(text_obj, camera_obj, axis: str = 'Z'):
     except Exception:
         pass
 
+# ==================== 包围盒方体批量构建 ====================
+
+# 六个四边面，角点顺序满足 (c1-c0)×(c3-c0)·(c4-c0) > 0 时法线朝外；行列式为负（镜像）时整体反向
+BBOX_FACES_POSITIVE = (
+    (0, 3, 2, 1),  # 底面
+    (4, 5, 6, 7),  # 顶面
+    (0, 1, 5, 4),  # 侧面1
+    (1, 2, 6, 5),  # 侧面2
+    (2, 3, 7, 6),  # 侧面3
+    (3, 0, 4, 7),  # 侧面4
+)
+BBOX_LOOPS_POSITIVE = array.array('i', [v for face in BBOX_FACES_POSITIVE for v in face])
+BBOX_LOOPS_NEGATIVE = array.array('i', [v for face in BBOX_FACES_POSITIVE for v in (face[0], face[3], face[2], face[1])])
+BBOX_LOOP_STARTS = array.array('i', range(0, 24, 4))
+BBOX_LOOP_TOTALS = array.array('i', [4] * 6)
+
+def bbox_winding_positive(corners):
+    """由角点标架的行列式判断绕序：>= 0 使用正向面表，否则（镜像）使用反向面表"""
+    return (corners[1] - corners[0]).cross(corners[3] - corners[0]).dot(corners[4] - corners[0]) >= 0.0
+
+def build_bbox_meshes(entries):
+    """
+    批量创建包围盒方体网格：全部角点一次写入预分配数组，每个网格以 foreach_set 写入顶点/环/面，
+    绕序由行列式解析得出，不做 from_pydata/validate 与 bmesh 法线重算
+    
+    Args:
+        entries: [(网格名, 8 个世界空间角点)]
+        
+    Returns:
+        list: 与 entries 对应的 Mesh
+    """
+    count = len(entries)
+    co = array.array('f', bytes(4 * 24 * count))
+    for k, (_, corners) in enumerate(entries):
+        base = 24 * k
+        for i, corner in enumerate(corners):
+            co[base + 3 * i:base + 3 * i + 3] = array.array('f', corner[:])
+    
+    set_loop_total = not bpy.types.MeshPolygon.bl_rna.properties['loop_total'].is_readonly
+    view = memoryview(co)
+    meshes = []
+    for k, (name, corners) in enumerate(entries):
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(8)
+        mesh.loops.add(24)
+        mesh.polygons.add(6)
+        mesh.vertices.foreach_set("co", view[24 * k:24 * (k + 1)])
+        mesh.loops.foreach_set("vertex_index", BBOX_LOOPS_POSITIVE if bbox_winding_positive(corners) else BBOX_LOOPS_NEGATIVE)
+        mesh.polygons.foreach_set("loop_start", BBOX_LOOP_STARTS)
+        if set_loop_total:
+            mesh.polygons.foreach_set("loop_total", BBOX_LOOP_TOTALS)
+        mesh.update(calc_edges=True)
+        meshes.append(mesh)
+    return meshes
+
+# ==================== 实例化标注烘焙（单一几何节点对象） ====================
+
+ANNOTATION_GLYPHS = "0123456789.-+:LWHXYZm"  # 实例化标注使用的字形（标注文本只含这些字符与空格）
+ANNOTATION_GLYPH_COLLECTION = "AF_AnnotationGlyphs"
+ANNOTATION_NODE_GROUP = "AF_InstancedAnnotations"
+ANNOTATION_TEXT_MATERIAL = "AF_AnnotationText"
+ANNOTATION_LINE_MATERIAL = "AF_AnnotationLine"
+ANNOTATION_BAKED_PREFIX = "Annot_Baked_"
+ANNOTATION_LETTER_SPACING = 0.08  # 字间距（字号的比例）
+ANNOTATION_SPACE_ADVANCE = 0.3  # 空格宽度（字号的比例）
+ANNOTATION_TEXT_SCALE = 2.5  # 烘焙字号 = 操作符“文字大小” × 该系数（逐对象与实例化两种模式一致）
+
+def _ensure_annotation_materials():
+    """共享材质：文本读取实例属性 af_color（Instancer），线框读取几何属性 af_color"""
+    materials = []
+    for name, attribute_type in ((ANNOTATION_TEXT_MATERIAL, 'INSTANCER'), (ANNOTATION_LINE_MATERIAL, 'GEOMETRY')):
+        mat = bpy.data.materials.get(name)
+        if mat is None:
+            mat = bpy.data.materials.new(name)
+            mat.use_nodes = True
+            nodes = mat.node_tree.nodes
+            links = mat.node_tree.links
+            for n in list(nodes):
+                nodes.remove(n)
+            out = nodes.new("ShaderNodeOutputMaterial")
+            attr = nodes.new("ShaderNodeAttribute")
+            attr.attribute_type = attribute_type
+            attr.attribute_name = "af_color"
+            emit = nodes.new("ShaderNodeEmission")
+            links.new(attr.outputs["Color"], emit.inputs["Color"])
+            links.new(emit.outputs["Emission"], out.inputs["Surface"])
+        materials.append(mat)
+    return materials
+
+def _ensure_annotation_glyphs():
+    """
+    字形集合：ANNOTATION_GLYPHS 中每个字符一个网格对象（字号 1，左对齐、垂直居中）
+    集合上记录生成时的字体路径，只在首次或设置中的字体改变后重建
+    对象按 AF_Glyph_00.. 命名，保证集合信息节点拆分子项后的顺序与字形索引一致
+    
+    Returns:
+        (集合, [每个字形的宽度])
+    """
+    font_path = annotation_datablock_pool.font_path
+    coll = bpy.data.collections.get(ANNOTATION_GLYPH_COLLECTION)
+    if (coll is not None and len(coll.objects) == len(ANNOTATION_GLYPHS) and 'af_advances' in coll
+            and coll.get('af_font_path', "") == font_path):
+        return coll, list(coll['af_advances'])
+    if coll is None:
+        coll = bpy.data.collections.new(ANNOTATION_GLYPH_COLLECTION)
+    for obj in list(coll.objects):
+        mesh = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+    
+    text_material = _ensure_annotation_materials()[0]
+    font = _ensure_bold_font_datablock()
+    scene_collection = bpy.context.scene.collection
+    temporaries = []
+    for index, char in enumerate(ANNOTATION_GLYPHS):
+        curve = bpy.data.curves.new(f"AF_GlyphCurve_{index:02d}", type='FONT')
+        curve.body = char
+        curve.size = 1.0
+        curve.align_x = 'LEFT'
+        curve.align_y = 'CENTER'
+        if font is not None:
+            curve.font = font
+        temp = bpy.data.objects.new(f"AF_GlyphTemp_{index:02d}", curve)
+        scene_collection.objects.link(temp)
+        temporaries.append(temp)
+    
+    # 一次 depsgraph 更新后把全部字形转为网格
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    advances = []
+    for index, temp in enumerate(temporaries):
+        mesh = bpy.data.meshes.new_from_object(temp.evaluated_get(depsgraph))
+        mesh.name = f"AF_Glyph_{index:02d}"
+        mesh.materials.append(text_material)
+        xs = [v.co.x for v in mesh.vertices]
+        advances.append(max(xs) if xs else ANNOTATION_SPACE_ADVANCE)
+        coll.objects.link(bpy.data.objects.new(f"AF_Glyph_{index:02d}", mesh))
+        curve = temp.data
+        bpy.data.objects.remove(temp, do_unlink=True)
+        bpy.data.curves.remove(curve)
+    coll['af_advances'] = advances
+    coll['af_font_path'] = font_path
+    return coll, advances
+
+def _ensure_instanced_annotation_node_group():
+    """
+    共享几何节点组 AF_InstancedAnnotations
+    
+    - af_is_label 为真的点：在点上按 af_glyph 从字形集合选取实例，旋转取活动相机朝向，
+      缩放为 af_size，再在实例局部空间平移 af_offset 排出字符
+    - 其余几何（包围盒边）：网格转曲线，以 Line Radius 为半径扫掠成管
+    """
+    ng = bpy.data.node_groups.get(ANNOTATION_NODE_GROUP)
+    if ng is not None and ng.bl_idname == 'GeometryNodeTree':
+        return ng
+    ng = bpy.data.node_groups.new(ANNOTATION_NODE_GROUP, 'GeometryNodeTree')
+    glyphs, _ = _ensure_annotation_glyphs()
+    text_material, line_material = _ensure_annotation_materials()
+    
+    iface = ng.interface
+    iface.new_socket(name='Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+    radius_socket = iface.new_socket(name='Line Radius', in_out='INPUT', socket_type='NodeSocketFloat')
+    radius_socket.default_value = 0.01
+    iface.new_socket(name='Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    
+    nodes = ng.nodes
+    links = ng.links
+    n_in = nodes.new('NodeGroupInput')
+    n_out = nodes.new('NodeGroupOutput')
+    
+    def named_attribute(name, data_type):
+        node = nodes.new('GeometryNodeInputNamedAttribute')
+        node.data_type = data_type
+        node.inputs['Name'].default_value = name
+        return node.outputs['Attribute']
+    
+    separate = nodes.new('GeometryNodeSeparateGeometry')
+    separate.domain = 'POINT'
+    links.new(n_in.outputs['Geometry'], separate.inputs['Geometry'])
+    links.new(named_attribute('af_is_label', 'BOOLEAN'), separate.inputs['Selection'])
+    
+    # 文本：字形实例
+    collection_info = nodes.new('GeometryNodeCollectionInfo')
+    collection_info.transform_space = 'ORIGINAL'
+    collection_info.inputs['Collection'].default_value = glyphs
+    collection_info.inputs['Separate Children'].default_value = True
+    collection_info.inputs['Reset Children'].default_value = True
+    
+    camera_info = nodes.new('GeometryNodeObjectInfo')
+    camera_info.transform_space = 'ORIGINAL'
+    active_camera = None
+    for type_name in ('GeometryNodeInputActiveCamera', 'GeometryNodeInputSceneCamera'):
+        try:
+            active_camera = nodes.new(type_name)
+            break
+        except Exception:
+            active_camera = None
+    if active_camera is not None:
+        links.new(active_camera.outputs[0], camera_info.inputs['Object'])
+    else:
+        camera_info.inputs['Object'].default_value = bpy.context.scene.camera
+    
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    links.new(separate.outputs['Selection'], instance.inputs['Points'])
+    links.new(collection_info.outputs[0], instance.inputs['Instance'])
+    instance.inputs['Pick Instance'].default_value = True
+    links.new(named_attribute('af_glyph', 'INT'), instance.inputs['Instance Index'])
+    links.new(camera_info.outputs['Rotation'], instance.inputs['Rotation'])
+    links.new(named_attribute('af_size', 'FLOAT'), instance.inputs['Scale'])
+    
+    translate = nodes.new('GeometryNodeTranslateInstances')
+    links.new(instance.outputs['Instances'], translate.inputs['Instances'])
+    links.new(named_attribute('af_offset', 'FLOAT_VECTOR'), translate.inputs['Translation'])
+    translate.inputs['Local Space'].default_value = True
+    
+    # 线框：包围盒边扫掠成管
+    to_curve = nodes.new('GeometryNodeMeshToCurve')
+    links.new(separate.outputs['Inverted'], to_curve.inputs['Mesh'])
+    profile = nodes.new('GeometryNodeCurvePrimitiveCircle')
+    profile.inputs['Resolution'].default_value = 6
+    links.new(n_in.outputs['Line Radius'], profile.inputs['Radius'])
+    to_mesh = nodes.new('GeometryNodeCurveToMesh')
+    links.new(to_curve.outputs['Curve'], to_mesh.inputs['Curve'])
+    links.new(profile.outputs['Curve'], to_mesh.inputs['Profile Curve'])
+    set_material = nodes.new('GeometryNodeSetMaterial')
+    set_material.inputs['Material'].default_value = line_material
+    links.new(to_mesh.outputs['Mesh'], set_material.inputs['Geometry'])
+    
+    join = nodes.new('GeometryNodeJoinGeometry')
+    links.new(set_material.outputs['Geometry'], join.inputs['Geometry'])
+    links.new(translate.outputs['Instances'], join.inputs['Geometry'])
+    links.new(join.outputs['Geometry'], n_out.inputs['Geometry'])
+    return ng
+
+class InstancedAnnotationBuffer:
+    """一个集合的烘焙标注数据：包围盒角点与边、每个字符一个点（带字形/偏移/尺寸/颜色属性）"""
+    
+    def __init__(self, advances):
+        self.advances = advances
+        self.co = array.array('f')
+        self.edges = array.array('i')
+        self.is_label = array.array('b')
+        self.glyph = array.array('i')
+        self.size = array.array('f')
+        self.offset = array.array('f')
+        self.color = array.array('f')
+        self.sources = []
+    
+    @property
+    def point_count(self):
+        return len(self.is_label)
+    
+    def _add_point(self, co, is_label, glyph, size, offset_x, color):
+        self.co.extend(co)
+        self.is_label.append(is_label)
+        self.glyph.append(glyph)
+        self.size.append(size)
+        self.offset.extend((offset_x, 0.0, 0.0))
+        self.color.extend(color)
+    
+    def add_box(self, corners, color=(0.8, 0.8, 0.8, 1.0)):
+        base = self.point_count
+        for corner in corners:
+            self._add_point(corner[:], 0, -1, 0.0, 0.0, color)
+        for a, b in EDGES:
+            self.edges.extend((base + a, base + b))
+    
+    def add_label(self, text, location, size, color):
+        """按字形宽度排出字符（以标注中心对齐），每个字符一个点"""
+        xs = []
+        x = 0.0
+        for char in text:
+            index = ANNOTATION_GLYPHS.find(char)
+            xs.append((index, x))
+            x += (self.advances[index] if index >= 0 else ANNOTATION_SPACE_ADVANCE) + ANNOTATION_LETTER_SPACING
+        center = (x - ANNOTATION_LETTER_SPACING) / 2.0
+        for index, offset in xs:
+            if index >= 0:
+                self._add_point(location[:], 1, index, size, offset - center, color)
+    
+    def write_mesh(self, mesh):
+        """以 foreach_set 一次写入全部顶点、边与属性"""
+        mesh.clear_geometry()
+        mesh.vertices.add(self.point_count)
+        mesh.vertices.foreach_set("co", self.co)
+        mesh.edges.add(len(self.edges) // 2)
+        mesh.edges.foreach_set("vertices", self.edges)
+        for name, data_type, values, key in (
+            ('af_is_label', 'BOOLEAN', [bool(v) for v in self.is_label], "value"),
+            ('af_glyph', 'INT', self.glyph, "value"),
+            ('af_size', 'FLOAT', self.size, "value"),
+            ('af_offset', 'FLOAT_VECTOR', self.offset, "vector"),
+            ('af_color', 'FLOAT_COLOR', self.color, "color"),
+        ):
+            attribute = mesh.attributes.get(name) or mesh.attributes.new(name, data_type, 'POINT')
+            attribute.data.foreach_set(key, values)
+        mesh.update()
+
+def bake_instanced_annotations(items, text_size=0.5, line_radius=0.01):
+    """
+    把已测量对象的包围盒与标注写入每个集合一个对象（Annot_Baked_<集合>），由共享节点组实例化字形
+    每个对象只追加数组数据，数据块数量与对象数无关
+    
+    Args:
+        items: [(对象, 世界角点, 当前尺寸, (长度边, 宽度边, 高度边))]
+        
+    Returns:
+        list: 生成/更新的烘焙对象
+    """
+    _, advances = _ensure_annotation_glyphs()
+    node_group = _ensure_instanced_annotation_node_group()
+    text_size = float(text_size) * ANNOTATION_TEXT_SCALE
+    
+    buffers = {}
+    for obj, corners, dims, (le, we, he) in items:
+        coll = obj.users_collection[0] if obj.users_collection else bpy.context.scene.collection
+        buffer = buffers.get(coll.name)
+        if buffer is None:
+            buffer = buffers[coll.name] = InstancedAnnotationBuffer(advances)
+        buffer.add_box(corners)
+        for letter, color, value, _, i, j in _dimension_label_specs(corners, dims, le, we, he):
+            buffer.add_label(f"{letter}: {value:.2f}m", (corners[i] + corners[j]) / 2, text_size, color)
+        for lab, center in _face_direction_label_specs(obj, corners):
+            buffer.add_label(lab, center, text_size, (1.0, 1.0, 1.0, 1.0))
+        buffer.sources.append(obj.name)
+    
+    baked = []
+    for coll_name, buffer in buffers.items():
+        coll = bpy.data.collections.get(coll_name) or bpy.context.scene.collection
+        name = f"{ANNOTATION_BAKED_PREFIX}{coll_name}"
+        baked_obj = bpy.data.objects.get(name)
+        if baked_obj is None or baked_obj.type != 'MESH':
+            baked_obj = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+            coll.objects.link(baked_obj)
+        buffer.write_mesh(baked_obj.data)
+        baked_obj["af_sources"] = buffer.sources
+        
+        modifier = baked_obj.modifiers.get(ANNOTATION_NODE_GROUP)
+        if modifier is None:
+            modifier = baked_obj.modifiers.new(name=ANNOTATION_NODE_GROUP, type='NODES')
+        modifier.node_group = node_group
+        for item in node_group.interface.items_tree:
+            if getattr(item, 'in_out', None) == 'INPUT' and item.name == 'Line Radius':
+                modifier[item.identifier] = float(line_radius)
+        baked.append(baked_obj)
+    return baked
+
+def find_instanced_annotation_objects(source_names):
+    """包含任一源对象的实例化烘焙对象"""
+    source_names = set(source_names)
+    return [
+        obj for obj in bpy.data.objects
+        if obj.name.startswith(ANNOTATION_BAKED_PREFIX) and source_names.intersection(obj.get("af_sources", ()))
+    ]
+
+def _dimension_label_specs(corners, dims, le, we, he):
+    """
+    长宽高标注：对 L/W/H 三组平行边的每条边给出一项
+    
+    Returns:
+        list: [(字母, 颜色, 数值, 中文名, 角点i, 角点j)]
+    """
+    all_edges = build_all_edges(corners)
+    parallel_groups = group_parallel_edges(all_edges)
+    specs = []
+    for group in parallel_groups:
+        edge_indices_list = [ei for (ei, _) in group]
+        if le in edge_indices_list:
+            letter, color, value, cname = 'L', (1.0, 0.0, 0.0, 1.0), dims.get('length', 0.0), '长度'
+        elif we in edge_indices_list:
+            letter, color, value, cname = 'W', (0.0, 1.0, 0.0, 1.0), dims.get('width', 0.0), '宽度'
+        elif he in edge_indices_list:
+            letter, color, value, cname = 'H', (0.0, 0.0, 1.0, 1.0), dims.get('height', 0.0), '高度'
+        else:
+            continue
+        for (i, j), _ in group:
+            specs.append((letter, color, value, cname, i, j))
+    return specs
+
+def _face_direction_label_specs(obj, corners):
+    """
+    六面方向标注：按对象局部 ±X/±Y/±Z 在世界中的方向，为每个方向选择法线最对齐的包围盒面
+    
+    Returns:
+        list: [(标签, 面中心)]
+    """
+    face_defs = [
+        (0, 1, 2, 3),  # 底面
+        (4, 5, 6, 7),  # 顶面
+        (0, 1, 5, 4),  # 侧面1
+        (1, 2, 6, 5),  # 侧面2
+        (2, 3, 7, 6),  # 侧面3
+        (3, 0, 4, 7),  # 侧面4
+    ]
+
+    # 盒心（用于将法线统一为外向）
+    bbox_center = sum(corners, Vector((0.0, 0.0, 0.0))) / 8.0
+
+    face_centers = []
+    face_normals = []
+    for a, b, c, d in face_defs:
+        v0, v1, v2, v3 = corners[a], corners[b], corners[c], corners[d]
+        center = (v0 + v1 + v2 + v3) / 4
+        n = (v1 - v0).cross(v2 - v0)
+        if n.length > 0:
+            n.normalize()
+        # 保证外向
+        if (center - bbox_center).dot(n) < 0:
+            n = -n
+        face_centers.append(center)
+        face_normals.append(n)
+
+    # 对象局部坐标轴在世界空间的方向
+    local_to_world = obj.matrix_world.to_3x3()
+    x_axis = (local_to_world @ Vector((1.0, 0.0, 0.0))).normalized()
+    y_axis = (local_to_world @ Vector((0.0, 1.0, 0.0))).normalized()
+    z_axis = (local_to_world @ Vector((0.0, 0.0, 1.0))).normalized()
+
+    axis_map = {
+        "+X": x_axis,
+        "-X": -x_axis,
+        "+Y": y_axis,
+        "-Y": -y_axis,
+        "+Z": z_axis,
+        "-Z": -z_axis,
+    }
+
+    # 为每个标签选择与其轴向最对齐的面；去重：避免极端情况下同一面被分配给两个标签
+    specs = []
+    used = set()
+    for lab, axis_vec in axis_map.items():
+        best_i = -1
+        best_dot = -1.0
+        for i, n in enumerate(face_normals):
+            d = n.dot(axis_vec)
+            if d > best_dot:
+                best_dot = d
+                best_i = i
+        # 若已被占用，跳过（理论上不会在正交盒发生）
+        if best_i < 0 or best_i in used:
+            continue
+        used.add(best_i)
+        specs.append((lab, face_centers[best_i]))
+    return specs
+
 class OBJECT_OT_bake_annotation_curves(Operator):
     """将当前选中物体的边界框烘焙为对应方体网格，便于渲染/导出"""
     bl_idname = "object.bake_annotation_curves"
@@ -1902,33 +6788,59 @@ class OBJECT_OT_bake_annotation_curves(Operator):
         min=0.0,
         max=1.0
     )
+
+    bake_mode: bpy.props.EnumProperty(
+        name="烘焙方式",
+        description="逐对象生成曲线/文本对象，或每个集合一个几何节点实例化对象",
+        items=[
+            ('OBJECTS', "逐对象", "每个测量对象生成独立的曲线与文本对象"),
+            ('INSTANCED', "实例化", "每个集合一个网格对象，字形与线框由共享几何节点组实例化"),
+        ],
+        default='OBJECTS'
+    )
     
     def execute(self, context):
-        global measurement_results, measurement_draw_handler
+        global measurement_draw_handler
 
         # 如果还没有测量数据，则先对选中对象执行一次测量
-        if not measurement_results:
+        if not measurement_registry:
             bpy.ops.object.measure_mesh('INVOKE_DEFAULT')
-            if not measurement_results:
+            if not measurement_registry:
                 self.report({'WARNING'}, "没有可烘焙的标注数据")
             return {'CANCELLED'}
         
+        # 本次烘焙共享材质与字体数据块
+        annotation_datablock_pool.begin_session(context.scene)
+        
+        if self.bake_mode == 'INSTANCED':
+            return self._bake_instanced(context)
+        
         # 改为：将烘焙对象链接到源对象所在的集合中（若无则退回到场景根集合）
 
-        baked_count = 0
-        for item in measurement_results:
-            obj = bpy.data.objects.get(item.get('name'))
+        bake_start = time.perf_counter()
+        pending = []
+        for item in measurement_registry:
+            obj = measurement_registry.resolve(item)
             if obj is None or obj.type != 'MESH':
                 continue
 
             # 获取动态边界框与最终三边
-            corners = measurement_draw_handler.get_current_bbox_corners(obj, item['dimensions'])
+            corners = measurement_draw_handler.get_current_bbox_corners(obj)
             if not corners:
                 continue
 
             dims = measurement_draw_handler.calculate_current_dimensions(
-                corners, item['dimensions'].get('edges_data', {})
+                corners, item.edges_data
             )
+            pending.append((obj, corners, dims))
+
+        # 一次性批量构建全部包围盒方体网格
+        mesh_start = time.perf_counter()
+        bbox_meshes = build_bbox_meshes([(f"{obj.name}_bbox_mesh", corners) for obj, corners, _ in pending])
+        mesh_time = time.perf_counter() - mesh_start
+
+        baked_count = 0
+        for (obj, corners, dims), mesh in zip(pending, bbox_meshes):
             final_edges = dims.get('final_edges', {})
             le = final_edges.get('length_edge_indices', (0, 1))
             we = final_edges.get('width_edge_indices', (1, 2))
@@ -1967,60 +6879,13 @@ class OBJECT_OT_bake_annotation_curves(Operator):
             except Exception:
                 pass
 
-            # 使用当前 world 空间 8 个角点创建方体网格
+            # 方体网格已由 build_bbox_meshes 批量生成
             try:
-                mesh = bpy.data.meshes.new(f"{obj.name}_bbox_mesh")
-                verts = [(v.x, v.y, v.z) for v in corners]
-                faces = [
-                    (0, 1, 2, 3),  # 底面
-                    (4, 5, 6, 7),  # 顶面
-                    (0, 1, 5, 4),  # 侧面1
-                    (1, 2, 6, 5),  # 侧面2
-                    (2, 3, 7, 6),  # 侧面3
-                    (3, 0, 4, 7)   # 侧面4
-                ]
-                mesh.from_pydata(verts, [], faces)
-                try:
-                    mesh.validate(clean_customdata=True)
-                except Exception:
-                    pass
-                mesh.update()
-                
-                # 统一并校正法线朝向：确保六个四边面法线朝外
-                try:
-                    bm = bmesh.new()
-                    bm.from_mesh(mesh)
-                    # 先计算一致法线
-                    bmesh.ops.recalc_face_normals(bm, faces=bm.faces[:])
-                    bm.normal_update()
-                    # 判断整体朝向是否内翻：若面法线与(面心-网格中心)的点积累计为负，则整体反转
-                    if len(bm.verts) > 0 and len(bm.faces) > 0:
-                        center = Vector((0.0, 0.0, 0.0))
-                        for v in bm.verts:
-                            center += v.co
-                        center /= len(bm.verts)
-                        acc = 0.0
-                        for f in bm.faces:
-                            fc = f.calc_center_median()
-                            acc += f.normal.dot(fc - center)
-                        if acc < 0.0:
-                            try:
-                                bmesh.ops.reverse_faces(bm, faces=bm.faces[:])
-                            except Exception:
-                                for f in bm.faces:
-                                    f.normal_flip()
-                    bm.normal_update()
-                    bm.to_mesh(mesh)
-                    bm.free()
-                except Exception:
-                    pass
-
                 bbox_obj = bpy.data.objects.new(f"{obj.name}_bbox", mesh)
 
                 # 赋予灰色原理化BSDF，Alpha=1
                 try:
-                    mat = _ensure_principled_gray_alpha_material(f"Mat_BBox_{obj.name}", alpha=1.0)
-                    bbox_obj.data.materials.append(mat)
+                    bbox_obj.data.materials.append(annotation_datablock_pool.box_material(alpha=1.0))
                 except Exception:
                     pass
 
@@ -2058,130 +6923,49 @@ class OBJECT_OT_bake_annotation_curves(Operator):
 
                 # 为所有平行边创建对应的 L/W/H 文本，放置在每条边的中点
                 try:
-                    all_edges = build_all_edges(corners)
-                    parallel_groups = group_parallel_edges(all_edges)
-                    # 找到与 L/W/H 三组对应的分组索引
-                    group_map = {}
-                    for gi, group in enumerate(parallel_groups):
-                        edge_indices_list = [ei for (ei, _) in group]
-                        if le in edge_indices_list:
-                            group_map[gi] = ('L', (1.0, 0.0, 0.0, 1.0), dims.get('length', 0.0), '长度')
-                        elif we in edge_indices_list:
-                            group_map[gi] = ('W', (0.0, 1.0, 0.0, 1.0), dims.get('width', 0.0), '宽度')
-                        elif he in edge_indices_list:
-                            group_map[gi] = ('H', (0.0, 0.0, 1.0, 1.0), dims.get('height', 0.0), '高度')
-                    # 遍历三组并在每条边中点生成对应文本
-                    for gi, group in enumerate(parallel_groups):
-                        if gi not in group_map:
-                            continue
-                        letter, color, value, cname = group_map[gi]
-                        for (edge_indices, _) in group:
-                            i, j = edge_indices
-                            mid = (corners[i] + corners[j]) / 2
-                            label = f"{letter}({cname}): {value:.2f}m"
-                            txt = _create_text_label(
-                                f"{obj.name}_{letter}_{i}_{j}",
-                                label,
-                                mid,
-                                color=color,
-                                size=float(self.text_size) * 2.5,
-                                face_camera=bool(self.text_face_camera)
-                            )
-                            for coll in src_colls:
-                                try:
-                                    coll.objects.link(txt)
-                                except Exception:
-                                    pass
-                            txt.parent = root
-                            # 若尚未存在 AF_FaceCamera 修改器，则挂载（避免重复）
+                    for letter, color, value, cname, i, j in _dimension_label_specs(corners, dims, le, we, he):
+                        mid = (corners[i] + corners[j]) / 2
+                        label = f"{letter}({cname}): {value:.2f}m"
+                        txt = _create_text_label(
+                            f"{obj.name}_{letter}_{i}_{j}",
+                            label,
+                            mid,
+                            color=color,
+                            size=float(self.text_size) * ANNOTATION_TEXT_SCALE,
+                            face_camera=bool(self.text_face_camera)
+                        )
+                        for coll in src_colls:
                             try:
-                                has_face_cam = any(
-                                    (m.type == 'NODES' and getattr(m, 'node_group', None) and m.name == 'AF_FaceCamera')
-                                    for m in txt.modifiers
-                                )
-                                if not has_face_cam:
-                                    _attach_face_camera_geonodes(
-                                        txt,
-                                        context.scene.camera if getattr(context.scene, "camera", None) else None,
-                                        axis='Z'
-                                    )
+                                coll.objects.link(txt)
                             except Exception:
                                 pass
+                        txt.parent = root
+                        # 若尚未存在 AF_FaceCamera 修改器，则挂载（避免重复）
+                        try:
+                            has_face_cam = any(
+                                (m.type == 'NODES' and getattr(m, 'node_group', None) and m.name == 'AF_FaceCamera')
+                                for m in txt.modifiers
+                            )
+                            if not has_face_cam:
+                                _attach_face_camera_geonodes(
+                                    txt,
+                                    context.scene.camera if getattr(context.scene, "camera", None) else None,
+                                    axis='Z'
+                                )
+                        except Exception:
+                            pass
                 except Exception:
                     pass
 
                 # 生成六面方向文本：与对象局部坐标系一致（按局部 ±X/±Y/±Z 在世界中的方向选择面）
                 try:
-                    face_defs = [
-                        (0, 1, 2, 3),  # 底面
-                        (4, 5, 6, 7),  # 顶面
-                        (0, 1, 5, 4),  # 侧面1
-                        (1, 2, 6, 5),  # 侧面2
-                        (2, 3, 7, 6),  # 侧面3
-                        (3, 0, 4, 7),  # 侧面4
-                    ]
-
-                    # 盒心（用于将法线统一为外向）
-                    bbox_center = sum(corners, Vector((0.0, 0.0, 0.0))) / 8.0
-
-                    face_centers = []
-                    face_normals = []
-                    for a, b, c, d in face_defs:
-                        v0, v1, v2, v3 = corners[a], corners[b], corners[c], corners[d]
-                        center = (v0 + v1 + v2 + v3) / 4
-                        n = (v1 - v0).cross(v2 - v0)
-                        if n.length > 0:
-                            n.normalize()
-                        # 保证外向
-                        if (center - bbox_center).dot(n) < 0:
-                            n = -n
-                        face_centers.append(center)
-                        face_normals.append(n)
-
-                    # 对象局部坐标轴在世界空间的方向
-                    local_to_world = obj.matrix_world.to_3x3()
-                    x_axis = (local_to_world @ Vector((1.0, 0.0, 0.0))).normalized()
-                    y_axis = (local_to_world @ Vector((0.0, 1.0, 0.0))).normalized()
-                    z_axis = (local_to_world @ Vector((0.0, 0.0, 1.0))).normalized()
-
-                    axis_map = {
-                        "+X": x_axis,
-                        "-X": -x_axis,
-                        "+Y": y_axis,
-                        "-Y": -y_axis,
-                        "+Z": z_axis,
-                        "-Z": -z_axis,
-                    }
-
-                    # 为每个标签选择与其轴向最对齐的面
-                    label_to_index = {}
-                    for lab, axis_vec in axis_map.items():
-                        best_i = -1
-                        best_dot = -1.0
-                        for i, n in enumerate(face_normals):
-                            d = n.dot(axis_vec)
-                            if d > best_dot:
-                                best_dot = d
-                                best_i = i
-                        label_to_index[lab] = best_i
-
-                    # 去重：避免极端情况下同一面被分配给两个标签
-                    used = set()
-                    for lab in ("+X", "-X", "+Y", "-Y", "+Z", "-Z"):
-                        i = label_to_index.get(lab, -1)
-                        if i < 0:
-                            continue
-                        # 若已被占用，跳过（理论上不会在正交盒发生）
-                        if i in used:
-                            continue
-                        used.add(i)
-                        center = face_centers[i]
+                    for lab, center in _face_direction_label_specs(obj, corners):
                         txt = _create_text_label(
                             f"{obj.name}_face_{lab}",
                             lab,
                             center,
                             color=(1.0, 1.0, 1.0, 1.0),
-                            size=float(self.text_size) * 2.5,
+                            size=float(self.text_size) * ANNOTATION_TEXT_SCALE,
                             face_camera=bool(self.text_face_camera),
                         )
                         for coll in src_colls:
@@ -2217,7 +7001,39 @@ class OBJECT_OT_bake_annotation_curves(Operator):
 
             baked_count += 1
 
-        self.report({'INFO'}, f"已烘焙 {baked_count} 个对象的边界框方体到源对象集合")
+        total_time = time.perf_counter() - bake_start
+        per_object = 1000.0 / max(baked_count, 1)
+        self.report({'INFO'}, f"已烘焙 {baked_count} 个对象的边界框方体到源对象集合"
+                    f"（每对象 {total_time * per_object:.2f} ms，其中方体网格 {mesh_time * per_object:.3f} ms）")
+        return {'FINISHED'}
+
+    def _bake_instanced(self, context):
+        """实例化烘焙：每个集合一个对象，重复烘焙时替换其几何数据"""
+        handler = measurement_draw_handler or MeasurementDrawHandler()
+        items = []
+        for item in measurement_registry:
+            obj = measurement_registry.resolve(item)
+            if obj is None or obj.type != 'MESH':
+                continue
+            corners = handler.get_current_bbox_corners(obj)
+            if not corners:
+                continue
+            dims = handler.calculate_current_dimensions(corners, item.edges_data)
+            final_edges = dims.get('final_edges', {})
+            items.append((obj, corners, dims, (
+                final_edges.get('length_edge_indices', (0, 1)),
+                final_edges.get('width_edge_indices', (1, 2)),
+                final_edges.get('height_edge_indices', (0, 4)),
+            )))
+        if not items:
+            self.report({'WARNING'}, "没有可烘焙的标注数据")
+            return {'CANCELLED'}
+        try:
+            baked = bake_instanced_annotations(items, self.text_size, self.line_bevel)
+        except Exception as e:
+            self.report({'ERROR'}, f"实例化烘焙失败: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"已将 {len(items)} 个对象的标注烘焙为 {len(baked)} 个实例化对象")
         return {'FINISHED'}
 
 class OBJECT_OT_remove_annotation_curves(Operator):
@@ -2235,6 +7051,14 @@ class OBJECT_OT_remove_annotation_curves(Operator):
 
         removed_count = 0
         for src in selected_objects:
+            # 实例化烘焙对象按集合合并，包含该物体即整体移除
+            for baked in find_instanced_annotation_objects([src.name]):
+                mesh = baked.data
+                bpy.data.objects.remove(baked, do_unlink=True)
+                if mesh is not None and mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+                removed_count += 1
+
             root_name = f"Annot_{src.name}"
             root = bpy.data.objects.get(root_name)
             if root is None:
@@ -2341,6 +7165,11 @@ class OBJECT_PT_mesh_measurements(Panel):
         
         # 烘焙/移除曲线标注（根据当前选择状态切换显示）
         row2 = layout.row()
+        row2.operator("object.measure_mesh_background", text="后台测量", icon='SORTTIME')
+        row2.operator("object.measure_mesh_files", text="测量文件", icon='FILE_FOLDER')
+        row2.operator("object.measure_animation", text="动画测量", icon='TIME')
+        row2.operator("object.measure_collection", text="集合汇总", icon='OUTLINER_COLLECTION')
+        row2.operator("object.measure_clearance", text="间隙检测", icon='DRIVER_DISTANCE')
         # 选区内若有任一对象存在名为 Annot_<obj> 的根对象，则显示移除按钮
         selected_meshes = [o for o in context.selected_objects if o.type == 'MESH']
         has_baked = False
@@ -2348,30 +7177,162 @@ class OBJECT_PT_mesh_measurements(Panel):
             if bpy.data.objects.get(f"Annot_{o.name}") is not None:
                 has_baked = True
                 break
+        if not has_baked and selected_meshes:
+            has_baked = bool(find_instanced_annotation_objects(o.name for o in selected_meshes))
         if has_baked:
             row2.operator("object.remove_annotation_curves", text="移除烘焙对象", icon='TRASH')
         else:
             row2.operator("object.bake_annotation_curves", text="烘焙边界框方体", icon='OUTLINER_COLLECTION')
+            row2.operator("object.bake_annotation_curves", text="实例化烘焙", icon='GEOMETRY_NODES').bake_mode = 'INSTANCED'
         # 调试辅助按钮已移除（仍可通过搜索菜单调用对应操作符）
         
+        # 活动对象的网格质量（由面积直方图得到，不额外遍历面）
+        active = context.active_object
+        record = measurement_registry.get(active) if active is not None and active.type == 'MESH' else None
+        area_stats = record.edges_data.get('area_info', {}).get('face_area_stats') if record is not None else None
+        hull_info = record.edges_data.get('hull_info') if record is not None else None
+        area_breakdown = record.edges_data.get('area_info', {}).get('area_breakdown') if record is not None else None
+        if area_stats or hull_info or area_breakdown:
+            box = layout.box()
+            box.label(text=f"网格质量: {record.name}", icon='MESH_DATA')
+        if area_breakdown:
+            icon = 'MATERIAL' if area_breakdown['mode'] == 'MATERIAL' else 'GROUP_VERTEX'
+            for group_id, area, volume, _ in area_breakdown['groups'][:8]:
+                box.label(text=f"{area_breakdown_label(active, area_breakdown, group_id)}: {area:.4g} m²", icon=icon)
+        if area_stats:
+            box.label(text=f"面数 {area_stats['count']}，退化面 {area_stats['degenerate_count']}，狭长面 {area_stats['sliver_count']}")
+            quantiles = area_stats['quantiles']
+            box.label(text=f"面积 P05 {quantiles['p05']:.3g} / 中位数 {quantiles['p50']:.3g} / P95 {quantiles['p95']:.3g} m²")
+        if hull_info:
+            box.label(text=f"凸包: 面积 {hull_info['hull_area']:.4g} m²，体积 {hull_info['hull_volume']:.4g} m³", icon='MESH_ICOSPHERE')
+            mesh_volume = record.edges_data.get('area_info', {}).get('volume', 0.0)
+            if hull_info['is_watertight']:
+                box.label(text=f"水密: 是，网格体积 {mesh_volume:.4g} m³", icon='CHECKMARK')
+            else:
+                box.label(text="水密: 否，网格体积不可信", icon='ERROR')
+                box.label(text=f"开放边 {hull_info['boundary_edges']}，非流形边 {hull_info['nonmanifold_edges']}，"
+                               f"法向不一致 {hull_info['flipped_edges']}，游离边 {hull_info['loose_edges']}")
+        series = animation_series.get(MeasurementRegistry.object_key(active)) if active is not None else None
+        if series is not None and len(series):
+            summary = series.summary()
+            frames = series.values[0::ANIMATION_SERIES_STRIDE]
+            sub = layout.box()
+            sub.label(text=f"动画测量: {series.name} 帧 {int(frames[0])}-{int(frames[-1])}（{len(series)} 帧）", icon='TIME')
+            for field, label, unit in (('height', "高", "m"), ('area', "面积", "m²"), ('volume', "体积", "m³")):
+                low, low_frame, high, high_frame = summary[field]
+                sub.label(text=f"{label} {low:.4g}（帧 {int(low_frame)}）~ {high:.4g}（帧 {int(high_frame)}）{unit}")
+        
+        # 最近一次集合汇总
+        if collection_aggregate is not None:
+            box = layout.box()
+            box.label(text=f"集合汇总: {collection_aggregate['collection']}", icon='OUTLINER_COLLECTION')
+            box.label(text=f"面积 {collection_aggregate['total_area']:.4g} m²，体积 {collection_aggregate['total_volume']:.4g} m³")
+            box.label(text=f"实例 {collection_aggregate['instance_count']}，唯一网格 {collection_aggregate['unique_mesh_count']}")
+            for name, area in list(collection_aggregate['by_material'].items())[:5]:
+                box.label(text=f"{name}: {area:.4g} m²", icon='MATERIAL')
+            for name, group in list(collection_aggregate['by_collection'].items())[:5]:
+                box.label(text=f"{name}: {group['area']:.4g} m² / {group['volume']:.4g} m³（{group['count']}）", icon='OUTLINER_COLLECTION')
+        
+        # 最近一次间隙检测
+        if clearance_results is not None:
+            box = layout.box()
+            row = box.row()
+            row.label(text=f"间隙检测: {len(clearance_results['pairs'])} 对，碰撞 {clearance_results['collision_count']} 对", icon='DRIVER_DISTANCE')
+            row.operator("object.clear_clearance", text="", icon='X')
+            box.label(text=f"粗检测保留 {clearance_results['candidate_count']} 对，新建 BVH {clearance_results['bvh_built']}，耗时 {clearance_results['elapsed']:.3f}s")
+            for pair in clearance_results['pairs'][:5]:
+                state = "碰撞" if pair['colliding'] else f"{pair['distance']:.4f} m"
+                box.label(text=f"{pair['a']} ↔ {pair['b']}: {state}", icon='ERROR' if pair['colliding'] else 'DOT')
+        
+        # 测量缓存状态与上限设置
+        stats = measurement_cache.get_stats()
+        box = layout.box()
+        row = box.row()
+        row.label(text=f"缓存: {stats['entries']} 条 / {stats['total_bytes'] / (1024 * 1024):.1f} MB", icon='DISK_DRIVE')
+        row.operator("object.clear_measurement_cache", text="", icon='TRASH')
+        box.label(text=f"结果命中 {stats['result_hits']} / 未命中 {stats['result_misses']}，网格复用 {stats['geometry_hits']}")
+        if measurement_draw_handler is not None:
+            status = measurement_draw_handler.get_status_info()
+            box.label(text=f"重绘分析: 计算 {status['frame_analysis_misses']} 次，复用避免 {status['frame_analysis_hits']} 次")
+        settings = getattr(context.scene, "object_measure_settings", None)
+        if settings is not None:
+            row = box.row(align=True)
+            row.prop(settings, "cache_max_entries", text="条目")
+            row.prop(settings, "cache_max_mb", text="MB")
+            row = box.row(align=True)
+            row.prop(settings, "use_evaluated_mesh")
+            row.prop(settings, "use_oriented_box")
+            box.prop(settings, "use_hull_analysis")
+            box.prop(settings, "annotation_font_path")
+            row = box.row(align=True)
+            row.prop(settings, "area_breakdown", text="")
+            sub = row.row(align=True)
+            sub.active = settings.area_breakdown == 'ATTRIBUTE'
+            sub.prop(settings, "breakdown_attribute", text="")
+            row.operator("object.export_measurements", text="", icon='EXPORT')
+        
+        # 视口绘制耗时（切换批量/逐段绘制可直接对比帧耗时）
+        box = layout.box()
+        if settings is not None:
+            row = box.row(align=True)
+            row.prop(settings, "use_batched_drawing")
+            row.prop(settings, "use_frustum_culling")
+            row = box.row(align=True)
+            row.prop(settings, "use_label_declutter")
+            row.prop(settings, "use_edit_measure")
+            row = box.row(align=True)
+            row.prop(settings, "use_distance_lod")
+            sub = row.row(align=True)
+            sub.active = settings.use_distance_lod
+            sub.prop(settings, "lod_distance", text="")
+        bbox_ms = bounding_box_draw_handler.timer.avg_ms if bounding_box_draw_handler is not None else 0.0
+        if measurement_draw_handler is not None:
+            line_ms = measurement_draw_handler.line_timer.avg_ms
+            text_ms = measurement_draw_handler.text_timer.avg_ms
+        else:
+            line_ms = text_ms = 0.0
+        box.label(text=f"绘制耗时: 包围盒 {bbox_ms:.2f}ms  测量线 {line_ms:.2f}ms  文本 {text_ms:.2f}ms", icon='TIME')
+        
 
 # ==================== 注册函数 ====================
 
 def register():
     """注册所有类和属性"""
+    bpy.utils.register_class(ObjectMeasureSettings)
+    bpy.types.Scene.object_measure_settings = bpy.props.PointerProperty(type=ObjectMeasureSettings)
     bpy.utils.register_class(OBJECT_OT_measure_mesh)
+    bpy.utils.register_class(OBJECT_OT_measure_mesh_background)
     bpy.utils.register_class(OBJECT_OT_clear_measurements)
     bpy.utils.register_class(OBJECT_OT_toggle_3d_annotations)
     bpy.utils.register_class(OBJECT_OT_refresh_expired_areas)
+    bpy.utils.register_class(OBJECT_OT_clear_measurement_cache)
+    bpy.utils.register_class(OBJECT_OT_measure_mesh_files)
+    bpy.utils.register_class(OBJECT_OT_measure_animation)
+    bpy.utils.register_class(OBJECT_OT_measure_collection)
+    bpy.utils.register_class(OBJECT_OT_measure_clearance)
+    bpy.utils.register_class(OBJECT_OT_export_measurements)
+    bpy.utils.register_class(OBJECT_OT_clear_clearance)
     bpy.utils.register_class(OBJECT_OT_bake_annotation_curves)
     bpy.utils.register_class(OBJECT_OT_remove_annotation_curves)
     bpy.utils.register_class(OBJECT_OT_build_face_camera_ng)
     bpy.utils.register_class(OBJECT_OT_attach_face_camera_to_texts)
     bpy.utils.register_class(OBJECT_PT_mesh_measurements)
+    
+    # 编辑模式选区测量
+    edit_selection_measure.start()
+    
+    # 文件加载后延迟恢复测量记录
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    # 启用插件时当前文件可能已包含测量记录
+    _on_load_post()
 
 def unregister():
     """注销所有类和属性"""
-    global measurement_draw_handler, bounding_box_draw_handler, object_annotation_states, object_collapse_states, object_area_states
+    global measurement_draw_handler, bounding_box_draw_handler, collection_aggregate, clearance_results
+    collection_aggregate = None
+    clearance_results = None
+    clearance_draw_handler.stop()
     
     # 停止测量绘制并清除缓存
     if measurement_draw_handler is not None:
@@ -2384,20 +7345,43 @@ def unregister():
         bounding_box_draw_handler.stop()
         bounding_box_draw_handler = None
     
+    # 停止面积过期跟踪与文件加载恢复
+    area_dirty_tracker.stop()
+    edit_selection_measure.stop()
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    if bpy.app.timers.is_registered(_restore_measurements_timer):
+        bpy.app.timers.unregister(_restore_measurements_timer)
+    measured_object_index.clear()
+    
     # 清理物体状态
-    object_annotation_states.clear()
-    object_collapse_states.clear()
-    object_area_states.clear()
+    measurement_registry.clear()
+    measurement_cache.clear()
+    oriented_box_engine.invalidate()
+    animation_series.clear()
+    annotation_datablock_pool.clear()
     
     bpy.utils.unregister_class(OBJECT_PT_mesh_measurements)
     bpy.utils.unregister_class(OBJECT_OT_attach_face_camera_to_texts)
     bpy.utils.unregister_class(OBJECT_OT_build_face_camera_ng)
     bpy.utils.unregister_class(OBJECT_OT_toggle_3d_annotations)
     bpy.utils.unregister_class(OBJECT_OT_clear_measurements)
+    bpy.utils.unregister_class(OBJECT_OT_measure_mesh_background)
     bpy.utils.unregister_class(OBJECT_OT_measure_mesh)
     bpy.utils.unregister_class(OBJECT_OT_refresh_expired_areas)
     bpy.utils.unregister_class(OBJECT_OT_bake_annotation_curves)
     bpy.utils.unregister_class(OBJECT_OT_remove_annotation_curves)
+    bpy.utils.unregister_class(OBJECT_OT_clear_measurement_cache)
+    bpy.utils.unregister_class(OBJECT_OT_measure_mesh_files)
+    bpy.utils.unregister_class(OBJECT_OT_measure_animation)
+    bpy.utils.unregister_class(OBJECT_OT_measure_collection)
+    bpy.utils.unregister_class(OBJECT_OT_measure_clearance)
+    bpy.utils.unregister_class(OBJECT_OT_export_measurements)
+    bpy.utils.unregister_class(OBJECT_OT_clear_clearance)
+    
+    # 注销场景属性
+    del bpy.types.Scene.object_measure_settings
+    bpy.utils.unregister_class(ObjectMeasureSettings)
 
 # 如果直接运行此脚本
 if __name__ == "__main__":
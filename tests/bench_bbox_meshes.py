@@ -0,0 +1,82 @@
+"""
+包围盒方体构建耗时对比（开发用脚本，不随插件发布，也不会被 pytest 收集）
+
+对比 objectmeasure.build_bbox_meshes 的批量 foreach_set 构建与旧的逐对象
+from_pydata + validate + bmesh 法线重算构建。需要在 Blender 中运行：
+
+    blender --background --factory-startup --python tests/bench_bbox_meshes.py -- [方体数量]
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+import bmesh
+import bpy
+from mathutils import Euler, Vector
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "AartFlow", "scripts", "objectmeasure.py")
+
+
+def load_objectmeasure():
+    spec = importlib.util.spec_from_file_location("objectmeasure_bench", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_bbox_mesh_bmesh(name, corners):
+    """旧的逐对象构建方式：from_pydata + validate + bmesh 法线重算与朝向校正"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([(v.x, v.y, v.z) for v in corners], [], [
+        (0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)
+    ])
+    mesh.validate(clean_customdata=True)
+    mesh.update()
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces[:])
+    bm.normal_update()
+    center = sum((v.co for v in bm.verts), Vector((0.0, 0.0, 0.0))) / len(bm.verts)
+    if sum(f.normal.dot(f.calc_center_median() - center) for f in bm.faces) < 0.0:
+        bmesh.ops.reverse_faces(bm, faces=bm.faces[:])
+    bm.normal_update()
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def random_corners(rng):
+    """随机旋转/缩放/平移的包围盒角点（bound_box 顺序）"""
+    rotation = Euler([rng.uniform(0.0, 6.283) for _ in range(3)]).to_matrix()
+    size = Vector([rng.uniform(0.1, 5.0) for _ in range(3)])
+    offset = Vector([rng.uniform(-50.0, 50.0) for _ in range(3)])
+    picks = ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0), (1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0))
+    return [rotation @ Vector([size[i] * pick[i] for i in range(3)]) + offset for pick in picks]
+
+
+def timed(build, entries):
+    start = time.perf_counter()
+    meshes = build(entries)
+    elapsed = time.perf_counter() - start
+    for mesh in meshes:
+        bpy.data.meshes.remove(mesh)
+    return elapsed
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    count = int(argv[0]) if argv else 1000
+    objectmeasure = load_objectmeasure()
+    rng = random.Random(0)
+    entries = [(f"AF_BBoxBench_{k}", random_corners(rng)) for k in range(count)]
+
+    bulk = timed(objectmeasure.build_bbox_meshes, entries)
+    legacy = timed(lambda items: [build_bbox_mesh_bmesh(name, corners) for name, corners in items], entries)
+    print(f"{count} 个方体：批量 {bulk * 1000.0 / count:.3f} ms/个，bmesh {legacy * 1000.0 / count:.3f} ms/个")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+在 Blender 之外加载 AartFlow/scripts/objectmeasure.py 供单元测试使用
+
+Blender 内（blender --background --python-expr "import pytest; pytest.main(['tests'])"）直接使用真实的
+bpy/mathutils；普通 Python 环境下只为缺失的模块注册最小替身：bpy/gpu/blf 等只需让模块能够导入，
+mathutils.Vector 用纯 Python 实现（被测的包围盒分析与文件读取只依赖向量运算与 numpy）。
+"""
+
+import importlib.util
+import math
+import os
+import sys
+import types
+
+import pytest
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "AartFlow", "scripts", "objectmeasure.py")
+
+
+class Vector:
+    """mathutils.Vector 的最小实现（三维，float64）"""
+
+    __slots__ = ("_v",)
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._v = tuple(float(value) for value in values)
+
+    x = property(lambda self: self._v[0])
+    y = property(lambda self: self._v[1])
+    z = property(lambda self: self._v[2])
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, index):
+        return self._v[index]
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._v, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._v, other))
+
+    def __neg__(self):
+        return Vector(-a for a in self._v)
+
+    def __mul__(self, scalar):
+        return Vector(a * scalar for a in self._v)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vector(a / scalar for a in self._v)
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(self._v)
+
+    def __repr__(self):
+        return f"Vector({self._v})"
+
+    def copy(self):
+        return Vector(self._v)
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._v, other))
+
+    def cross(self, other):
+        ax, ay, az = self._v
+        bx, by, bz = other
+        return Vector((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self))
+
+    def normalized(self):
+        length = self.length
+        return Vector(self._v) if length == 0 else self / length
+
+
+class _Anything:
+    """可调用、可取任意属性的占位对象（只用于让模块顶层代码执行）"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return _Anything()
+
+    def __getattr__(self, name):
+        return _Anything()
+
+
+def _stub_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    module.__getattr__ = lambda attr: _Anything()
+    return module
+
+
+def _install_blender_stubs():
+    types_module = _stub_module("bpy.types")
+    types_module.__getattr__ = lambda attr: type(attr, (), {})
+    props = _stub_module("bpy.props")
+    handlers = _stub_module("bpy.app.handlers", persistent=lambda func: func)
+    app = _stub_module("bpy.app", handlers=handlers)
+    bpy = _stub_module("bpy", types=types_module, props=props, app=app)
+    mathutils = _stub_module("mathutils", Vector=Vector, Matrix=_Anything)
+    modules = {
+        "bpy": bpy,
+        "bpy.types": types_module,
+        "bpy.props": props,
+        "bpy.app": app,
+        "bpy.app.handlers": handlers,
+        "bmesh": _stub_module("bmesh"),
+        "gpu": _stub_module("gpu"),
+        "gpu_extras": _stub_module("gpu_extras"),
+        "gpu_extras.batch": _stub_module("gpu_extras.batch"),
+        "blf": _stub_module("blf"),
+        "mathutils": mathutils,
+        "mathutils.geometry": _stub_module("mathutils.geometry"),
+        "mathutils.bvhtree": _stub_module("mathutils.bvhtree"),
+    }
+    for name, module in modules.items():
+        sys.modules.setdefault(name, module)
+
+
+@pytest.fixture(scope="session")
+def objectmeasure():
+    try:
+        import bpy  # noqa: F401  Blender 内运行时使用真实模块
+    except ImportError:
+        _install_blender_stubs()
+    spec = importlib.util.spec_from_file_location("objectmeasure_under_test", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
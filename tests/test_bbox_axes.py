@@ -0,0 +1,81 @@
+"""
+闭式包围盒轴分析 analyze_bbox_axes 与逐对平行边分组 analyze_bbox_groups_pairwise 的一致性测试
+"""
+
+import math
+import random
+
+import pytest
+
+# bound_box 角点顺序（每个分量取 0=最小/1=最大）
+BOUND_BOX_ORDER = (
+    (0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0),
+    (1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0),
+)
+
+
+def random_rotation(rng):
+    """均匀随机单位四元数转换为 3x3 旋转矩阵（行列表）"""
+    u1, u2, u3 = rng.random(), rng.random(), rng.random()
+    x = math.sqrt(1 - u1) * math.sin(2 * math.pi * u2)
+    y = math.sqrt(1 - u1) * math.cos(2 * math.pi * u2)
+    z = math.sqrt(u1) * math.sin(2 * math.pi * u3)
+    w = math.sqrt(u1) * math.cos(2 * math.pi * u3)
+    return (
+        (1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)),
+        (2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)),
+        (2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)),
+    )
+
+
+def world_corners(objectmeasure, rotation, bbox_min, bbox_max, translation):
+    corners = []
+    for pick in BOUND_BOX_ORDER:
+        local = [bbox_max[axis] if pick[axis] else bbox_min[axis] for axis in range(3)]
+        world = [sum(rotation[row][col] * local[col] for col in range(3)) + translation[row] for row in range(3)]
+        corners.append(objectmeasure.Vector(world))
+    return corners
+
+
+def random_case(rng, tie):
+    rotation = random_rotation(rng) if rng.random() < 0.8 else ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    size = [rng.uniform(0.1, 10.0) for _ in range(3)]
+    if tie:
+        # 两个轴尺寸相同，长宽并列
+        a, b = rng.sample(range(3), 2)
+        size[b] = size[a]
+    bbox_min = [rng.uniform(-5.0, 5.0) for _ in range(3)]
+    bbox_max = [low + extent for low, extent in zip(bbox_min, size)]
+    translation = [rng.uniform(-100.0, 100.0) for _ in range(3)]
+    return rotation, bbox_min, bbox_max, translation
+
+
+@pytest.mark.parametrize("tie", [False, True], ids=["distinct", "tied"])
+def test_closed_form_matches_pairwise(objectmeasure, tie):
+    rng = random.Random(20261017 + tie)
+    compared = 0
+    for _ in range(2000):
+        corners = world_corners(objectmeasure, *random_case(rng, tie))
+        closed = objectmeasure.analyze_bbox_axes(corners)
+        if closed is None:
+            continue
+        pairwise = objectmeasure.analyze_bbox_groups_pairwise(corners)
+        assert pairwise is not None
+        compared += 1
+        for key in ("length_edge_indices", "width_edge_indices", "height_edge_indices"):
+            assert tuple(closed[key]) == tuple(pairwise[key]), key
+        for key in ("length", "width", "height", "max_z_alignment"):
+            assert closed[key] == pytest.approx(pairwise[key], rel=1e-9, abs=1e-12), key
+    assert compared > 1900
+
+
+def test_tied_footprint_assignment(objectmeasure):
+    """正方形底面：长度/宽度边与逐对分组路径一致"""
+    corners = world_corners(objectmeasure, ((1, 0, 0), (0, 1, 0), (0, 0, 1)), (0, 0, 0), (2, 2, 1), (0, 0, 0))
+    closed = objectmeasure.analyze_bbox_axes(corners)
+    pairwise = objectmeasure.analyze_bbox_groups_pairwise(corners)
+    assert closed["length"] == pytest.approx(2.0)
+    assert closed["width"] == pytest.approx(2.0)
+    assert closed["height"] == pytest.approx(1.0)
+    assert tuple(closed["length_edge_indices"]) == tuple(pairwise["length_edge_indices"])
+    assert tuple(closed["width_edge_indices"]) == tuple(pairwise["width_edge_indices"])
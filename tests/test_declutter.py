@@ -0,0 +1,41 @@
+"""
+屏幕空间标注去重叠 declutter_labels 测试
+"""
+
+import random
+
+
+def label(x, y, width, height, priority):
+    return ("t", None, x + 4, y + 4, x, y, width, height, priority)
+
+
+def rects_overlap(a, b):
+    return a[4] < b[4] + b[6] and b[4] < a[4] + a[6] and a[5] < b[5] + b[7] and b[5] < a[5] + a[7]
+
+
+def test_wide_collider_is_cleared(objectmeasure):
+    # 宽标注上下方都已占用，低优先级的窄标注只能横向挪开，且必须完全让开宽标注
+    name = objectmeasure.LABEL_PRIORITY_NAME
+    wide = label(0, 0, 300, 20, name)
+    above = label(0, 22, 300, 20, name)
+    below = label(0, -22, 300, 20, name)
+    narrow = label(100, 0, 40, 20, objectmeasure.LABEL_PRIORITY_DIMENSION)
+    placed = objectmeasure.declutter_labels([narrow, wide, above, below])
+    assert len(placed) == 4
+    moved = placed[-1]
+    assert moved[4] >= 300 or moved[4] + moved[6] <= 0
+    for other in placed[:-1]:
+        assert not rects_overlap(moved, other)
+    # 文本与背景同步移动
+    assert moved[2] - moved[4] == 4 and moved[3] - moved[5] == 4
+
+
+def test_placed_labels_never_overlap(objectmeasure):
+    rng = random.Random(7)
+    layout = [label(rng.uniform(0, 400), rng.uniform(0, 300), rng.uniform(20, 200), rng.uniform(10, 30),
+                    rng.randint(1, 3)) for _ in range(300)]
+    placed = objectmeasure.declutter_labels(layout)
+    assert placed
+    for i, a in enumerate(placed):
+        for b in placed[i + 1:]:
+            assert not rects_overlap(a, b)
@@ -0,0 +1,64 @@
+"""
+外部网格文件测量 measure_mesh_file 测试（ASCII PLY）
+"""
+
+import math
+
+import pytest
+
+TETRAHEDRON_HEADER = (
+    "ply\n"
+    "format ascii 1.0\n"
+    "element vertex 4\n"
+    "property float x\n"
+    "property float y\n"
+    "property float z\n"
+    "element face 4\n"
+    "property list uchar int vertex_indices\n"
+    "end_header\n"
+)
+TETRAHEDRON_VERTICES = "0 0 0\n1 0 0\n0 1 0\n0 0 1\n"
+TETRAHEDRON_FACES = "3 0 2 1\n3 0 1 3\n3 0 3 2\n3 1 2 3"
+TETRAHEDRON_AREA = 1.5 + math.sqrt(3.0) / 2.0
+
+
+def write_ply(tmp_path, text):
+    path = tmp_path / "tetrahedron.ply"
+    path.write_bytes(text.encode("ascii"))
+    return str(path)
+
+
+@pytest.mark.parametrize("tail", ["", "\n", "\n\n"], ids=["no-newline", "newline", "blank-line"])
+def test_ascii_ply_last_line(objectmeasure, tmp_path, tail):
+    path = write_ply(tmp_path, TETRAHEDRON_HEADER + TETRAHEDRON_VERTICES + TETRAHEDRON_FACES + tail)
+    result = objectmeasure.measure_mesh_file(path)
+    assert result["error"] == ""
+    assert result["area"] == pytest.approx(TETRAHEDRON_AREA)
+    assert result["volume"] == pytest.approx(1.0 / 6.0)
+
+
+def test_ascii_ply_blank_lines_between_rows(objectmeasure, tmp_path):
+    path = write_ply(tmp_path, TETRAHEDRON_HEADER + "\n" + TETRAHEDRON_VERTICES.replace("\n", "\n\n") + TETRAHEDRON_FACES)
+    result = objectmeasure.measure_mesh_file(path)
+    assert result["error"] == ""
+    assert result["area"] == pytest.approx(TETRAHEDRON_AREA)
+
+
+def test_ascii_ply_truncated(objectmeasure, tmp_path):
+    path = write_ply(tmp_path, TETRAHEDRON_HEADER + TETRAHEDRON_VERTICES + "3 0 2 1\n")
+    result = objectmeasure.measure_mesh_file(path)
+    assert result["error"] == "incomplete PLY data"
+
+
+def test_ascii_ply_per_face_properties(objectmeasure, tmp_path):
+    # 逐面颜色等标量属性位于索引列表之后（也可在其前），不能被当作顶点索引
+    header = TETRAHEDRON_HEADER.replace(
+        "property list uchar int vertex_indices\n",
+        "property int flags\nproperty list uchar int vertex_indices\n"
+        "property uchar red\nproperty uchar green\nproperty uchar blue\n")
+    faces = "\n".join(f"7 {row} 255 128 0" for row in TETRAHEDRON_FACES.split("\n"))
+    path = write_ply(tmp_path, header + TETRAHEDRON_VERTICES + faces + "\n")
+    result = objectmeasure.measure_mesh_file(path)
+    assert result["error"] == ""
+    assert result["area"] == pytest.approx(TETRAHEDRON_AREA)
+    assert result["volume"] == pytest.approx(1.0 / 6.0)
@@ -0,0 +1,44 @@
+"""
+面-角点拓扑分析 analyze_mesh_topology 测试
+"""
+
+import numpy as np
+
+TETRAHEDRON_POLYS = ((0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3))
+TETRAHEDRON_EDGES = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+
+def geometry(polys, edges=TETRAHEDRON_EDGES, vertex_count=4):
+    totals = np.array([len(poly) for poly in polys], dtype=np.int32)
+    return {
+        'loop_vertex': np.array([index for poly in polys for index in poly], dtype=np.int32),
+        'poly_loop_start': (np.cumsum(totals) - totals).astype(np.int32),
+        'poly_loop_total': totals,
+        'edge_verts': np.array(edges, dtype=np.int32).reshape(-1, 2),
+        'vertex_count': vertex_count,
+    }
+
+
+def test_closed_tetrahedron_is_watertight(objectmeasure):
+    topology = objectmeasure.analyze_mesh_topology(geometry(TETRAHEDRON_POLYS))
+    assert topology['boundary_edges'] == 0
+    assert topology['nonmanifold_edges'] == 0
+    assert topology['flipped_edges'] == 0
+    assert topology['loose_edges'] == 0
+    assert topology['is_watertight']
+
+
+def test_open_flipped_and_loose(objectmeasure):
+    # 去掉一个面：3 条开放边界
+    topology = objectmeasure.analyze_mesh_topology(geometry(TETRAHEDRON_POLYS[:3]))
+    assert topology['boundary_edges'] == 3
+    assert not topology['is_closed']
+    # 翻转一个面：它的 3 条边两侧同向
+    flipped = TETRAHEDRON_POLYS[:3] + (TETRAHEDRON_POLYS[3][::-1],)
+    topology = objectmeasure.analyze_mesh_topology(geometry(flipped))
+    assert topology['flipped_edges'] == 3
+    assert not topology['is_manifold']
+    # 额外顶点上的一条不属于任何面的边
+    topology = objectmeasure.analyze_mesh_topology(geometry(TETRAHEDRON_POLYS, TETRAHEDRON_EDGES + ((3, 4),), 5))
+    assert topology['loose_edges'] == 1
+    assert not topology['is_watertight']